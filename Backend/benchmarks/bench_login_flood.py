@@ -0,0 +1,159 @@
+"""
+Browsing latency during a wrong-password login flood, with and without the
+login rate limiter.
+
+Runs the load harness's browsing scenario (GET /auth/me, GET /events/ and
+its next page) three times against the in-process app:
+
+    baseline       browsing alone
+    flood_open     browsing while --flood-clients loop on failed logins,
+                   limiter disabled (every attempt reaches bcrypt)
+    flood_limited  the same flood with the limiter enabled
+
+and reports the browsing p50/p95/p99 of each phase plus the flood's status
+codes as JSON. With the limiter on, browsing p99 should stay close to the
+baseline while the flood is answered with 429s. Run from the Backend
+directory:
+
+    python -m benchmarks.bench_login_flood --mongo mock
+    python -m benchmarks.bench_login_flood --flood-ips 50 --output flood.json
+
+--flood-ips spreads the flood over that many X-Forwarded-For addresses, so
+the per-email limit rather than the per-IP one has to stop it.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+PHASES = ("baseline", "flood_open", "flood_limited")
+
+
+async def flood(client, emails: list, ips: int, counts: Counter, stop: asyncio.Event, offset: int):
+    n = offset
+    while not stop.is_set():
+        n += 1
+        headers = {"X-Forwarded-For": f"10.0.{(n % ips) // 256}.{(n % ips) % 256}"} if ips > 1 else {}
+        response = await client.post("/auth/login", headers=headers, json={
+            "email": emails[n % len(emails)], "password": "wrong-password",
+        })
+        counts[response.status_code] += 1
+
+
+async def run_phase(name: str, ctx, args, emails: list) -> dict:
+    from benchmarks.load_harness import run_scenario
+    from utils.rate_limit import login_limiter, MemoryWindowStore
+
+    login_limiter.enabled = name == "flood_limited"
+    login_limiter.store = MemoryWindowStore()
+
+    counts = Counter()
+    stop = asyncio.Event()
+    flooders = []
+    if name != "baseline":
+        flooders = [
+            asyncio.create_task(flood(ctx.client, emails, args.flood_ips, counts, stop, i))
+            for i in range(args.flood_clients)
+        ]
+        # Let the flood build up before measuring
+        await asyncio.sleep(args.warmup)
+
+    started = time.perf_counter()
+    result = await run_scenario("browsing", ctx, args.concurrency, args.requests)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*flooders)
+
+    summary = result["latency"]
+    print(f"  {name}: browsing p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms, "
+          f"flood {dict(counts)}")
+    return {
+        "browsing": result,
+        "flood_responses": {str(status): count for status, count in sorted(counts.items())},
+        "flood_rps": round(sum(counts.values()) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def run(args) -> dict:
+    os.environ["MONGO_DB_NAME"] = args.db_name
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    # Phases switch the limiter on themselves; fixtures log in without it
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["RATE_LIMIT_TRUST_FORWARDED"] = "true"
+    os.environ["LOGIN_LIMIT_PER_IP"] = str(args.limit_per_ip)
+    os.environ["LOGIN_LIMIT_PER_EMAIL"] = str(args.limit_per_email)
+    if args.mongo == "mock":
+        os.environ["MONGO_SECONDARY_READS"] = "false"
+
+    import httpx
+    from database import connection
+    if args.mongo == "mock":
+        from mongomock_motor import AsyncMongoMockClient
+        connection.use_client(AsyncMongoMockClient())
+    import main
+    from benchmarks.load_harness import seed_fixtures, git_commit, run_scenario
+
+    results = {}
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            ctx = await seed_fixtures(client, args.users, args.events, args.bcrypt_rounds, args.seed)
+            emails = [user["email"] for user in ctx.users]
+            # Fill the caches first so the baseline is not charged for a cold start
+            await run_scenario("browsing", ctx, args.concurrency, args.requests)
+            for name in PHASES:
+                print(f"▶ {name}")
+                results[name] = await run_phase(name, ctx, args, emails)
+                baseline_p99 = results["baseline"]["browsing"]["latency"]["p99_ms"]
+                p99 = results[name]["browsing"]["latency"]["p99_ms"]
+                results[name]["p99_vs_baseline"] = round(p99 / baseline_p99, 2) if baseline_p99 else None
+        if args.mongo == "real" and not args.keep_data:
+            await connection.get_client().drop_database(args.db_name)
+
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.utcnow().isoformat(),
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+        "phases": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Browsing latency during a login flood")
+    parser.add_argument("--requests", type=int, default=500, help="Browsing iterations per phase")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent browsing clients")
+    parser.add_argument("--flood-clients", type=int, default=50, help="Concurrent failed-login loops")
+    parser.add_argument("--flood-ips", type=int, default=1, help="Distinct X-Forwarded-For addresses")
+    parser.add_argument("--limit-per-ip", type=int, default=30)
+    parser.add_argument("--limit-per-email", type=int, default=10)
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of flood before measuring")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mongo", choices=["real", "mock"], default="real")
+    parser.add_argument("--db-name", default="eventsync_loadtest")
+    parser.add_argument("--keep-data", action="store_true", help="Do not drop the scratch database")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.mongo == "real" and args.db_name == os.getenv("MONGO_DB_NAME", "eventsync_db") and not args.keep_data:
+        parser.error("Refusing to drop the application database; pass another --db-name")
+
+    report = asyncio.run(run(args))
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+        print(f"📄 Report written to {args.output}")
+    else:
+        print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Event loop latency while concurrent logins verify passwords.
+
+Compares calling bcrypt inline (the old behaviour) with the executor-backed
+password_hasher. A ticker task sleeps for 10 ms in a loop and records how late
+it wakes up; that lateness is what every other request on the worker would
+see. Run from the Backend directory:
+
+    python -m benchmarks.bench_password_hashing --logins 64 --rounds 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from schema.auth_schema import hash_password, verify_password
+from utils.password_hasher import PasswordHasher
+
+TICK_SECONDS = 0.01
+
+
+async def measure_loop_lag(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        samples.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def run(verify, logins: int, hashed: str) -> dict:
+    stop = asyncio.Event()
+    samples = []
+    ticker = asyncio.create_task(measure_loop_lag(stop, samples))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[verify("strongpassword123", hashed) for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    samples.sort()
+    return {
+        "wall_s": round(elapsed, 3),
+        "lag_p50_ms": round(statistics.median(samples) * 1000, 2) if samples else None,
+        "lag_max_ms": round(samples[-1] * 1000, 2) if samples else None,
+    }
+
+
+async def main(logins: int, rounds: int, workers: int):
+    hashed = hash_password("strongpassword123", rounds)
+
+    async def inline_verify(plain, hashed_password):
+        return verify_password(plain, hashed_password)
+
+    hasher = PasswordHasher(workers=workers, max_pending=logins, rounds=rounds)
+    try:
+        print("inline  ", await run(inline_verify, logins, hashed))
+        print("executor", await run(hasher.verify, logins, hashed))
+    finally:
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds, args.workers))
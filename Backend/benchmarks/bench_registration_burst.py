@@ -0,0 +1,72 @@
+"""
+Signup burst against one capacity-limited event on a running MongoDB.
+
+Creates a scratch event, fires --signups concurrent registrations at it,
+cancels a few confirmed ones, then checks the seat accounting: confirmed
+registrations must equal the capacity (never more) and waitlisted ones must
+have been promoted into the freed seats. Run from the Backend directory
+after the indexes exist (start the app once or `python -m database.indexes apply`):
+
+    python -m benchmarks.bench_registration_burst --signups 5000 --capacity 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from database.connection import events_collection, registrations_collection
+from controller.registration_controller import register_for_event, cancel_registration
+from schema.registration_schema import createRegistration
+
+
+async def main(signups: int, capacity: int, cancellations: int):
+    result = await events_collection.insert_one({
+        "title": "Registration burst benchmark",
+        "description": "scratch event",
+        "event_date": datetime.utcnow(),
+        "location": "nowhere",
+        "capacity": capacity,
+        "seats_left": capacity,
+        "created_at": datetime.utcnow(),
+    })
+    event_id = str(result.inserted_id)
+
+    try:
+        requests = [
+            createRegistration(event_id=event_id, name=f"Student {i}", email=f"student{i}@bench.example.com")
+            for i in range(signups)
+        ]
+        started = time.perf_counter()
+        results = await asyncio.gather(*[register_for_event(request) for request in requests])
+        elapsed = time.perf_counter() - started
+
+        confirmed = [r for r in results if r["status"] == "confirmed"]
+        to_cancel = confirmed[:cancellations]
+        await asyncio.gather(*[cancel_registration(event_id, r["email"]) for r in to_cancel])
+
+        confirmed_now = await registrations_collection.count_documents({"event_id": event_id, "status": "confirmed"})
+        event = await events_collection.find_one({"_id": result.inserted_id})
+        report = {
+            "signups": signups,
+            "capacity": capacity,
+            "elapsed_s": round(elapsed, 3),
+            "signups_per_s": round(signups / elapsed),
+            "confirmed_in_burst": len(confirmed),
+            "confirmed_after_cancellations": confirmed_now,
+            "seats_left": event["seats_left"],
+        }
+        print(report)
+        expected = min(capacity, signups - len(to_cancel))
+        if len(confirmed) > capacity or confirmed_now != expected or event["seats_left"] != capacity - confirmed_now:
+            raise SystemExit("Seat accounting is inconsistent")
+    finally:
+        await registrations_collection.delete_many({"event_id": event_id})
+        await events_collection.delete_one({"_id": result.inserted_id})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signups", type=int, default=5000)
+    parser.add_argument("--capacity", type=int, default=500)
+    parser.add_argument("--cancellations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.signups, args.capacity, args.cancellations))
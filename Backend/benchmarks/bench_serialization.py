@@ -0,0 +1,82 @@
+"""
+Old vs new serialization of a large event list.
+
+old: event_serializer -> validate every item as EventResponse (what
+     response_model=list[EventResponse] does) -> jsonable_encoder -> json
+new: event_serializer -> one orjson pass (the trusted ORJSONResponse path)
+
+Run from the Backend directory:
+
+    python -m benchmarks.bench_serialization --events 10000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from controller.event_controller import event_serializer
+from schema.event_schema import EventResponse
+from utils.responses import dumps
+
+
+def make_events(count: int) -> list:
+    base = datetime(2025, 1, 1, 9, 0)
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Event {i}",
+            "description": "Guest lecture followed by a networking session.",
+            "event_date": base + timedelta(hours=i),
+            "location": "Conference Hall A",
+            "tags": "lecture,networking",
+            "tag_list": ["lecture", "networking"],
+            "organizer": str(ObjectId()),
+            "audience": "all",
+            "start_time": base + timedelta(hours=i),
+            "end_time": base + timedelta(hours=i + 2),
+            "created_at": base,
+        }
+        for i in range(count)
+    ]
+
+
+def old_path(documents: list, adapter: TypeAdapter) -> bytes:
+    items = adapter.validate_python([event_serializer(document) for document in documents])
+    return json.dumps(jsonable_encoder(items)).encode("utf-8")
+
+
+def new_path(documents: list) -> bytes:
+    return dumps([event_serializer(document) for document in documents])
+
+
+def best_of(runs: int, func, *args) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(count: int, runs: int):
+    documents = make_events(count)
+    adapter = TypeAdapter(list[EventResponse])
+
+    old = best_of(runs, old_path, documents, adapter)
+    new = best_of(runs, new_path, documents)
+    print({
+        "events": count,
+        "old_ms": round(old * 1000, 1),
+        "new_ms": round(new * 1000, 1),
+        "speedup": round(old / new, 1),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.events, args.runs)
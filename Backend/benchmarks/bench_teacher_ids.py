@@ -0,0 +1,48 @@
+"""
+Concurrent teacher ID allocation against a running MongoDB.
+
+Simulates several workers, each with its own BlockSequence, firing parallel
+allocations on a scratch counter. Fails if any number is handed out twice.
+Run from the Backend directory:
+
+    python -m benchmarks.bench_teacher_ids --creates 500 --workers 4
+"""
+import argparse
+import asyncio
+import time
+from database.connection import counters_collection
+from utils.sequence import BlockSequence
+
+COUNTER_NAME = "bench_teacher_id"
+
+
+async def main(creates: int, workers: int, block_size: int):
+    await counters_collection.delete_one({"_id": COUNTER_NAME})
+    sequences = [BlockSequence(COUNTER_NAME, block_size=block_size) for _ in range(workers)]
+
+    started = time.perf_counter()
+    numbers = await asyncio.gather(*[
+        sequences[i % workers].next() for i in range(creates)
+    ])
+    elapsed = time.perf_counter() - started
+
+    await counters_collection.delete_one({"_id": COUNTER_NAME})
+    duplicates = len(numbers) - len(set(numbers))
+    print({
+        "creates": creates,
+        "workers": workers,
+        "block_size": block_size,
+        "elapsed_s": round(elapsed, 4),
+        "duplicates": duplicates,
+    })
+    if duplicates:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--creates", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--block-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.creates, args.workers, args.block_size))
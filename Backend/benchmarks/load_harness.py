@@ -0,0 +1,386 @@
+"""
+End-to-end load harness: drives the real FastAPI app (main.app) in-process
+through httpx and reports latency percentiles and throughput as JSON.
+
+Scenarios:
+    login_storm     POST /auth/login with a pool of existing users
+    browsing        GET /auth/me, then GET /events/ and its next page
+    event_crud      create, read, update and delete an event
+    teacher_create  POST /admin/teachers/ with credential emails delivered
+                    to a local SMTP sink
+
+Requests go through the full ASGI stack (middleware, routing, validation,
+serialization) without a socket, so numbers reflect the app and the
+database rather than the network. Run from the Backend directory:
+
+    python -m benchmarks.load_harness --scenario all --output load.json
+    python -m benchmarks.load_harness --scenario browsing --concurrency 50 --requests 5000
+    python -m benchmarks.load_harness --mongo mock          # in-process stand-in, no mongod
+
+--mongo real (the default) uses MONGO_URL with a scratch database
+(--db-name, dropped afterwards unless --keep-data). --mongo mock needs the
+mongomock-motor package; it is useful for profiling the app layer but its
+timings say nothing about Mongo. Each run writes the scenario settings and
+the current git commit next to the results so two JSON files can be
+diffed across commits.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+SCENARIOS = ("login_storm", "browsing", "event_crud", "teacher_create")
+PASSWORD = "loadtest-password"
+
+
+# ================= SMTP sink ====================
+
+class SMTPSink:
+    """
+    Accepts and discards mail, speaking just enough SMTP for smtplib
+    (no STARTTLS, no AUTH). Counts delivered messages.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.received = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._session, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def reply(line: str):
+            writer.write(line.encode("ascii") + b"\r\n")
+
+        reply("220 loadtest SMTP sink")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb = line.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+                if verb in ("EHLO", "HELO"):
+                    reply("250 loadtest")
+                elif verb == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        pass
+                    self.received += 1
+                    reply("250 OK")
+                elif verb == "QUIT":
+                    reply("221 Bye")
+                    break
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    reply("250 OK")
+                else:
+                    reply("502 Command not implemented")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+# ================= Recording ====================
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self.requests = 0
+
+    async def request(self, client, name: str, method: str, url: str, expect=(200,), **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[name].append(time.perf_counter() - started)
+        self.requests += 1
+        if response.status_code not in expect:
+            self.errors[f"{name} {response.status_code}"] += 1
+        return response
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    # Nearest-rank, so the result is always an observed latency
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+# ================= Scenarios ====================
+
+class Context:
+    def __init__(self, client, users: list, admin_headers: dict, seed: int):
+        self.client = client
+        self.users = users
+        self.admin_headers = admin_headers
+        self.rng = random.Random(seed)
+        self.sequence = 0
+
+    def next_id(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+
+def event_payload(ctx: Context, n: int) -> dict:
+    return {
+        "title": f"Load test event {n}",
+        "description": "Created by the load harness",
+        "event_date": (datetime(2030, 1, 1) + timedelta(hours=ctx.rng.randrange(24 * 365))).isoformat(),
+        "location": "Main hall",
+        "tags": "loadtest,music",
+        "audience": ctx.rng.choice(["all", "students", "faculty"]),
+    }
+
+
+async def login_storm(ctx: Context, recorder: Recorder):
+    user = ctx.rng.choice(ctx.users)
+    await recorder.request(ctx.client, "POST /auth/login", "POST", "/auth/login",
+                           json={"email": user["email"], "password": PASSWORD})
+
+
+async def browsing(ctx: Context, recorder: Recorder):
+    user = ctx.rng.choice(ctx.users)
+    await recorder.request(ctx.client, "GET /auth/me", "GET", "/auth/me", headers=user["headers"])
+    response = await recorder.request(ctx.client, "GET /events/", "GET", "/events/", params={"limit": 20})
+    if response.status_code == 200 and response.json().get("next"):
+        await recorder.request(ctx.client, "GET /events/?cursor", "GET", "/events/",
+                               params={"limit": 20, "cursor": response.json()["next"]})
+
+
+async def event_crud(ctx: Context, recorder: Recorder):
+    headers = ctx.rng.choice(ctx.users)["headers"]
+    created = await recorder.request(ctx.client, "POST /events/", "POST", "/events/",
+                                     json=event_payload(ctx, ctx.next_id()), headers=headers)
+    if created.status_code != 200:
+        return
+    event_id = created.json()["id"]
+    await recorder.request(ctx.client, "GET /events/{event_id}", "GET", f"/events/{event_id}")
+    await recorder.request(ctx.client, "PUT /events/{event_id}", "PUT", f"/events/{event_id}",
+                           json={"location": "Room 101"}, headers=headers)
+    await recorder.request(ctx.client, "DELETE /events/{event_id}", "DELETE", f"/events/{event_id}",
+                           headers=headers, expect=(204,))
+
+
+async def teacher_create(ctx: Context, recorder: Recorder):
+    n = ctx.next_id()
+    await recorder.request(ctx.client, "POST /admin/teachers/", "POST", "/admin/teachers/", json={
+        "name": f"Teacher {n}",
+        "email": f"teacher{n}.{ctx.rng.randrange(10**9)}@loadtest.example.com",
+        "department": "Computer Science",
+        "role": "teacher",
+    }, headers=ctx.admin_headers)
+
+
+SCENARIO_STEPS = {
+    "login_storm": login_storm,
+    "browsing": browsing,
+    "event_crud": event_crud,
+    "teacher_create": teacher_create,
+}
+
+
+async def run_scenario(name: str, ctx: Context, concurrency: int, iterations: int) -> dict:
+    recorder = Recorder()
+    step = SCENARIO_STEPS[name]
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await step(ctx, recorder)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    everything = [sample for samples in recorder.samples.values() for sample in samples]
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "requests": recorder.requests,
+        "rps": round(recorder.requests / elapsed, 1) if elapsed else 0.0,
+        "errors": dict(recorder.errors),
+        "latency": summarize(everything),
+        "operations": {operation: summarize(samples) for operation, samples in sorted(recorder.samples.items())},
+    }
+
+
+# ================= Fixtures ====================
+
+async def seed_fixtures(client, users_count: int, events_count: int, bcrypt_rounds: int, seed: int) -> Context:
+    from database.connection import users_collection, events_collection
+    from schema.auth_schema import hash_password
+    from controller.event_controller import split_tags
+
+    # Hash once; every fixture account shares the password
+    hashed = hash_password(PASSWORD, rounds=bcrypt_rounds)
+    now = datetime.utcnow()
+    accounts = [
+        {"name": f"Load user {i}", "email": f"user{i}@loadtest.example.com", "password": hashed,
+         "role": "student", "department": "Computer Science", "created_at": now}
+        for i in range(users_count)
+    ]
+    accounts.append({"name": "Load admin", "email": "admin@loadtest.example.com", "password": hashed,
+                     "role": "admin", "created_at": now})
+    await users_collection.insert_many(accounts)
+
+    async def login(email: str) -> dict:
+        response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    users = []
+    for account in accounts[:-1]:
+        users.append({"email": account["email"], "headers": await login(account["email"])})
+    ctx = Context(client, users, await login("admin@loadtest.example.com"), seed)
+
+    events = []
+    for n in range(events_count):
+        event = event_payload(ctx, n)
+        event["event_date"] = datetime.fromisoformat(event["event_date"])
+        event["organizer"] = "loadtest"
+        event["tag_list"] = split_tags(event["tags"])
+        event["created_at"] = now
+        events.append(event)
+    if events:
+        await events_collection.insert_many(events)
+    return ctx
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ================= Entry point ====================
+
+async def run(args) -> dict:
+    started_at = datetime.utcnow().isoformat()
+    sink = SMTPSink()
+    await sink.start()
+
+    # Settings are read at import time, so configure them before main loads
+    os.environ["MONGO_DB_NAME"] = args.db_name
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    # Every harness request comes from one address; login_storm is meant to hit bcrypt
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.update({
+        "SMTP_HOST": sink.host, "SMTP_PORT": str(sink.port), "SMTP_STARTTLS": "false",
+        "SMTP_USER": "", "SMTP_PASSWORD": "",
+    })
+    if args.mongo == "mock":
+        # The stand-in cannot route reads by read preference
+        os.environ["MONGO_SECONDARY_READS"] = "false"
+
+    import httpx
+    from database import connection
+    if args.mongo == "mock":
+        from mongomock_motor import AsyncMongoMockClient
+        connection.use_client(AsyncMongoMockClient())
+    import main
+    from utils.email_queue import email_queue
+
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = {}
+    try:
+        async with main.app.router.lifespan_context(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                ctx = await seed_fixtures(client, args.users, args.events, args.bcrypt_rounds, args.seed)
+                for name in scenarios:
+                    print(f"▶ {name}: {args.requests} iterations, concurrency {args.concurrency}")
+                    results[name] = await run_scenario(name, ctx, args.concurrency, args.requests)
+                    if name == "teacher_create":
+                        # Let the queue drain so delivered counts are final
+                        deadline = time.monotonic() + 30
+                        while email_queue.pending() and time.monotonic() < deadline:
+                            await asyncio.sleep(0.05)
+                        results[name]["emails_delivered"] = sink.received
+                    summary = results[name]["latency"]
+                    print(f"  {results[name]['rps']} req/s, p50 {summary['p50_ms']} ms, "
+                          f"p95 {summary['p95_ms']} ms, p99 {summary['p99_ms']} ms")
+            if args.mongo == "real" and not args.keep_data:
+                await connection.get_client().drop_database(args.db_name)
+    finally:
+        await sink.stop()
+
+    return {
+        "commit": git_commit(),
+        "started_at": started_at,
+        "python": platform.python_version(),
+        "settings": {
+            "mongo": args.mongo,
+            "db_name": args.db_name,
+            "concurrency": args.concurrency,
+            "iterations": args.requests,
+            "users": args.users,
+            "events": args.events,
+            "bcrypt_rounds": args.bcrypt_rounds,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the EventSync API in-process")
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--requests", type=int, default=500, help="Scenario iterations per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=50, help="Fixture accounts to log in as")
+    parser.add_argument("--events", type=int, default=500, help="Fixture events to browse")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mongo", choices=["real", "mock"], default="real")
+    parser.add_argument("--db-name", default="eventsync_loadtest")
+    parser.add_argument("--keep-data", action="store_true", help="Do not drop the scratch database")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.mongo == "real" and args.db_name == os.getenv("MONGO_DB_NAME", "eventsync_db") and not args.keep_data:
+        parser.error("Refusing to drop the application database; pass another --db-name")
+
+    report = asyncio.run(run(args))
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+        print(f"📄 Report written to {args.output}")
+    else:
+        print(rendered)
+    return 1 if any(result["errors"] for result in report["scenarios"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
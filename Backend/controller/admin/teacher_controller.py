@@ -1,35 +1,88 @@
 from fastapi import HTTPException
 from database.connection import teachers_collection, users_collection
 from schema.teacher_schema import TeacherCreate, TeacherResponse
-from schema.auth_schema import hash_password
-from utils.email_util import send_teacher_credentials_email
+from utils.password_hasher import password_hasher
+from utils.email_queue import queue_teacher_credentials_email
+from utils.sequence import BlockSequence
 from datetime import datetime
 from bson import ObjectId
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pydantic import ValidationError
+from typing import AsyncIterator, Optional
+from collections import deque
+from utils.fields import parse_fields, build_projection
+import csv
+import json
+import os
 import secrets
 import string
 
 
-def generate_teacher_id() -> str:
+# Admin listing reads may lag the primary slightly
+teachers_reads = teachers_collection.secondary_preferred
+
+TEACHER_ID_PREFIX = "TCH"
+TEACHER_ID_BLOCK_SIZE = int(os.getenv("TEACHER_ID_BLOCK_SIZE", "20"))
+
+TEACHER_BULK_BATCH_SIZE = int(os.getenv("TEACHER_BULK_BATCH_SIZE", "100"))
+TEACHER_BULK_MAX_ROWS = int(os.getenv("TEACHER_BULK_MAX_ROWS", "5000"))
+
+# Public fields of a teacher; `fields=` requests are checked against this
+TEACHER_FIELDS = (
+    "id", "name", "email", "department", "subject", "phone", "role",
+    "teacher_id", "is_active", "created_at", "created_by",
+)
+# Never read these back from the database on the admin read paths
+SENSITIVE_TEACHER_FIELDS = ("password",)
+
+teacher_id_sequence = BlockSequence("teacher_id", block_size=TEACHER_ID_BLOCK_SIZE)
+# New IDs to try when an allocated ID is already taken (e.g. inserted by hand)
+TEACHER_ID_ATTEMPTS = 3
+
+EMAIL_TAKEN = "Teacher with this email already exists"
+TEACHER_ID_EXHAUSTED = "Could not allocate a unique teacher ID"
+
+
+def is_teacher_id_collision(details: Optional[dict]) -> bool:
+    """
+    Whether a duplicate key error came from teacher_id_unique rather than
+    email_unique. keyPattern is reported by MongoDB 4.4+, errmsg by all.
+    """
+    details = details or {}
+    key_pattern = details.get("keyPattern") or {}
+    if key_pattern:
+        return "teacher_id" in key_pattern
+    return "teacher_id" in details.get("errmsg", "")
+
+
+async def seed_teacher_id_sequence():
+    """
+    Start the teacher ID sequence after the highest existing TCH### so IDs
+    issued before the counter existed are never reused. Only the first
+    startup does any work: once the counter exists it is the source of
+    truth. Safe to run from several workers at once.
+    """
+    if await teacher_id_sequence.exists():
+        return
+    # One index lookup on teacher_id_unique. Legacy IDs are zero-padded to
+    # three digits, so string order is numeric order up to TCH999; past it
+    # the create paths skip any ID that turns out to be taken.
+    highest = await teachers_collection.find_one(
+        {"teacher_id": {"$gte": f"{TEACHER_ID_PREFIX}0", "$lt": f"{TEACHER_ID_PREFIX}:"}},
+        {"_id": 0, "teacher_id": 1},
+        sort=[("teacher_id", DESCENDING)],
+    )
+    number = highest["teacher_id"][len(TEACHER_ID_PREFIX):] if highest else ""
+    await teacher_id_sequence.seed(int(number) if number.isdigit() else 0)
+
+
+async def generate_teacher_id() -> str:
     """
     Generate a unique teacher ID in format TCH001, TCH002, etc.
     """
-    # Get the count of existing teachers
-    import asyncio
-    
-    async def get_count():
-        count = await teachers_collection.count_documents({})
-        return count
-    
-    try:
-        loop = asyncio.get_event_loop()
-        count = loop.run_until_complete(get_count())
-    except RuntimeError:
-        # If no event loop is running, create one
-        count = asyncio.run(get_count())
-    
-    # Generate ID with zero padding
-    teacher_number = count + 1
-    return f"TCH{teacher_number:03d}"
+    teacher_number = await teacher_id_sequence.next()
+    return f"{TEACHER_ID_PREFIX}{teacher_number:03d}"
 
 
 def generate_random_password(length: int = 12) -> str:
@@ -58,10 +111,31 @@ def generate_random_password(length: int = 12) -> str:
     return ''.join(password)
 
 
+def build_teacher_document(
+    teacher_data: TeacherCreate, teacher_id: str, hashed_password: str, admin_id: str
+) -> dict:
+    """
+    Build the teachers collection document for a new account.
+    """
+    return {
+        "name": teacher_data.name,
+        "email": teacher_data.email,
+        "department": teacher_data.department,
+        "subject": teacher_data.subject,
+        "phone": teacher_data.phone,
+        "teacher_id": teacher_id,
+        "password": hashed_password,
+        "role": teacher_data.role,
+        "is_active": True,
+        "created_at": datetime.utcnow(),
+        "created_by": admin_id,
+    }
+
+
 async def create_teacher(teacher_data: TeacherCreate, admin_id: str) -> TeacherResponse:
     """
     Create a new teacher account with auto-generated credentials.
-    Sends login credentials to teacher's email.
+    Queues an email with the login credentials to the teacher.
     
     Args:
         teacher_data: Teacher information from request
@@ -77,52 +151,44 @@ async def create_teacher(teacher_data: TeacherCreate, admin_id: str) -> TeacherR
     # Check if email already exists in teachers collection
     existing_teacher = await teachers_collection.find_one({"email": teacher_data.email})
     if existing_teacher:
-        raise HTTPException(status_code=400, detail="Teacher with this email already exists")
+        raise HTTPException(status_code=400, detail=EMAIL_TAKEN)
     
     # Check if email exists in users collection
     existing_user = await users_collection.find_one({"email": teacher_data.email})
     if existing_user:
         raise HTTPException(status_code=400, detail="This email is already registered as a user")
     
-    teacher_id = generate_teacher_id()
     password = generate_random_password()
     
-    hashed_password = hash_password(password)
+    hashed_password = await password_hasher.hash(password)
     
-    new_teacher = {
-        "name": teacher_data.name,
-        "email": teacher_data.email,
-        "department": teacher_data.department,
-        "subject": teacher_data.subject,
-        "phone": teacher_data.phone,
-        "teacher_id": teacher_id,
-        "password": hashed_password,
-        "role": teacher_data.role,
-    }
-    
-    # Insert into database
-    result = await teachers_collection.insert_one(new_teacher)
+    # Insert into database; the unique email index catches concurrent
+    # duplicates, and an ID that is somehow taken is replaced by a fresh one
+    for _ in range(TEACHER_ID_ATTEMPTS):
+        teacher_id = await generate_teacher_id()
+        new_teacher = build_teacher_document(teacher_data, teacher_id, hashed_password, admin_id)
+        try:
+            result = await teachers_collection.insert_one(new_teacher)
+            break
+        except DuplicateKeyError as e:
+            if not is_teacher_id_collision(e.details):
+                raise HTTPException(status_code=400, detail=EMAIL_TAKEN)
+            print(f"⚠️ Teacher ID {teacher_id} already in use, allocating another")
+    else:
+        raise HTTPException(status_code=500, detail=TEACHER_ID_EXHAUSTED)
     if not result.inserted_id:
         raise HTTPException(status_code=500, detail="Failed to create teacher account")
     
-    # Send credentials via email
-    email_sent = send_teacher_credentials_email(
+    # Queue credentials email; delivery happens in the background
+    queue_teacher_credentials_email(
         to_email=teacher_data.email,
         teacher_name=teacher_data.name,
         teacher_id=teacher_id,
         password=password,
-        role=teacher_data.role
     )
     
-    if not email_sent:
-        # Log warning but don't fail the request
-        print(f"⚠️ Warning: Teacher created but email failed to send to {teacher_data.email}")
-        print(f"📧 Manual credentials - Teacher ID: {teacher_id}, Password: {password}")
-    
-    # Fetch created teacher
-    created_teacher = await teachers_collection.find_one({"_id": result.inserted_id})
-    
-    # Format response
+    # Format response from the inserted document; no read-back needed
+    created_teacher = dict(new_teacher)
     created_teacher["id"] = str(created_teacher["_id"])
     created_teacher.pop("_id", None)
     created_teacher.pop("password", None)  # Don't return password in response
@@ -130,31 +196,267 @@ async def create_teacher(teacher_data: TeacherCreate, admin_id: str) -> TeacherR
     return TeacherResponse(**created_teacher)
 
 
-async def get_all_teachers():
+class _LineFeed:
+    """
+    Source for a single csv.reader that is fed lines as they arrive, so
+    quoted fields may span lines.
+    """
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_teacher_rows(lines: AsyncIterator[str], data_format: str):
+    """
+    Yield (row number, row dict, error) for each data row of an upload.
+    CSV uploads start with a header line naming the TeacherCreate fields.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    row = 0
+    quotes = 0
+    first = True
+    async for line in lines:
+        if first:
+            # Spreadsheet exports often start with a UTF-8 byte order mark
+            line = line.lstrip("\ufeff")
+            first = False
+
+        if data_format == "csv":
+            # A record is complete once its quotes are balanced; until then
+            # a quoted field continues on the next line (iter_lines removed
+            # the line break, so it is put back)
+            feed.lines.append(line + "\n")
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            quotes = 0
+            try:
+                values = next(reader)
+            except csv.Error as e:
+                feed.lines.clear()
+                if header is None:
+                    yield 1, None, f"Could not parse header: {str(e)}"
+                    return
+                row += 1
+                yield row, None, f"Could not parse row: {str(e)}"
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+
+        row += 1
+        try:
+            if data_format == "csv":
+                data = {
+                    name: value.strip() or None
+                    for name, value in zip(header, values)
+                }
+            else:
+                data = json.loads(line)
+                if not isinstance(data, dict):
+                    raise ValueError("Each line must be a JSON object")
+        except ValueError as e:
+            yield row, None, f"Could not parse row: {str(e)}"
+            continue
+        yield row, data, None
+
+    if data_format == "csv" and quotes % 2:
+        yield row + 1, None, "Could not parse row: unterminated quoted field"
+
+
+async def _create_teacher_batch(batch: list, admin_id: str) -> list:
+    """
+    Create one batch of validated teachers: a single $in duplicate check per
+    collection, parallel hashing and one unordered insert_many.
+    """
+    emails = [teacher.email for _, teacher in batch]
+    taken = {}
+    async for teacher in teachers_collection.find({"email": {"$in": emails}}, {"_id": 0, "email": 1}):
+        taken[teacher["email"]] = EMAIL_TAKEN
+    async for user in users_collection.find({"email": {"$in": emails}}, {"_id": 0, "email": 1}):
+        taken.setdefault(user["email"], "This email is already registered as a user")
+
+    results = []
+    pending = []
+    for row, teacher in batch:
+        if teacher.email in taken:
+            results.append({"row": row, "email": teacher.email, "status": "error", "detail": taken[teacher.email]})
+        else:
+            pending.append((row, teacher))
+    if not pending:
+        return results
+
+    passwords = [generate_random_password() for _ in pending]
+    try:
+        hashed_passwords = await password_hasher.hash_many(passwords)
+    except HTTPException as e:
+        results += [
+            {"row": row, "email": teacher.email, "status": "error", "detail": e.detail}
+            for row, teacher in pending
+        ]
+        return results
+
+    documents = [
+        build_teacher_document(teacher, await generate_teacher_id(), hashed_password, admin_id)
+        for (_, teacher), hashed_password in zip(pending, hashed_passwords)
+    ]
+
+    # Like create_teacher, rows whose allocated ID turns out to be taken are
+    # inserted again with a fresh one, up to TEACHER_ID_ATTEMPTS times
+    failed = {}
+    remaining = list(range(len(documents)))
+    for attempt in range(1, TEACHER_ID_ATTEMPTS + 1):
+        collided = []
+        try:
+            await teachers_collection.insert_many([documents[index] for index in remaining], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                index = remaining[error["index"]]
+                if error.get("code") != 11000:
+                    failed[index] = error.get("errmsg", "Failed to create teacher account")
+                elif is_teacher_id_collision(error):
+                    collided.append(index)
+                else:
+                    failed[index] = EMAIL_TAKEN
+        if not collided:
+            break
+        if attempt == TEACHER_ID_ATTEMPTS:
+            failed.update((index, TEACHER_ID_EXHAUSTED) for index in collided)
+            break
+        for index in collided:
+            print(f"⚠️ Teacher ID {documents[index]['teacher_id']} already in use, allocating another")
+            documents[index]["teacher_id"] = await generate_teacher_id()
+        remaining = collided
+
+    for index, ((row, teacher), document, password) in enumerate(zip(pending, documents, passwords)):
+        if index in failed:
+            results.append({"row": row, "email": teacher.email, "status": "error", "detail": failed[index]})
+            continue
+        queue_teacher_credentials_email(
+            to_email=teacher.email,
+            teacher_name=teacher.name,
+            teacher_id=document["teacher_id"],
+            password=password,
+        )
+        results.append({
+            "row": row,
+            "email": teacher.email,
+            "status": "created",
+            "id": str(document["_id"]),
+            "teacher_id": document["teacher_id"],
+        })
+    return results
+
+
+async def bulk_create_teachers(lines: AsyncIterator[str], data_format: str, admin_id: str) -> dict:
+    """
+    Create teacher accounts from a streamed CSV or JSON lines upload.
+    
+    Rows are processed in batches of TEACHER_BULK_BATCH_SIZE as they arrive,
+    so the whole upload is never held in memory. Every row gets an entry in
+    the report; a bad row never fails the rest of the upload. Rows past
+    TEACHER_BULK_MAX_ROWS are not read.
+    
+    Args:
+        lines: Decoded lines of the request body
+        data_format: "csv" or "jsonl"
+        admin_id: ID of the admin creating the teachers
+        
+    Returns:
+        dict: Counts of created / failed rows and the per-row results
+    """
+    results = []
+    seen_emails = set()
+    batch = []
+    rows = _iter_teacher_rows(lines, data_format)
+
+    try:
+        async for row, data, error in rows:
+            if row > TEACHER_BULK_MAX_ROWS:
+                results.append({
+                    "row": row,
+                    "status": "error",
+                    "detail": f"Upload truncated: at most {TEACHER_BULK_MAX_ROWS} rows are processed",
+                })
+                break
+            if error:
+                results.append({"row": row, "status": "error", "detail": error})
+                continue
+
+            try:
+                teacher = TeacherCreate(**data)
+            except ValidationError as e:
+                first_error = e.errors()[0]
+                field = ".".join(str(part) for part in first_error["loc"])
+                results.append({
+                    "row": row,
+                    "email": data.get("email"),
+                    "status": "error",
+                    "detail": f"{field}: {first_error['msg']}",
+                })
+                continue
+
+            if teacher.email in seen_emails:
+                results.append({"row": row, "email": teacher.email, "status": "error", "detail": "Duplicate email in upload"})
+                continue
+            seen_emails.add(teacher.email)
+
+            batch.append((row, teacher))
+            if len(batch) >= TEACHER_BULK_BATCH_SIZE:
+                results += await _create_teacher_batch(batch, admin_id)
+                batch = []
+    except ValueError as e:
+        # The stream itself is unreadable; report it after the rows we did get
+        results.append({"row": len(results) + len(batch) + 1, "status": "error", "detail": f"Upload aborted: {str(e)}"})
+
+    if batch:
+        results += await _create_teacher_batch(batch, admin_id)
+
+    results.sort(key=lambda result: result["row"])
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+async def get_all_teachers(fields: Optional[str] = None):
     """
     Get all teachers (admin only).
     
+    Args:
+        fields: Optional comma separated subset of TEACHER_FIELDS
+        
     Returns:
         list: List of all teachers
     """
+    selected = parse_fields(fields, TEACHER_FIELDS)
+    projection = build_projection(selected, exclude=SENSITIVE_TEACHER_FIELDS)
     teachers = []
-    cursor = teachers_collection.find({})
+    cursor = teachers_reads.find({}, projection)
     
     async for teacher in cursor:
         teacher["id"] = str(teacher["_id"])
         teacher.pop("_id", None)
-        teacher.pop("password", None) 
         teachers.append(teacher)
     
     return teachers
 
 
-async def get_teacher_by_id(teacher_id: str) -> dict:
+async def get_teacher_by_id(teacher_id: str, fields: Optional[str] = None) -> dict:
     """
     Get a specific teacher by their MongoDB ID.
     
     Args:
         teacher_id: MongoDB ObjectId as string
+        fields: Optional comma separated subset of TEACHER_FIELDS
         
     Returns:
         dict: Teacher information
@@ -162,13 +464,14 @@ async def get_teacher_by_id(teacher_id: str) -> dict:
     Raises:
         HTTPException: If teacher not found
     """
-    teacher = await teachers_collection.find_one({"_id": ObjectId(teacher_id)})
+    selected = parse_fields(fields, TEACHER_FIELDS)
+    projection = build_projection(selected, exclude=SENSITIVE_TEACHER_FIELDS)
+    teacher = await teachers_reads.find_one({"_id": ObjectId(teacher_id)}, projection)
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
     teacher["id"] = str(teacher["_id"])
     teacher.pop("_id", None)
-    teacher.pop("password", None)  # Don't expose password
     
     return teacher
 
@@ -0,0 +1,104 @@
+from datetime import datetime
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from database.connection import events_collection, attendance_collection
+from controller.event_controller import parse_event_ids
+from schema.atendence_schema import AttendanceScan
+
+
+# Attendance is keyed on (event_id, user_id) by a unique index. Every scan is
+# an upsert that only sets fields on insert, so re-scanning a badge, or a
+# scanner re-sending a batch after a dropped response, changes nothing and is
+# reported back as a duplicate.
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _scan_upsert(event_id: str, scan: AttendanceScan, recorded_by: str, now: datetime) -> UpdateOne:
+    return UpdateOne(
+        {"event_id": event_id, "user_id": scan.user_id},
+        {"$setOnInsert": {
+            "event_id": event_id,
+            "user_id": scan.user_id,
+            "status": scan.status,
+            "attendance_date": scan.attendance_date,
+            "remarks": scan.remarks,
+            "recorded_by": recorded_by,
+            "created_at": now,
+        }},
+        upsert=True,
+    )
+
+
+async def record_attendance_batch(event_id: str, scans: list[AttendanceScan], current_user: dict):
+    """
+    Record a batch of scans for one event with a single bulk_write.
+
+    Args:
+        event_id: The event the scanner is checking people into
+        scans: Scans in upload order
+        current_user: The authenticated user; must organize the event or be an admin
+
+    Returns:
+        dict: Counts plus one item per scan, in request order, with status
+              "recorded", "duplicate" or "error"
+
+    Raises:
+        HTTPException: 400 for a malformed event id, 404 if the event does
+            not exist, 403 if the user may not record attendance for it
+    """
+    event = await events_collection.find_one({"_id": parse_event_ids([event_id])[0]}, {"organizer": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event.get("organizer") != current_user["id"] and current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="You cannot record attendance for this event")
+
+    items = [
+        {"index": index, "user_id": scan.user_id, "status": "recorded", "detail": None}
+        for index, scan in enumerate(scans)
+    ]
+
+    # The same badge scanned twice within one upload needs no round trip
+    now = datetime.utcnow()
+    operations = []
+    positions = []
+    seen = set()
+    for index, scan in enumerate(scans):
+        if scan.user_id in seen:
+            items[index]["status"] = "duplicate"
+            continue
+        seen.add(scan.user_id)
+        operations.append(_scan_upsert(event_id, scan, current_user["id"], now))
+        positions.append(index)
+
+    try:
+        result = await attendance_collection.bulk_write(operations, ordered=False)
+        upserted = set(result.upserted_ids)
+        errors = []
+    except BulkWriteError as e:
+        upserted = {entry["index"] for entry in e.details.get("upserted", [])}
+        errors = e.details.get("writeErrors", [])
+
+    failed = {}
+    for error in errors:
+        failed[error["index"]] = error
+
+    for op_index, index in enumerate(positions):
+        error = failed.get(op_index)
+        if error is not None:
+            # Another scanner inserted the same attendee concurrently
+            if error.get("code") == DUPLICATE_KEY_ERROR:
+                items[index]["status"] = "duplicate"
+            else:
+                items[index]["status"] = "error"
+                items[index]["detail"] = error.get("errmsg")
+        elif op_index not in upserted:
+            items[index]["status"] = "duplicate"
+
+    return {
+        "recorded": sum(item["status"] == "recorded" for item in items),
+        "duplicates": sum(item["status"] == "duplicate" for item in items),
+        "failed": sum(item["status"] == "error" for item in items),
+        "items": items,
+    }
@@ -1,7 +1,11 @@
-from schema.auth_schema import userLogin , userRegister , UserResponse, hash_password, verify_password
+from schema.auth_schema import userLogin , userRegister , UserResponse
+from utils.password_hasher import password_hasher
 from fastapi import HTTPException
-from jwt_auth.jwt_handler import create_access_token
+from jwt_auth.jwt_handler import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from jwt_auth.user_cache import invalidate_user, load_user
+from jwt_auth.refresh_tokens import issue_refresh_token, consume_refresh_token, revoke_user_sessions
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 from database.connection import users_collection
 
@@ -12,25 +16,26 @@ from database.connection import users_collection
 async def register_user(user: userRegister) -> UserResponse:
     new_user = user.dict()
 
-    # Check if email exists
-    existing_user = await users_collection.find_one({"email": new_user["email"]})
-    if existing_user:
+    # Check if email exists; email is optional and accounts without one never clash
+    if new_user.get("email") and await users_collection.find_one({"email": new_user["email"]}):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     new_user["is_active"] = True
     new_user["created_at"] = datetime.utcnow()
-    new_user["password"] = hash_password(new_user["password"])
+    new_user["password"] = await password_hasher.hash(new_user["password"])
     new_user["role"] = new_user.get("role", "student")  # safe default
 
-    # Insert user
-    result = await users_collection.insert_one(new_user)
+    # Insert user; the unique email index catches concurrent registrations
+    try:
+        result = await users_collection.insert_one(new_user)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     if not result.inserted_id:
         raise HTTPException(status_code=500, detail="Failed to register user")
 
-    created_user = await users_collection.find_one({"_id": result.inserted_id})
-
-    # Remove sensitive values
-    created_user["id"] = str(created_user["_id"])
+    # Build the response from the inserted document instead of reading it back
+    created_user = dict(new_user)
+    created_user["id"] = str(result.inserted_id)
     created_user.pop("_id", None)
     created_user.pop("password", None)
 
@@ -39,33 +44,60 @@ async def register_user(user: userRegister) -> UserResponse:
 
 # ===================== Login User =====================
 
+async def _issue_tokens(user: dict, session_id: str = None) -> dict:
+    user_id = str(user["_id"])
+    refresh_token, session_id = await issue_refresh_token(user_id, session_id)
+
+    # Everything read-only endpoints need is carried in the signed claims
+    access_token = create_access_token({
+        "id": user_id,
+        "email": user.get("email"),
+        "role": user.get("role", "student"),
+        "department": user.get("department"),
+        "sid": session_id,
+    })
+
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
 async def login_user(user: userLogin) -> dict:
     existing_user = await users_collection.find_one({"email": user.email})
 
-    if not existing_user or not verify_password(user.password, existing_user["password"]):
+    if not existing_user or not await password_hasher.verify(user.password, existing_user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    role = existing_user.get("role", "student")
+    return await _issue_tokens(existing_user)
 
-    token = create_access_token({
-        "id": str(existing_user["_id"]),
-        "email": existing_user["email"],
-        "role": role
-    })
 
-    return {"access_token": token, "token_type": "bearer"}
+# ===================== Refresh Tokens =====================
+
+async def refresh_user_tokens(refresh_token: str) -> dict:
+    record = await consume_refresh_token(refresh_token)
+
+    # Read the user from the primary, not the cache: this is where deleted or
+    # deactivated accounts and role changes are picked up
+    user = await load_user(record["user_id"])
+    if not user or not user.get("is_active", True):
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return await _issue_tokens(user, record["session_id"])
 
 
 # ===================== Get User by ID =====================
 
 async def get_user_by_id(user_id: str) -> UserResponse:
-    user = await users_collection.find_one({"_id": ObjectId(user_id)})
+    # never read the password hash back for a profile
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"password": 0})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     user["id"] = str(user["_id"])
     user.pop("_id", None)
-    user.pop("password", None)  # remove password before returning
 
     return UserResponse(**user)
 
@@ -78,4 +110,6 @@ async def delete_user(user_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
 
+    invalidate_user(user_id)
+    await revoke_user_sessions(user_id)
     return {"detail": "User deleted successfully"}
\ No newline at end of file
@@ -1,11 +1,50 @@
+import asyncio
+import base64
+import json
 from datetime import datetime
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 from database.connection import events_collection
 from schema.event_schema import EventCreate, EventUpdate
+from utils.responses import dumps
+from utils.fields import parse_fields, build_projection
+from utils.search import search_cache, text_search_page
+from utils.response_cache import response_cache
 
 
-def event_serializer(event) -> dict:
+# Uncached public reads (export, batch lookups) may lag the primary
+# slightly. Anything stored in a cache is read from events_collection: a
+# lagging secondary could otherwise put the old document back right after a
+# write invalidated it, and it would be served for the whole TTL.
+events_reads = events_collection.secondary_preferred
+
+# Response cache tags: every cached list page carries EVENTS_LIST_TAG, a
+# cached single event its event_tag()
+EVENTS_LIST_TAG = "events:list"
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+DEFAULT_EXPORT_BATCH_SIZE = 500
+MAX_EXPORT_BATCH_SIZE = 5000
+MAX_BATCH_IDS = 100
+
+
+# Public fields of an event; `fields=` requests are checked against this
+EVENT_FIELDS = (
+    "id", "title", "description", "event_date", "location", "tags", "organizer",
+    "audience", "start_time", "end_time", "start_date", "end_date", "capacity", "seats_left",
+    "created_at", "updated_at",
+)
+
+
+def event_serializer(event, fields: Optional[list[str]] = None) -> dict:
+    if fields is not None:
+        sparse = {"id": str(event["_id"])}
+        sparse.update({name: event.get(name) for name in fields if name != "id"})
+        return sparse
     return {
         "id": str(event["_id"]),
         "title": event["title"],
@@ -19,75 +58,399 @@ def event_serializer(event) -> dict:
         "end_time": event.get("end_time"),
         "start_date": event.get("start_date"),
         "end_date": event.get("end_date"),
+        "capacity": event.get("capacity"),
+        "seats_left": event.get("seats_left"),
         "created_at": event.get("created_at"),
         "updated_at": event.get("updated_at"),
     }
 
 
+def parse_event_ids(event_ids: list[str]) -> list[ObjectId]:
+    """
+    Convert event ids from a request, all or nothing.
+
+    Raises:
+        HTTPException: 400 listing every id that is not a valid ObjectId
+    """
+    invalid = [event_id for event_id in event_ids if not ObjectId.is_valid(event_id)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid event ids: {', '.join(map(str, invalid))}")
+    return [ObjectId(event_id) for event_id in event_ids]
+
+
+def event_tag(event_id) -> str:
+    # Normalized, so /events/<ID> and /events/<id> share one tag
+    return f"events:{parse_event_ids([event_id])[0]}"
+
+
+async def invalidate_event_responses(event_id=None):
+    """Drop cached responses that may show this event (and every list page)."""
+    if event_id is None:
+        await response_cache.invalidate(EVENTS_LIST_TAG)
+    else:
+        await response_cache.invalidate(EVENTS_LIST_TAG, event_tag(event_id))
+
+
+def split_tags(tags: Optional[str]) -> list[str]:
+    """Turn the comma separated `tags` string into a normalized list."""
+    if not tags:
+        return []
+    return [tag.strip().lower() for tag in tags.split(",") if tag.strip()]
+
+
+async def backfill_tag_lists(batch_size: int = DEFAULT_EXPORT_BATCH_SIZE) -> int:
+    """
+    Set `tag_list` on events stored before it existed, so the tags filter
+    (which only reads tag_list) finds them. Safe to run on every startup:
+    once every event has the field it is one query that matches nothing.
+
+    Returns:
+        int: How many events were updated
+    """
+    updated = 0
+    batch = []
+    cursor = events_collection.find({"tag_list": {"$exists": False}}, {"tags": 1})
+    async for event in cursor:
+        batch.append(UpdateOne(
+            {"_id": event["_id"], "tag_list": {"$exists": False}},
+            {"$set": {"tag_list": split_tags(event.get("tags"))}},
+        ))
+        if len(batch) >= batch_size:
+            updated += (await events_collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await events_collection.bulk_write(batch, ordered=False)).modified_count
+    if updated:
+        await response_cache.invalidate(EVENTS_LIST_TAG)
+        print(f"✅ Backfilled tag_list on {updated} events")
+    return updated
+
+
+def encode_cursor(event: dict) -> str:
+    """Build the opaque `next` cursor from the last event of a page."""
+    payload = {"d": event["event_date"].isoformat(), "i": str(event["_id"])}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return datetime.fromisoformat(payload["d"]), ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def build_event_filter(
+    audience: Optional[str] = None,
+    tags: Optional[str] = None,
+    organizer: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> dict:
+    query = {}
+    if audience:
+        query["audience"] = audience
+    if organizer:
+        query["organizer"] = organizer
+    tag_list = split_tags(tags)
+    if tag_list:
+        query["tag_list"] = {"$all": tag_list}
+    if date_from or date_to:
+        date_range = {}
+        if date_from:
+            date_range["$gte"] = date_from
+        if date_to:
+            date_range["$lte"] = date_to
+        query["event_date"] = date_range
+    return query
+
+
 # =================== Create ======================
 
 async def create_event(request: EventCreate, user_id: str):
     new_event = request.dict()
     new_event["organizer"] = user_id
+    new_event["tag_list"] = split_tags(new_event.get("tags"))
+    if new_event.get("capacity"):
+        # Seat counter decremented atomically by the registration controller
+        new_event["seats_left"] = new_event["capacity"]
     new_event["created_at"] = datetime.utcnow()
 
-    result = await events_collection.insert_one(new_event)
-    created_event = await events_collection.find_one({"_id": result.inserted_id})
+    # insert_one sets new_event["_id"], so the response needs no read-back
+    await events_collection.insert_one(new_event)
+    search_cache.clear()
+    await invalidate_event_responses()
 
-    return event_serializer(created_event)
+    return event_serializer(new_event)
 
 
 # =================== Get All ======================
 
-async def get_all_events():
-    events = []
-    cursor = events_collection.find({})
+async def get_all_events(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    audience: Optional[str] = None,
+    tags: Optional[str] = None,
+    organizer: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Return one page of events ordered by (event_date, _id).
+
+    The `next` value of the result is an opaque cursor for the following
+    page, or None when there are no more events. `fields` limits each item
+    to the listed EVENT_FIELDS and is pushed down as a projection.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    selected = parse_fields(fields, EVENT_FIELDS)
+    projection = build_projection(selected, always=("event_date",))
+    query = build_event_filter(audience, tags, organizer, date_from, date_to)
+
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        keyset = {"$or": [
+            {"event_date": {"$gt": last_date}},
+            {"event_date": last_date, "_id": {"$gt": last_id}},
+        ]}
+        query = {"$and": [query, keyset]} if query else keyset
+
+    documents = await (
+        events_collection.find(query, projection)
+        .sort([("event_date", ASCENDING), ("_id", ASCENDING)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor(documents[-1])
+
+    return {
+        "items": [event_serializer(document, selected) for document in documents],
+        "next": next_cursor,
+    }
+
+
+# =================== Search ======================
+
+async def search_events(
+    q: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    audience: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Return one page of events matching `q`, best textScore first.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    selected = parse_fields(fields, EVENT_FIELDS)
+    query = build_event_filter(audience=audience, date_from=date_from, date_to=date_to)
+
+    async def run_search():
+        documents, next_cursor = await text_search_page(
+            events_collection, q, query, limit, cursor, build_projection(selected)
+        )
+        return {
+            "items": [event_serializer(document, selected) for document in documents],
+            "next": next_cursor,
+        }
+
+    cache_key = ("events", q.strip().lower(), limit, cursor, audience, date_from, date_to, fields)
+    return await search_cache.get_or_load(cache_key, run_search)
+
+
+# =================== Export ======================
+
+def encode_event(event) -> bytes:
+    return dumps(event_serializer(event))
+
+
+def _join_export_batch(batch: list, data_format: str, after_previous: bool) -> bytes:
+    if data_format == "ndjson":
+        return b"\n".join(batch) + b"\n"
+    joined = b",".join(batch)
+    return b"," + joined if after_previous else joined
+
+
+async def export_events(
+    data_format: str = "ndjson",
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    audience: Optional[str] = None,
+    tags: Optional[str] = None,
+    organizer: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream every matching event as NDJSON lines or a JSON array.
+
+    Documents are encoded as the Motor cursor delivers them and yielded one
+    batch per chunk, so memory stays flat however large the collection is.
+    `updated_since` selects events created or updated at or after that time.
+    """
+    query = build_event_filter(audience, tags, organizer, date_from, date_to)
+    if updated_since:
+        changed = {"$or": [
+            {"updated_at": {"$gte": updated_since}},
+            {"created_at": {"$gte": updated_since}},
+        ]}
+        query = {"$and": [query, changed]} if query else changed
+
+    cursor = events_reads.find(query).sort("_id", ASCENDING).batch_size(batch_size)
+
+    if data_format == "json":
+        yield b"["
+
+    batch = []
+    wrote_any = False
     async for document in cursor:
-        events.append(event_serializer(document))
-    return events
+        batch.append(encode_event(document))
+        if len(batch) >= batch_size:
+            yield _join_export_batch(batch, data_format, wrote_any)
+            batch = []
+            wrote_any = True
+
+    if batch:
+        yield _join_export_batch(batch, data_format, wrote_any)
+    if data_format == "json":
+        yield b"]"
+
+
+# =================== Cache validators ======================
+
+async def _newest(field: str) -> Optional[datetime]:
+    # Served from the single-field index; documents without the field sort last
+    documents = await (
+        events_collection.find({}, {"_id": 0, field: 1})
+        .sort(field, DESCENDING)
+        .limit(1)
+        .to_list(length=1)
+    )
+    return documents[0].get(field) if documents else None
+
+
+async def get_events_version() -> tuple:
+    """
+    Fingerprint of the whole events collection for list validators.
+
+    The count changes on every insert and delete, and the newest created_at /
+    updated_at on every insert and update, so any write changes the result.
+    All three come from collection metadata or an index, never a scan.
+    """
+    return tuple(await asyncio.gather(
+        events_collection.estimated_document_count(),
+        _newest("updated_at"),
+        _newest("created_at"),
+    ))
 
 
 # =================== Get by ID ======================
 
-async def get_event_by_id(event_id: str):
-    event = await events_collection.find_one({"_id": ObjectId(event_id)})
+async def find_event(event_id: str, fields: Optional[str] = None) -> tuple[dict, Optional[list[str]]]:
+    """
+    Fetch one event document for `fields`, keeping its timestamps so the
+    caller can check cache validators before serializing.
+    """
+    selected = parse_fields(fields, EVENT_FIELDS)
+    event_oid = parse_event_ids([event_id])[0]
+    projection = build_projection(selected, always=("created_at", "updated_at"))
+    event = await events_collection.find_one({"_id": event_oid}, projection)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event_serializer(event)
+    return event, selected
 
 
-# =================== Update ======================
+async def get_event_by_id(event_id: str, fields: Optional[str] = None):
+    event, selected = await find_event(event_id, fields)
+    return event_serializer(event, selected)
 
-async def update_event(event_id: str, request: EventUpdate, user_id: str):
-    event = await events_collection.find_one({"_id": ObjectId(event_id)})
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
 
-    if event["organizer"] != user_id:
-        raise HTTPException(status_code=403, detail="You cannot update this event")
+async def get_events_by_ids(event_ids: list[str], fields: Optional[str] = None) -> dict:
+    """
+    Fetch many events in one `$in` query.
+
+    Args:
+        event_ids: Ids in the order the caller wants them back; repeats are
+            answered each time but queried once
+        fields: Comma separated subset of EVENT_FIELDS
+
+    Returns:
+        dict: {"items": [...], "missing": [...]}, one item per requested id
+              with the event or a not-found marker, and the ids not found
+
+    Raises:
+        HTTPException: 400 for a malformed id or an unknown field, before
+            any query runs
+    """
+    if len(event_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per batch")
+    selected = parse_fields(fields, EVENT_FIELDS)
+    event_oids = parse_event_ids(event_ids)
+
+    unique = list(dict.fromkeys(event_oids))
+    projection = build_projection(selected)
+    found = {}
+    async for event in events_reads.find({"_id": {"$in": unique}}, projection):
+        found[event["_id"]] = event_serializer(event, selected)
+
+    items = []
+    missing = []
+    for event_oid in event_oids:
+        event = found.get(event_oid)
+        items.append({"id": str(event_oid), "found": event is not None, "event": event})
+        if event is None and str(event_oid) not in missing:
+            missing.append(str(event_oid))
+    return {"items": items, "missing": missing}
+
 
+async def _raise_not_found_or_forbidden(event_oid: ObjectId, forbidden_detail: str):
+    # Only reached when the ownership-guarded write matched nothing
+    if await events_collection.count_documents({"_id": event_oid}, limit=1):
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+    raise HTTPException(status_code=404, detail="Event not found")
+
+
+# =================== Update ======================
+
+async def update_event(event_id: str, request: EventUpdate, user_id: str):
+    owned = {"_id": parse_event_ids([event_id])[0], "organizer": user_id}
     updated_data = {k: v for k, v in request.dict().items() if v is not None}
 
     if updated_data:
         updated_data["updated_at"] = datetime.utcnow()
-        await events_collection.update_one(
-            {"_id": ObjectId(event_id)},
-            {"$set": updated_data}
+        updated_event = await events_collection.find_one_and_update(
+            owned,
+            {"$set": updated_data},
+            return_document=ReturnDocument.AFTER
         )
+    else:
+        updated_event = await events_collection.find_one(owned)
+
+    if not updated_event:
+        await _raise_not_found_or_forbidden(owned["_id"], "You cannot update this event")
+    search_cache.clear()
+    await invalidate_event_responses(owned["_id"])
 
-    updated_event = await events_collection.find_one({"_id": ObjectId(event_id)})
     return event_serializer(updated_event)
 
 
 # =================== Delete ======================
 
 async def delete_event(event_id: str, user_id: str):
-    event = await events_collection.find_one({"_id": ObjectId(event_id)})
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-
-    if event["organizer"] != user_id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this event")
+    owned = {"_id": parse_event_ids([event_id])[0], "organizer": user_id}
+    result = await events_collection.delete_one(owned)
+    if result.deleted_count == 0:
+        await _raise_not_found_or_forbidden(owned["_id"], "Not authorized to delete this event")
+    search_cache.clear()
+    await invalidate_event_responses(owned["_id"])
 
-    await events_collection.delete_one({"_id": ObjectId(event_id)})
-    return {"detail": "Event deleted successfully"}
+    return {"detail": "Event deleted successfully"}
\ No newline at end of file
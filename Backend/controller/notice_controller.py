@@ -1,11 +1,58 @@
 from schema.notice_schema import NoticeCreate, NoticeUpdate
 from fastapi import HTTPException
 from bson import ObjectId
-from datetime import datetime
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
 from database.connection import notices_collection  # MUST USE NOTICE COLLECTION
+from utils.fields import parse_fields, build_projection
+from utils.search import search_cache, text_search_page
+from utils.cache import TTLCache
+from utils.response_cache import response_cache
 
 
-def notice_serializer(notice) -> dict:
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+NOTICE_FEED_MAX_ITEMS = int(os.getenv("NOTICE_FEED_MAX_ITEMS", "200"))
+NOTICE_FEED_CACHE_TTL_SECONDS = float(os.getenv("NOTICE_FEED_CACHE_TTL_SECONDS", "30"))
+
+# Feeds are cached per audience segment, not per user: every student in a
+# department shares one entry. Writes clear the cache; the TTL bounds how
+# long another worker's writes take to show up.
+notice_feed_cache = TTLCache(max_size=1000, ttl_seconds=NOTICE_FEED_CACHE_TTL_SECONDS)
+
+
+# Public fields of a notice; `fields=` requests are checked against this
+NOTICE_FIELDS = (
+    "id", "title", "content", "start_date", "end_date", "audience", "tags",
+    "priority", "created_by", "created_at", "updated_at",
+)
+
+
+def parse_notice_id(notice_id) -> ObjectId:
+    """
+    Convert a notice id from a request.
+
+    Raises:
+        HTTPException: 400 if it is not a valid ObjectId
+    """
+    if not ObjectId.is_valid(notice_id):
+        raise HTTPException(status_code=400, detail=f"Invalid notice id: {notice_id}")
+    return ObjectId(notice_id)
+
+
+def notice_tag(notice_id) -> str:
+    # Response cache tag of a cached single notice
+    return f"notices:{parse_notice_id(notice_id)}"
+
+
+def notice_serializer(notice, fields: Optional[list[str]] = None) -> dict:
+    if fields is not None:
+        sparse = {"id": str(notice["_id"])}
+        sparse.update({name: notice.get(name) for name in fields if name != "id"})
+        return sparse
     return {
         "id": str(notice["_id"]),
         "title": notice["title"],
@@ -28,65 +75,195 @@ async def create_notice(request: NoticeCreate, user_id: str):
     new_notice["created_by"] = user_id
     new_notice["created_at"] = datetime.utcnow()
 
-    result = await notices_collection.insert_one(new_notice)
-    created_notice = await notices_collection.find_one({"_id": result.inserted_id})
+    # insert_one sets new_notice["_id"], so the response needs no read-back
+    await notices_collection.insert_one(new_notice)
+    search_cache.clear()
+    notice_feed_cache.clear()
+
+    return notice_serializer(new_notice)
+
+
+# ================= Notice Feed ====================
+
+def audience_segments(user: dict) -> tuple:
+    """
+    The audience values a user's feed includes: everyone ("all", or notices
+    with no audience), their role and their department.
+    """
+    segments = {"all"}
+    for value in (user.get("role"), user.get("department")):
+        if value:
+            segments.add(value)
+    return tuple(sorted(segments))
+
+
+async def _load_feed(segments: tuple, now: datetime) -> list:
+    # Served by the audience_priority_created_at_end_date index: equality on
+    # audience, then the feed's sort order, then the end_date range. Notices
+    # that start before the cached entry expires are loaded too, so it stays
+    # usable as they become active; they are filtered out per request. They
+    # get their own limit: counted together, a burst of scheduled notices
+    # could push active ones out of the feed.
+    query = {
+        "audience": {"$in": [*segments, None]},
+        "end_date": {"$not": {"$lt": now}},
+    }
+    started = {"$or": [{"start_date": None}, {"start_date": {"$lte": now}}]}
+    upcoming = {"start_date": {
+        "$gt": now, "$lte": now + timedelta(seconds=NOTICE_FEED_CACHE_TTL_SECONDS),
+    }}
+
+    async def load(window: dict) -> list:
+        cursor = (
+            notices_collection.find({**query, **window})
+            .sort([("priority", ASCENDING), ("created_at", DESCENDING)])
+            .limit(NOTICE_FEED_MAX_ITEMS)
+        )
+        return [notice_serializer(document) async for document in cursor]
+
+    feed = [notice for part in await asyncio.gather(load(started), load(upcoming)) for notice in part]
+    # Same order as the queries: newest first, then priority with nulls first
+    feed.sort(key=lambda notice: notice["created_at"], reverse=True)
+    feed.sort(key=lambda notice: (notice["priority"] is not None, notice["priority"] or 0))
+    return feed
+
 
-    return notice_serializer(created_notice)
+def _is_active(notice: dict, now: datetime) -> bool:
+    start_date, end_date = notice["start_date"], notice["end_date"]
+    return (start_date is None or start_date <= now) and (end_date is None or end_date >= now)
 
 
-# ================= Fetch all Notices ====================
+async def get_notices_for_user(user: dict):
+    """
+    Return the notices currently shown to a user, highest priority first,
+    then newest first.
 
-async def get_all_notices():
-    notices = []
-    cursor = notices_collection.find({})
-    async for document in cursor:
-        notices.append(notice_serializer(document))
-    return notices
+    Args:
+        user: The authenticated user; its role and department pick the feed
+
+    Returns:
+        list: Serialized notices whose start/end window covers now
+    """
+    segments = audience_segments(user)
+    now = datetime.utcnow()
+    feed = await notice_feed_cache.get_or_load(segments, lambda: _load_feed(segments, now))
+    return [notice for notice in feed if _is_active(notice, now)][:NOTICE_FEED_MAX_ITEMS]
+
+
+def select_notice_fields(notice: dict, fields: Optional[list[str]]) -> dict:
+    """
+    Cut an already serialized notice down to `fields`. The feed is cached per
+    audience segment with every field, so a sparse feed is selected from it
+    rather than projected in Mongo.
+    """
+    if fields is None:
+        return notice
+    sparse = {"id": notice["id"]}
+    sparse.update({name: notice.get(name) for name in fields if name != "id"})
+    return sparse
+
+
+# ================= Search Notices ====================
+
+async def search_notices(
+    q: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    audience: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Return one page of notices matching `q`, best textScore first.
+    The date range applies to the notice's start_date.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    selected = parse_fields(fields, NOTICE_FIELDS)
+
+    query = {}
+    if audience:
+        query["audience"] = audience
+    if date_from or date_to:
+        date_range = {}
+        if date_from:
+            date_range["$gte"] = date_from
+        if date_to:
+            date_range["$lte"] = date_to
+        query["start_date"] = date_range
+
+    async def run_search():
+        documents, next_cursor = await text_search_page(
+            notices_collection, q, query, limit, cursor, build_projection(selected)
+        )
+        return {
+            "items": [notice_serializer(document, selected) for document in documents],
+            "next": next_cursor,
+        }
+
+    cache_key = ("notices", q.strip().lower(), limit, cursor, audience, date_from, date_to, fields)
+    return await search_cache.get_or_load(cache_key, run_search)
 
 
 # ================= Fetch Notice by ID ====================
 
-async def get_notice_by_id(notice_id: str):
-    notice = await notices_collection.find_one({"_id": ObjectId(notice_id)})
+async def find_notice(notice_id: str, fields: Optional[str] = None) -> tuple[dict, Optional[list[str]]]:
+    """
+    Fetch one notice document for `fields`, keeping its timestamps so the
+    caller can check cache validators before serializing.
+    """
+    selected = parse_fields(fields, NOTICE_FIELDS)
+    notice_oid = parse_notice_id(notice_id)
+    projection = build_projection(selected, always=("created_at", "updated_at"))
+    notice = await notices_collection.find_one({"_id": notice_oid}, projection)
     if not notice:
         raise HTTPException(status_code=404, detail="Notice not found")
-    return notice_serializer(notice)
+    return notice, selected
+
+
+async def get_notice_by_id(notice_id: str, fields: Optional[str] = None):
+    notice, selected = await find_notice(notice_id, fields)
+    return notice_serializer(notice, selected)
+
+
+async def _raise_not_found_or_forbidden(notice_oid: ObjectId, forbidden_detail: str):
+    # Only reached when the ownership-guarded write matched nothing
+    if await notices_collection.count_documents({"_id": notice_oid}, limit=1):
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+    raise HTTPException(status_code=404, detail="Notice not found")
 
 
 # ================= Update Notice ====================
 
 async def update_notice(notice_id: str, request: NoticeUpdate, user_id: str):
-    notice = await notices_collection.find_one({"_id": ObjectId(notice_id)})
-    if not notice:
-        raise HTTPException(status_code=404, detail="Notice not found")
-
-    if notice["created_by"] != user_id:
-        raise HTTPException(status_code=403, detail="You cannot update this notice")
+    owned = {"_id": parse_notice_id(notice_id), "created_by": user_id}
 
     updated_data = {k: v for k, v in request.dict().items() if v is not None}
     updated_data["updated_at"] = datetime.utcnow()
 
-    await notices_collection.update_one(
-        {"_id": ObjectId(notice_id)},
-        {"$set": updated_data}
+    updated_notice = await notices_collection.find_one_and_update(
+        owned,
+        {"$set": updated_data},
+        return_document=ReturnDocument.AFTER
     )
+    if not updated_notice:
+        await _raise_not_found_or_forbidden(owned["_id"], "You cannot update this notice")
+    search_cache.clear()
+    notice_feed_cache.clear()
+    await response_cache.invalidate(notice_tag(owned["_id"]))
 
-    updated_notice = await notices_collection.find_one({"_id": ObjectId(notice_id)})
     return notice_serializer(updated_notice)
 
 
 # ================= Delete Notice ====================
 
 async def delete_notice(notice_id: str, user_id: str):
-    notice = await notices_collection.find_one({"_id": ObjectId(notice_id)})
-    if not notice:
-        raise HTTPException(status_code=404, detail="Notice not found")
-
-    if notice["created_by"] != user_id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this notice")
-
-    result = await notices_collection.delete_one({"_id": ObjectId(notice_id)})
+    owned = {"_id": parse_notice_id(notice_id), "created_by": user_id}
+    result = await notices_collection.delete_one(owned)
     if result.deleted_count == 0:
-        raise HTTPException(status_code=500, detail="Failed to delete notice")
+        await _raise_not_found_or_forbidden(owned["_id"], "Not authorized to delete this notice")
+    search_cache.clear()
+    notice_feed_cache.clear()
+    await response_cache.invalidate(notice_tag(owned["_id"]))
 
     return {"detail": "Notice deleted successfully"}
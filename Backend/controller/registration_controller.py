@@ -0,0 +1,175 @@
+from datetime import datetime
+from fastapi import HTTPException
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from database.connection import events_collection, registrations_collection
+from schema.registration_schema import createRegistration
+from controller.event_controller import invalidate_event_responses, parse_event_ids
+
+
+# Seat accounting lives on the event document: events created with a
+# capacity carry a `seats_left` counter that is only ever changed with a
+# guarded $inc, so concurrent signups can never overbook. Registrations that
+# find no seat go on a waitlist ordered by `waitlisted_at`. A cancelled seat
+# goes straight to the oldest waiter, so newcomers cannot take it first.
+
+
+def registration_serializer(registration) -> dict:
+    return {
+        "id": str(registration["_id"]),
+        "event_id": registration["event_id"],
+        "name": registration["name"],
+        "email": registration["email"],
+        "phone": registration.get("phone"),
+        "department": registration.get("department"),
+        "year": registration.get("year"),
+        "status": registration["status"],
+        "created_at": registration["created_at"],
+        "confirmed_at": registration.get("confirmed_at"),
+    }
+
+
+async def _take_seat(event_oid: ObjectId) -> bool:
+    event = await events_collection.find_one_and_update(
+        {"_id": event_oid, "seats_left": {"$gt": 0}},
+        # updated_at feeds the event ETags and the updated_since sync
+        {"$inc": {"seats_left": -1}, "$set": {"updated_at": datetime.utcnow()}},
+        projection={"_id": 1},
+    )
+    if event is None:
+        return False
+    # seats_left is part of the cached event responses
+    await invalidate_event_responses(event_oid)
+    return True
+
+
+async def _return_seat(event_oid: ObjectId) -> bool:
+    # Events without a capacity have no counter and must not grow one
+    result = await events_collection.update_one(
+        {"_id": event_oid, "seats_left": {"$exists": True}},
+        {"$inc": {"seats_left": 1}, "$set": {"updated_at": datetime.utcnow()}},
+    )
+    if result.modified_count != 1:
+        return False
+    await invalidate_event_responses(event_oid)
+    return True
+
+
+async def promote_waitlist(event_id: str) -> int:
+    """
+    Move waitlisted registrations into free seats, oldest first.
+
+    Each promotion takes a seat with the same guarded $inc as a signup and
+    then confirms the oldest waiter; if there turns out to be no waiter the
+    seat is handed back. Called after every cancellation and after every
+    waitlist insert, so a seat freed while a signup was being waitlisted is
+    never left empty.
+
+    Returns:
+        int: How many registrations were confirmed
+    """
+    event_oid = parse_event_ids([event_id])[0]
+    promoted = 0
+    while await _take_seat(event_oid):
+        if not await _confirm_oldest_waiter(event_id):
+            await _return_seat(event_oid)
+            break
+        promoted += 1
+    return promoted
+
+
+async def _confirm_oldest_waiter(event_id: str) -> bool:
+    """Confirm the longest-waiting registration; the caller holds a seat for it."""
+    promoted = await registrations_collection.find_one_and_update(
+        {"event_id": event_id, "status": "waitlisted"},
+        {"$set": {"status": "confirmed", "confirmed_at": datetime.utcnow()}},
+        sort=[("waitlisted_at", ASCENDING)],
+        projection={"_id": 1},
+    )
+    return promoted is not None
+
+
+# ================= Register ====================
+
+async def register_for_event(request: createRegistration) -> dict:
+    """
+    Register for an event, confirmed if a seat is free and waitlisted
+    otherwise. Registering the same email twice returns the existing
+    registration.
+    """
+    event_oid = parse_event_ids([request.event_id])[0]
+    now = datetime.utcnow()
+    registration = request.dict()
+    registration["created_at"] = now
+
+    # Hot path: one guarded $inc takes a seat on a capacity-limited event.
+    # seats_left only rises when nobody is waiting (cancel_registration hands
+    # freed seats straight to the oldest waiter), so a free seat here is not
+    # owed to anyone.
+    took_seat = await _take_seat(event_oid)
+    seated = took_seat
+    if not seated:
+        event = await events_collection.find_one({"_id": event_oid}, {"capacity": 1})
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        # Events without a capacity accept everyone
+        seated = not event.get("capacity")
+
+    if seated:
+        registration["status"] = "confirmed"
+        registration["confirmed_at"] = now
+    else:
+        registration["status"] = "waitlisted"
+        registration["waitlisted_at"] = now
+
+    try:
+        await registrations_collection.insert_one(registration)
+    except DuplicateKeyError:
+        # Already registered: hand back the seat we just took
+        if took_seat:
+            await _return_seat(event_oid)
+            await promote_waitlist(request.event_id)
+        existing = await registrations_collection.find_one(
+            {"event_id": request.event_id, "email": request.email}
+        )
+        if existing:
+            return registration_serializer(existing)
+        raise HTTPException(status_code=409, detail="Registration changed concurrently, please retry")
+
+    # Only re-read when someone was promoted; it may have been this signup
+    if registration["status"] == "waitlisted" and await promote_waitlist(request.event_id):
+        current = await registrations_collection.find_one({"_id": registration["_id"]})
+        if current:
+            registration = current
+
+    return registration_serializer(registration)
+
+
+# ================= Cancel ====================
+
+async def cancel_registration(event_id: str, email: str) -> dict:
+    event_oid = parse_event_ids([event_id])[0]
+    registration = await registrations_collection.find_one_and_delete(
+        {"event_id": event_id, "email": email}
+    )
+    if not registration:
+        raise HTTPException(status_code=404, detail="Registration not found")
+
+    if registration["status"] == "confirmed":
+        # The freed seat goes to the oldest waiter without passing through
+        # seats_left, so no concurrent signup can take it first
+        if not await _confirm_oldest_waiter(event_id) and await _return_seat(event_oid):
+            # Someone may have joined the waitlist after that check
+            await promote_waitlist(event_id)
+
+    return {"detail": "Registration cancelled successfully"}
+
+
+# ================= Fetch ====================
+
+async def get_registration(event_id: str, email: str) -> dict:
+    registration = await registrations_collection.find_one({"event_id": event_id, "email": email})
+    if not registration:
+        raise HTTPException(status_code=404, detail="Registration not found")
+    return registration_serializer(registration)
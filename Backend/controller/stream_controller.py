@@ -0,0 +1,297 @@
+"""
+Live event and notice changes for the SSE and WebSocket endpoints.
+
+Each worker runs ONE change stream, on the database, filtered to the events
+and notices collections (one stream keeps a single resume token sequence for
+both). Every change is serialized and encoded once, then fanned out to the
+connected clients whose audience filter it matches. Each client has a
+bounded queue: a client that falls LIVE_CLIENT_QUEUE_SIZE changes behind is
+sent what is queued and then disconnected with an "overflow" message, so it
+reconnects and catches up instead of holding memory.
+
+Resuming: every message carries the change's resume token (the SSE `id`).
+A client that reconnects with it (Last-Event-ID, or `resume_token=`) gets
+the changes it missed without duplicates:
+  - from the in-memory replay buffer of the last LIVE_REPLAY_BUFFER_SIZE
+    changes when the token is in it;
+  - otherwise (another worker issued it, or it is older than the buffer)
+    from a short-lived change stream resumed after the token, drained
+    until it is caught up; changes also seen live are skipped;
+  - if the oplog no longer has the token, a "reset" message tells the
+    client to reload the lists.
+
+Change streams need a replica set. For local testing a single node is
+enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0
+    mongosh --eval 'rs.initiate()'
+    MONGO_URL="mongodb://localhost:27017/?replicaSet=rs0" uvicorn main:app
+
+On a standalone server the feed disables itself and the endpoints answer 503.
+"""
+import asyncio
+import os
+from collections import deque
+from typing import AsyncIterator, Optional
+from pymongo.errors import OperationFailure, PyMongoError
+from database.connection import DB
+from controller.event_controller import event_serializer
+from controller.notice_controller import notice_serializer
+from utils.metrics import registry
+from utils.responses import dumps
+
+LIVE_CLIENT_QUEUE_SIZE = int(os.getenv("LIVE_CLIENT_QUEUE_SIZE", "256"))
+LIVE_REPLAY_BUFFER_SIZE = int(os.getenv("LIVE_REPLAY_BUFFER_SIZE", "10000"))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+LIVE_MAX_CLIENTS = int(os.getenv("LIVE_MAX_CLIENTS", "10000"))
+# A catch-up longer than this is cheaper as a reload; the client gets "reset"
+LIVE_MAX_CATCH_UP = int(os.getenv("LIVE_MAX_CATCH_UP", "10000"))
+
+WATCHED_COLLECTIONS = {"events": event_serializer, "notices": notice_serializer}
+NOT_A_REPLICA_SET = 40573
+CHANGE_STREAM_HISTORY_LOST = 286
+
+live_overflows = registry.counter(
+    "live_client_overflows_total", "Live clients disconnected for falling too far behind"
+)
+live_changes = registry.counter(
+    "live_changes_total", "Changes received from the change stream", ("collection", "operation")
+)
+
+
+class FeedEntry:
+    """One change, encoded once for every client that receives it."""
+
+    def __init__(self, token: Optional[str], kind: str, payload: dict, audiences: Optional[frozenset] = None):
+        self.token = token
+        self.kind = kind
+        # None means every client gets it (deletes, audience changes,
+        # control messages)
+        self.audiences = audiences
+        self.json = dumps({"type": kind, "token": token, **payload})
+        frame = b""
+        if token is not None:
+            frame += b"id: " + token.encode("ascii") + b"\n"
+        self.sse = frame + b"event: " + kind.encode("ascii") + b"\ndata: " + self.json + b"\n\n"
+
+
+HEARTBEAT = FeedEntry(None, "ping", {})
+OVERFLOW = FeedEntry(None, "overflow", {"detail": "Client fell behind; reconnect with the last token"})
+RESET = FeedEntry(None, "reset", {"detail": "Missed changes are no longer available; reload the lists"})
+
+
+def _audiences_of(document: Optional[dict]) -> Optional[frozenset]:
+    if document is None:
+        return None
+    audience = document.get("audience")
+    if audience is None or audience == "all":
+        return None
+    if isinstance(audience, list):
+        return None if "all" in audience else frozenset(audience)
+    return frozenset((audience,))
+
+
+def _audience_changed(change: dict) -> bool:
+    # The stream only carries the post-image. When an update may have moved
+    # the document out of an audience, the old one has to hear about it too.
+    if change["operationType"] != "update":
+        return change["operationType"] == "replace"
+    description = change.get("updateDescription") or {}
+    touched = [*description.get("updatedFields", {}), *description.get("removedFields", [])]
+    return any(field == "audience" or field.startswith("audience.") for field in touched)
+
+
+def change_to_entry(change: dict) -> FeedEntry:
+    collection = change["ns"]["coll"]
+    operation = change["operationType"]
+    document = change.get("fullDocument")
+    audiences = None if _audience_changed(change) else _audiences_of(document)
+    payload = {
+        "collection": collection,
+        "operation": operation,
+        "id": str(change["documentKey"]["_id"]),
+        # updateLookup finds nothing when the document was deleted since
+        "document": WATCHED_COLLECTIONS[collection](document) if document else None,
+    }
+    return FeedEntry(change["_id"]["_data"], collection, payload, audiences)
+
+
+class Subscriber:
+    def __init__(self, audiences: Optional[set], max_queue: int = LIVE_CLIENT_QUEUE_SIZE):
+        self.audiences = audiences
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def wants(self, entry: FeedEntry) -> bool:
+        if self.audiences is None or entry.audiences is None:
+            return True
+        return not entry.audiences.isdisjoint(self.audiences)
+
+    def offer(self, entry: FeedEntry) -> bool:
+        """Queue an entry; False once the client has fallen too far behind."""
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            live_overflows.inc()
+            return False
+        return True
+
+    async def next(self, heartbeat_seconds: float) -> FeedEntry:
+        if self.overflowed and self.queue.empty():
+            return OVERFLOW
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=heartbeat_seconds)
+        except asyncio.TimeoutError:
+            return HEARTBEAT
+
+
+class ChangeFeed:
+    def __init__(self, replay_size: int = LIVE_REPLAY_BUFFER_SIZE):
+        self.available = False
+        self._subscribers: set[Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_token: Optional[dict] = None
+        # (sequence, entry) of recent changes, plus token -> sequence
+        self._buffer: deque = deque(maxlen=replay_size)
+        self._positions: dict[str, int] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    @staticmethod
+    def _watch(resume_token: Optional[dict] = None):
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": list(WATCHED_COLLECTIONS)},
+            "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+        }}]
+        return DB.watch(pipeline, full_document="updateLookup", resume_after=resume_token)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.available = False
+
+    async def _run(self):
+        delay = 1
+        while True:
+            try:
+                async with self._watch(self._last_token) as stream:
+                    self.available = True
+                    delay = 1
+                    async for change in stream:
+                        self._last_token = change["_id"]
+                        self.publish(change_to_entry(change))
+                        live_changes.inc(change["ns"]["coll"], change["operationType"])
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == NOT_A_REPLICA_SET:
+                    self.available = False
+                    print("⚠️ Live updates disabled: change streams need a replica set")
+                    return
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    # Our own position fell off the oplog; clients must reload
+                    self._last_token = None
+                    self._clear_buffer()
+                    self.publish(RESET, buffered=False)
+                print(f"⚠️ Change stream failed ({str(e)}), reconnecting in {delay}s")
+            except (PyMongoError, NotImplementedError) as e:
+                print(f"⚠️ Change stream failed ({str(e)}), reconnecting in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _clear_buffer(self):
+        self._buffer.clear()
+        self._positions.clear()
+
+    def publish(self, entry: FeedEntry, buffered: bool = True):
+        """Record a change and hand it to every interested client."""
+        if buffered and entry.token is not None:
+            if len(self._buffer) == self._buffer.maxlen:
+                _, evicted = self._buffer[0]
+                self._positions.pop(evicted.token, None)
+            self._sequence += 1
+            self._buffer.append((self._sequence, entry))
+            self._positions[entry.token] = self._sequence
+        for subscriber in self._subscribers:
+            if subscriber.wants(entry):
+                subscriber.offer(entry)
+
+    def _replay_after(self, token: str) -> Optional[list]:
+        position = self._positions.get(token)
+        if position is None:
+            return None
+        return [entry for sequence, entry in self._buffer if sequence > position]
+
+    async def _catch_up(self, token: str) -> AsyncIterator[FeedEntry]:
+        try:
+            async with self._watch({"_data": token}) as stream:
+                for _ in range(LIVE_MAX_CATCH_UP):
+                    change = await stream.try_next()
+                    if change is None:
+                        return
+                    yield change_to_entry(change)
+        except OperationFailure:
+            # Token unknown or no longer in the oplog
+            pass
+        yield RESET
+
+    async def listen(
+        self,
+        audiences: Optional[set] = None,
+        resume_token: Optional[str] = None,
+        heartbeat_seconds: float = LIVE_HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[FeedEntry]:
+        """
+        Yield the entries one client should receive: missed changes after
+        `resume_token` first, then live ones, with HEARTBEAT when idle. Ends
+        after yielding OVERFLOW.
+        """
+        subscriber = Subscriber(audiences)
+        # Snapshot and subscribe with no await in between, so every change
+        # lands either in the backlog or in the queue, never both or neither
+        backlog = self._replay_after(resume_token) if resume_token else []
+        self._subscribers.add(subscriber)
+        delivered = set()
+        try:
+            if backlog is None:
+                async for entry in self._catch_up(resume_token):
+                    if entry is RESET:
+                        delivered.clear()
+                        yield RESET
+                        break
+                    delivered.add(entry.token)
+                    if subscriber.wants(entry):
+                        yield entry
+            else:
+                for entry in backlog:
+                    if subscriber.wants(entry):
+                        yield entry
+
+            while True:
+                entry = await subscriber.next(heartbeat_seconds)
+                if entry.token is not None and entry.token in delivered:
+                    continue
+                yield entry
+                if entry is OVERFLOW:
+                    return
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+change_feed = ChangeFeed()
+
+registry.callback(
+    "live_clients", "Clients connected to the live update stream", (), "gauge",
+    lambda: {(): len(change_feed)},
+)
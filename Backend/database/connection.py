@@ -1,14 +1,298 @@
+"""
+MongoDB client, collections and read routing.
+
+The client is configured from MONGO_* environment variables and is created
+and closed by the FastAPI lifespan in main.py (connect() / close()). The
+collection names below are handles that resolve against the current client
+on use, so modules can import them at import time as before. Scripts that
+never run the lifespan (benchmarks, the index CLI) get a client lazily on
+first use.
+
+Reads go to the primary unless a controller asks otherwise: a handle's
+`.secondary_preferred` variant sends its reads to a secondary when the
+deployment has one. Use it only for reads that tolerate replication lag;
+anything that must see the caller's own write stays on the primary. So do
+reads that fill a cache: a write invalidates the entry, and a refill from a
+lagging secondary would store the old document again for the whole TTL.
+"""
+import importlib.util
+import os
+import threading
+import time
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference, monitoring
+from utils.metrics import registry
+
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "eventsync_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+# How long a request may wait for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+# Preferred first; compressors whose Python package is missing are skipped
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+# Set to false to keep every read on the primary
+MONGO_SECONDARY_READS = os.getenv("MONGO_SECONDARY_READS", "true").lower() == "true"
+
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def available_compressors(names: str = MONGO_COMPRESSORS) -> list[str]:
+    compressors = []
+    for name in (name.strip() for name in names.split(",")):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            compressors.append(name)
+    return compressors
+
+
+class PoolWaitStats(monitoring.ConnectionPoolListener):
+    """
+    Records how long operations wait to check a connection out of the pool.
+
+    A rising average or max wait means requests are queueing for
+    connections: raise MONGO_MAX_POOL_SIZE or find the slow queries holding
+    them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = threading.local()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.connections_created = 0
+        self.connections_closed = 0
+
+    def _record_wait(self, event, failed: bool):
+        # Newer pymongo reports the wait on the event; otherwise time it from
+        # the start event, which fires on the same thread
+        duration = getattr(event, "duration", None)
+        if duration is None:
+            started = getattr(self._started, "value", None)
+            duration = time.perf_counter() - started if started is not None else 0.0
+        with self._lock:
+            if failed:
+                self.checkout_failures += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += duration
+            self.max_wait_seconds = max(self.max_wait_seconds, duration)
+
+    def connection_check_out_started(self, event):
+        self._started.value = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self._record_wait(event, failed=False)
+
+    def connection_check_out_failed(self, event):
+        self._record_wait(event, failed=True)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": (self.total_wait_seconds / attempts * 1000) if attempts else 0.0,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+                "connections_open": self.connections_created - self.connections_closed,
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+mongo_command_duration = registry.histogram(
+    "mongo_command_duration_seconds",
+    "Server round trip of each Mongo command by command and collection",
+    ("command", "collection"),
+)
+mongo_command_failures = registry.counter(
+    "mongo_command_failures_total", "Mongo commands that returned an error", ("command", "collection")
+)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Times every command sent to the server. Only the started event carries
+    the command document, so the collection name is kept until the matching
+    succeeded / failed event arrives.
+    """
+
+    def __init__(self):
+        self._collections: dict = {}
+
+    def started(self, event):
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        else:
+            target = event.command.get(event.command_name)
+        # Commands like ping or hello name no collection
+        self._collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ""
+
+    def _record(self, event, failed: bool):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        mongo_command_duration.observe(event.duration_micros / 1e6, event.command_name, collection)
+        if failed:
+            mongo_command_failures.inc(event.command_name, collection)
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+
+command_metrics = CommandMetrics()
+
+_client: Optional[AsyncIOMotorClient] = None
+# Bumped whenever the client changes so handles drop their resolved collections
+_generation = 0
+
+
+def _create_client() -> AsyncIOMotorClient:
+    options = dict(
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        event_listeners=[pool_wait_stats, command_metrics],
+    )
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return AsyncIOMotorClient(MONGO_URL, **options)
+
+
+def get_client() -> AsyncIOMotorClient:
+    global _client, _generation
+    if _client is None:
+        _client = _create_client()
+        _generation += 1
+    return _client
+
+
+def get_database():
+    return get_client()[MONGO_DB_NAME]
+
+
+def use_client(client):
+    """
+    Install an already built client, e.g. an in-process stand-in for load
+    tests. Must be called before connect().
+    """
+    global _client, _generation
+    _client = client
+    _generation += 1
+
+
+async def connect():
+    """
+    Create the client and ping the server, so the first request does not pay
+    for server selection and the pool starts filling to MONGO_MIN_POOL_SIZE.
+    """
+    await get_client().admin.command("ping")
+    print(f"✅ Connected to MongoDB ({MONGO_DB_NAME})")
+
+
+def close():
+    global _client, _generation
+    if _client is not None:
+        _client.close()
+        _client = None
+        _generation += 1
+
+
+class CollectionHandle:
+    """
+    Stands in for a Motor collection and forwards every attribute to the
+    collection on the current client.
+    """
+
+    def __init__(self, name: str, read_preference=None):
+        self.name = name
+        self._read_preference = read_preference
+        self._collection = None
+        self._resolved_generation = None
+        self._secondary: Optional["CollectionHandle"] = None
+
+    def _resolve(self):
+        get_client()
+        if self._resolved_generation != _generation:
+            collection = get_database()[self.name]
+            if self._read_preference is not None:
+                collection = collection.with_options(read_preference=self._read_preference)
+            self._collection = collection
+            self._resolved_generation = _generation
+        return self._collection
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    @property
+    def secondary_preferred(self) -> "CollectionHandle":
+        if not MONGO_SECONDARY_READS:
+            return self
+        # One handle per collection; it re-resolves itself when the client changes
+        if self._secondary is None:
+            self._secondary = CollectionHandle(self.name, ReadPreference.SECONDARY_PREFERRED)
+        return self._secondary
+
 
+class DatabaseHandle:
+    """Lazy stand-in for the application database; db["name"] works as usual."""
 
-mongo_url = "mongodb://localhost:27017"
-mongo_client = AsyncIOMotorClient(mongo_url)
-DB = mongo_client['eventsync_db']
-events_collection = DB["events"]
-users_collection = DB["users"]
-teachers_collection = DB["teachers"]
-blacklisted_tokens = DB["blacklisted_tokens"]
-notices_collection = DB["notices"]
+    def __getitem__(self, name: str):
+        return get_database()[name]
 
+    def __getattr__(self, attr):
+        return getattr(get_database(), attr)
 
 
+DB = DatabaseHandle()
+events_collection = CollectionHandle("events")
+users_collection = CollectionHandle("users")
+teachers_collection = CollectionHandle("teachers")
+blacklisted_tokens = CollectionHandle("blacklisted_tokens")
+notices_collection = CollectionHandle("notices")
+counters_collection = CollectionHandle("counters")
+registrations_collection = CollectionHandle("registrations")
+attendance_collection = CollectionHandle("attendance")
+refresh_tokens_collection = CollectionHandle("refresh_tokens")
@@ -0,0 +1,244 @@
+"""
+Declarative index registry for the EventSync collections.
+
+Every index the application relies on is declared in INDEXES. The FastAPI
+lifespan in main.py calls ensure_indexes() at startup, which is idempotent:
+an index that already exists with the same spec is left alone.
+
+The module can also be run as a CLI from the Backend directory:
+
+    python -m database.indexes diff    # show missing / unexpected indexes
+    python -m database.indexes apply   # create the missing indexes
+    python -m database.indexes check   # explain() the hot queries, fail on COLLSCAN
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from database.connection import DB
+
+
+# IndexOptionsConflict, IndexKeySpecsConflict
+INDEX_SPEC_CONFLICTS = (85, 86)
+# Options whose change makes ensure_indexes() drop and recreate an index;
+# so does a change of its key
+REBUILD_ON_CHANGE = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+
+INDEXES = {
+    "users": [
+        # email is optional on a user; only string emails have to be unique,
+        # so any number of accounts may leave it out or null
+        IndexModel(
+            [("email", ASCENDING)], name="email_unique", unique=True,
+            partialFilterExpression={"email": {"$type": "string"}},
+        ),
+    ],
+    "teachers": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("teacher_id", ASCENDING)], name="teacher_id_unique", unique=True),
+    ],
+    # Every event list query sorts on (event_date, _id), so each filter gets an
+    # index with that suffix and the keyset range is served from the index.
+    "events": [
+        IndexModel([("event_date", ASCENDING), ("_id", ASCENDING)], name="event_date_id"),
+        IndexModel([("audience", ASCENDING), ("event_date", ASCENDING), ("_id", ASCENDING)], name="audience_event_date_id"),
+        IndexModel([("organizer", ASCENDING), ("event_date", ASCENDING), ("_id", ASCENDING)], name="organizer_event_date_id"),
+        IndexModel([("tag_list", ASCENDING), ("event_date", ASCENDING), ("_id", ASCENDING)], name="tag_list_event_date_id"),
+        # Incremental exports (updated_since) match on either timestamp
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT), ("tags", TEXT)],
+            name="events_text",
+            weights={"title": 10, "tags": 5, "description": 1},
+        ),
+    ],
+    "notices": [
+        IndexModel([("created_by", ASCENDING)], name="created_by"),
+        # Per-audience feed: equality, then sort (priority, newest), then range
+        IndexModel(
+            [("audience", ASCENDING), ("priority", ASCENDING), ("created_at", DESCENDING), ("end_date", ASCENDING)],
+            name="audience_priority_created_at_end_date",
+        ),
+        IndexModel(
+            [("title", TEXT), ("content", TEXT), ("tags", TEXT)],
+            name="notices_text",
+            weights={"title": 10, "tags": 5, "content": 1},
+        ),
+    ],
+    "registrations": [
+        # One registration per email per event; makes signups idempotent
+        IndexModel([("event_id", ASCENDING), ("email", ASCENDING)], name="event_id_email_unique", unique=True),
+        IndexModel([("event_id", ASCENDING), ("status", ASCENDING), ("waitlisted_at", ASCENDING)], name="event_id_status_waitlisted_at"),
+    ],
+    "attendance": [
+        # Scans are upserts on this key, so a re-scan never adds a second row
+        IndexModel([("event_id", ASCENDING), ("user_id", ASCENDING)], name="event_id_user_id_unique", unique=True),
+    ],
+    "blacklisted_tokens": [
+        IndexModel([("token", ASCENDING)], name="token_unique", unique=True),
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+        # Mongo drops revocations once the token itself has expired
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "refresh_tokens": [
+        IndexModel([("token_hash", ASCENDING)], name="token_hash_unique", unique=True),
+        IndexModel([("session_id", ASCENDING)], name="session_id"),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+
+# (collection, filter, sort) for the queries that run on every request or on
+# every login; check_hot_queries() requires all of them to use an index.
+HOT_QUERIES = [
+    ("users", {"email": "probe@example.com"}, None),
+    ("users", {"_id": ObjectId()}, None),
+    ("teachers", {"email": "probe@example.com"}, None),
+    ("blacklisted_tokens", {"revoked_at": {"$gte": datetime(2000, 1, 1)}}, None),
+    ("refresh_tokens", {"token_hash": "probe"}, None),
+    ("events", {}, [("event_date", ASCENDING), ("_id", ASCENDING)]),
+    ("events", {"audience": "all"}, [("event_date", ASCENDING), ("_id", ASCENDING)]),
+    ("events", {"organizer": "probe"}, [("event_date", ASCENDING), ("_id", ASCENDING)]),
+    ("events", {"tag_list": {"$all": ["probe"]}}, [("event_date", ASCENDING), ("_id", ASCENDING)]),
+    ("notices", {"audience": {"$in": ["all", "user", None]}, "end_date": {"$not": {"$lt": datetime(2000, 1, 1)}}},
+     [("priority", ASCENDING), ("created_at", DESCENDING)]),
+]
+
+
+async def ensure_indexes(db=DB):
+    """
+    Create every declared index. Safe to call on each startup.
+    """
+    for collection_name, models in INDEXES.items():
+        try:
+            await db[collection_name].create_indexes(models)
+        except OperationFailure as e:
+            if e.code not in INDEX_SPEC_CONFLICTS:
+                raise
+            # A declared index changed its key or options (e.g. became
+            # partial): rebuild the ones whose existing spec differs
+            await _rebuild_changed(db[collection_name], models)
+
+
+def _key_of(key) -> list:
+    # index_information() lists (field, direction) pairs, possibly with
+    # float directions; IndexModel keeps an ordered mapping
+    pairs = key.items() if hasattr(key, "items") else key
+    return [(field, int(direction) if isinstance(direction, float) else direction) for field, direction in pairs]
+
+
+def _spec_changed(current: dict, spec: dict) -> bool:
+    if any(current.get(option) != spec.get(option) for option in REBUILD_ON_CHANGE):
+        return True
+    declared = _key_of(spec["key"])
+    # The server reports a text index's key as _fts/_ftsx, never the fields
+    if any(direction == TEXT for _, direction in declared):
+        return False
+    return _key_of(current["key"]) != declared
+
+
+async def _rebuild_changed(collection, models):
+    existing = await collection.index_information()
+    for model in models:
+        spec = model.document
+        current = existing.get(spec["name"])
+        if current is None:
+            continue
+        if _spec_changed(current, spec):
+            print(f"⚠️ Rebuilding index {collection.name}.{spec['name']} with its new spec")
+            await collection.drop_index(spec["name"])
+    await collection.create_indexes(models)
+
+
+async def diff_indexes(db=DB) -> dict:
+    """
+    Compare the declared indexes with the ones present in the database.
+
+    Returns:
+        dict: collection name -> {"missing": [...], "unexpected": [...]},
+              only for collections that differ from the registry
+    """
+    drift = {}
+    for collection_name, models in INDEXES.items():
+        declared = {model.document["name"] for model in models}
+        existing = set(await db[collection_name].index_information())
+        existing.discard("_id_")
+
+        missing = sorted(declared - existing)
+        unexpected = sorted(existing - declared)
+        if missing or unexpected:
+            drift[collection_name] = {"missing": missing, "unexpected": unexpected}
+    return drift
+
+
+def _find_collscan(plan) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_find_collscan(value) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_find_collscan(value) for value in plan)
+    return False
+
+
+async def check_hot_queries(db=DB) -> list:
+    """
+    Run explain() on every query in HOT_QUERIES.
+
+    Returns:
+        list: descriptions of the queries whose winning plan is a COLLSCAN
+    """
+    failures = []
+    for collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+        if _find_collscan(winning_plan):
+            failures.append(f"{collection_name}: find({query}) sort={sort}")
+    return failures
+
+
+async def _run(command: str) -> int:
+    if command == "apply":
+        await ensure_indexes()
+        print("Indexes applied")
+        return 0
+
+    if command == "diff":
+        drift = await diff_indexes()
+        if not drift:
+            print("Indexes match the registry")
+            return 0
+        for collection_name, changes in drift.items():
+            for name in changes["missing"]:
+                print(f"+ {collection_name}.{name}")
+            for name in changes["unexpected"]:
+                print(f"? {collection_name}.{name}")
+        return 1
+
+    failures = await check_hot_queries()
+    for failure in failures:
+        print(f"COLLSCAN {failure}")
+    if failures:
+        return 1
+    print("All hot queries use an index")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Manage EventSync MongoDB indexes")
+    parser.add_argument("command", choices=["diff", "apply", "check"])
+    args = parser.parse_args(argv)
+    return asyncio.run(_run(args.command))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,17 @@
 from fastapi import HTTPException, Depends
-from jwt_auth.jwt_handler import get_current_user
+from jwt_auth.jwt_handler import get_current_claims
 
 
-async def get_current_admin(current_user: dict = Depends(get_current_user)):
+async def get_current_admin(current_user: dict = Depends(get_current_claims)):
     """
     Dependency to verify that the current user has admin role.
+    The role comes from the signed token claims, so no lookup is made.
     
     Args:
-        current_user: User dict from get_current_user dependency
+        current_user: Claims dict from get_current_claims dependency
         
     Returns:
-        dict: Current user if they are an admin
+        dict: Token claims if the user is an admin
         
     Raises:
         HTTPException: 403 if user is not an admin
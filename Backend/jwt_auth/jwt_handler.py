@@ -1,51 +1,63 @@
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-import os 
+import os
+import uuid
 from fastapi import HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer
-from database.connection import users_collection, blacklisted_tokens
-from bson import ObjectId
+from jwt_auth.revocation import revocation_cache
+from jwt_auth.user_cache import get_cached_user
 
 SECRET_KEY = "SECRET_KEY_FOR_JWT_TOKENS"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_HOURS = 24
+# Short lived: access tokens are checked from their claims alone, so logout,
+# account deletion and role changes take effect within this window
+# (revocation is enforced when the refresh token is exchanged)
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+
+# Claims copied from the token into the dict get_current_claims returns
+CLAIM_FIELDS = ("id", "email", "role", "department", "sid", "jti")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 def create_access_token(data: dict)-> str:
     to_encode = data.copy()
-    expire= datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    expire= now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+async def get_current_claims(token: str = Depends(oauth2_scheme)) -> dict:
     """
-    Dependency to validate JWT token and return current user.
-    Checks if token is blacklisted and if user exists.
+    Dependency to validate a JWT token from its signed claims alone.
+    Checks the signature, expiry and the in-process revocation cache; never
+    touches Mongo. Use it wherever id, email, role or department is enough.
     """
     try:
-        # Check if token is blacklisted
-        blacklisted = await blacklisted_tokens.find_one({"token": token})
-        if blacklisted:
-            raise HTTPException(status_code=401, detail="Token has been revoked")
-        
-        # Decode token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("id")
-        
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Find user in DB
-        user = await users_collection.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        # Convert ObjectId to string for JSON serialization
-        user["id"] = str(user["_id"])
-        return user
-
     except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    # Check if token is revoked
+    if revocation_cache.is_revoked(token):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    if not payload.get("id"):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    return {field: payload.get(field) for field in CLAIM_FIELDS}
+
+
+async def get_current_user(claims: dict = Depends(get_current_claims)) -> dict:
+    """
+    Dependency to validate JWT token and return current user.
+    Builds on get_current_claims and also checks that the user exists; use
+    it only where the full user record is needed.
+    """
+    # Find user in the per-worker cache, falling back to the DB
+    user = await get_cached_user(claims["id"])
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return user
@@ -0,0 +1,101 @@
+"""
+Stored, rotating refresh tokens.
+
+Access tokens are short lived (ACCESS_TOKEN_EXPIRE_MINUTES) and verified
+from their signed claims alone; this module is where revocation is
+enforced instead. A refresh token is an opaque random string; only its
+SHA-256 digest is stored. Every token belongs to a session (one login) and
+can be used once: /auth/refresh marks it used and issues the next token of
+the same session.
+
+Presenting a token that was already used means it was copied, so the whole
+session is revoked and both parties have to log in again. Logging out,
+deleting the account or deactivating it ends the sessions the same way; the
+access tokens already issued stay valid until they expire.
+"""
+import hashlib
+import os
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException
+from database.connection import refresh_tokens_collection
+from utils.metrics import registry
+
+REFRESH_TOKEN_EXPIRE_DAYS = float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+refresh_token_reuse = registry.counter(
+    "refresh_token_reuse_total", "Used refresh tokens presented again; each revokes its session"
+)
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+async def issue_refresh_token(user_id: str, session_id: Optional[str] = None) -> tuple[str, str]:
+    """
+    Store a new refresh token for the user.
+
+    Args:
+        user_id: Owner of the token
+        session_id: Session to continue; a new one is started when omitted
+
+    Returns:
+        tuple: (refresh token, session id)
+    """
+    token = secrets.token_urlsafe(32)
+    session_id = session_id or uuid.uuid4().hex
+    now = datetime.utcnow()
+    await refresh_tokens_collection.insert_one({
+        "token_hash": _digest(token),
+        "user_id": user_id,
+        "session_id": session_id,
+        "created_at": now,
+        "expires_at": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "used_at": None,
+        "revoked_at": None,
+    })
+    return token, session_id
+
+
+async def consume_refresh_token(token: str) -> dict:
+    """
+    Mark a refresh token used and return its record.
+
+    The update is conditional, so of two requests racing with the same token
+    exactly one gets it; the other is treated as reuse.
+
+    Raises:
+        HTTPException: 401 if the token is unknown, expired, revoked or reused
+    """
+    token_hash = _digest(token)
+    now = datetime.utcnow()
+    record = await refresh_tokens_collection.find_one_and_update(
+        {"token_hash": token_hash, "used_at": None, "revoked_at": None, "expires_at": {"$gt": now}},
+        {"$set": {"used_at": now}},
+    )
+    if record:
+        return record
+
+    stale = await refresh_tokens_collection.find_one({"token_hash": token_hash})
+    if stale and stale.get("used_at") is not None and stale.get("revoked_at") is None:
+        refresh_token_reuse.inc()
+        await revoke_session(stale["session_id"])
+        print(f"⚠️ Refresh token reused, revoked session {stale['session_id']}")
+    raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+
+
+async def revoke_session(session_id: str):
+    await refresh_tokens_collection.update_many(
+        {"session_id": session_id, "revoked_at": None},
+        {"$set": {"revoked_at": datetime.utcnow()}},
+    )
+
+
+async def revoke_user_sessions(user_id: str):
+    await refresh_tokens_collection.update_many(
+        {"user_id": user_id, "revoked_at": None},
+        {"$set": {"revoked_at": datetime.utcnow()}},
+    )
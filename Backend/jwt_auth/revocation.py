@@ -0,0 +1,158 @@
+"""
+Per-worker cache of revoked (logged out) access tokens.
+
+get_current_user consults this cache instead of querying blacklisted_tokens
+on every request. The cache holds a SHA-256 digest of each revoked token and
+the token's expiry; once a token has expired the JWT check rejects it anyway,
+so the entry is dropped and memory stays bounded by the number of live
+revoked tokens.
+
+Each worker loads the cache at startup and then pulls revocations made by
+other workers every REVOCATION_SYNC_SECONDS. Revocations made by the current
+worker are visible immediately.
+
+revoked_at is stamped by the server ($currentDate), and each sync resumes
+from the newest revoked_at it has seen rather than from the worker's own
+clock, so a worker or writer with a skewed clock cannot make revocations
+fall outside the synced range.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from jose import jwt, JWTError
+from database.connection import blacklisted_tokens
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# Re-read a little history on each sync: a revocation stamped just before
+# the newest one seen may commit after the sync read. Re-adding is harmless.
+SYNC_OVERLAP = timedelta(seconds=2)
+
+
+def _to_timestamp(value: datetime) -> float:
+    # Mongo hands back naive UTC datetimes
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+    return float(exp) if exp is not None else None
+
+
+class RevocationCache:
+    def __init__(self):
+        self._entries: dict[bytes, float] = {}
+        self._loaded = False
+        # Newest server-assigned revoked_at seen so far
+        self._high_water: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def add(self, token: str, expires_at: float):
+        if expires_at > time.time():
+            self._entries[self.digest(token)] = expires_at
+
+    def is_revoked(self, token: str) -> bool:
+        key = self.digest(token)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self._entries.pop(key, None)
+            return False
+        return True
+
+    def purge(self):
+        """Drop every entry whose token has already expired."""
+        now = time.time()
+        self._entries = {key: exp for key, exp in self._entries.items() if exp > now}
+
+    def _add_document(self, document: dict):
+        revoked_at = document.get("revoked_at")
+        if revoked_at is not None and (self._high_water is None or revoked_at > self._high_water):
+            self._high_water = revoked_at
+        expires_at = document.get("expires_at")
+        if expires_at is not None:
+            self.add(document["token"], _to_timestamp(expires_at))
+            return
+        # Entries written before expires_at was stored
+        exp = _token_expiry(document["token"])
+        if exp is not None:
+            self.add(document["token"], exp)
+
+    async def load(self, collection=blacklisted_tokens):
+        """Replace the cache with every unexpired revocation in Mongo."""
+        self._entries = {}
+        self._high_water = None
+        cursor = collection.find(
+            {"$or": [
+                {"expires_at": {"$gt": datetime.utcnow()}},
+                {"expires_at": {"$exists": False}},
+            ]},
+            {"_id": 0, "token": 1, "expires_at": 1, "revoked_at": 1},
+        )
+        async for document in cursor:
+            self._add_document(document)
+        self._loaded = True
+
+    async def sync(self, collection=blacklisted_tokens):
+        """Pull revocations stamped since the newest one already seen."""
+        if not self._loaded:
+            await self.load(collection)
+            return
+        query = {"revoked_at": {"$exists": True}}
+        if self._high_water is not None:
+            query = {"revoked_at": {"$gte": self._high_water - SYNC_OVERLAP}}
+        cursor = collection.find(query, {"_id": 0, "token": 1, "expires_at": 1, "revoked_at": 1})
+        async for document in cursor:
+            self._add_document(document)
+        self.purge()
+
+
+revocation_cache = RevocationCache()
+
+
+async def revoke_token(token: str):
+    """
+    Record a logout in Mongo and in this worker's cache.
+    """
+    now = datetime.utcnow()
+    exp = _token_expiry(token)
+    expires_at = (
+        datetime.fromtimestamp(exp, tz=timezone.utc).replace(tzinfo=None)
+        if exp is not None else now
+    )
+
+    # revoked_at comes from the server clock; the sync in other workers is
+    # ordered by it
+    await blacklisted_tokens.update_one(
+        {"token": token},
+        {
+            "$setOnInsert": {"token": token, "expires_at": expires_at},
+            "$currentDate": {"revoked_at": True},
+        },
+        upsert=True,
+    )
+    revocation_cache.add(token, _to_timestamp(expires_at))
+
+
+async def run_revocation_sync(interval: float = REVOCATION_SYNC_SECONDS):
+    """
+    Background task started from the app lifespan.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await revocation_cache.sync()
+        except Exception as e:
+            print(f"⚠️ Revocation cache sync failed: {str(e)}")
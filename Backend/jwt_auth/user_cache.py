@@ -0,0 +1,40 @@
+"""
+Per-worker cache of the user records returned by get_current_user.
+
+Records are projected (no password hash) and keyed by the user id string.
+Any code path that changes or deletes a user must call invalidate_user();
+other workers pick the change up when their entry expires after
+USER_CACHE_TTL_SECONDS.
+"""
+import os
+from typing import Optional
+from bson import ObjectId
+from database.connection import users_collection
+from utils.cache import TTLCache
+
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+USER_PROJECTION = {"password": 0}
+
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl_seconds=USER_CACHE_TTL_SECONDS)
+
+
+async def load_user(user_id: str) -> Optional[dict]:
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, USER_PROJECTION)
+    if not user:
+        return None
+    # Keep both keys for the routers; a string _id is also JSON serializable
+    user["id"] = str(user["_id"])
+    user["_id"] = user["id"]
+    return user
+
+
+async def get_cached_user(user_id: str) -> Optional[dict]:
+    user = await user_cache.get_or_load(user_id, lambda: load_user(user_id))
+    # Hand out a copy so callers cannot mutate the cached record
+    return dict(user) if user else None
+
+
+def invalidate_user(user_id: str):
+    user_cache.invalidate(user_id)
@@ -1,16 +1,76 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from router import stream_router
 from router import event_router
 from router import auth_router
 from router import teacher_router
+from router import registration_router
+from router import attendance_router
+from router import notice_router
+from router import metrics_router
+from database import connection
+from database.indexes import ensure_indexes, check_hot_queries
+from jwt_auth.revocation import revocation_cache, run_revocation_sync
+from utils.password_hasher import password_hasher
+from utils.email_queue import email_queue
+from controller.stream_controller import change_feed
+from controller.admin.teacher_controller import seed_teacher_id_sequence
+from controller.event_controller import backfill_tag_lists
+from utils.responses import ORJSONResponse
+from utils.metrics import MetricsMiddleware
 
-app = FastAPI()
+INDEX_SELF_CHECK = os.getenv("INDEX_SELF_CHECK", "false").lower() == "true"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connection.connect()
+    # Events stored before tag_list existed are invisible to the tags filter
+    await backfill_tag_lists()
+    await ensure_indexes()
+    if INDEX_SELF_CHECK:
+        failures = await check_hot_queries()
+        if failures:
+            raise RuntimeError(f"Hot queries without an index: {failures}")
+
+    await seed_teacher_id_sequence()
+    await revocation_cache.load()
+    revocation_sync = asyncio.create_task(run_revocation_sync())
+    email_queue.start()
+    change_feed.start()
+    yield
+    await change_feed.stop()
+    await email_queue.stop()
+    revocation_sync.cancel()
+    # Let a sync in progress unwind before the client is closed under it
+    await asyncio.gather(revocation_sync, return_exceptions=True)
+    password_hasher.shutdown()
+    connection.close()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
 def home():
     return {"message": "Fastapi is running!"}
 
+
+@app.get("/health")
+def health():
+    # Pool checkout waits show whether requests are queueing for connections
+    return {"status": "ok", "mongo_pool": connection.pool_wait_stats.stats()}
+
+# Before event_router, whose /events/{event_id} would match /events/stream
+app.include_router(stream_router.router)
 app.include_router(event_router.router)
 app.include_router(auth_router.router)
 app.include_router(teacher_router.router)
+app.include_router(registration_router.router)
+app.include_router(attendance_router.router)
+app.include_router(notice_router.router)
+app.include_router(metrics_router.router)
 
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from schema.atendence_schema import AttendanceBatch, AttendanceBatchResult
+from controller.attendance_controller import record_attendance_batch
+from jwt_auth.jwt_handler import get_current_user
+from utils.compression import GzipRoute
+
+
+# Mounted under /events next to the event routes. GzipRoute lets scanners
+# send their uploads with `Content-Encoding: gzip`.
+router = APIRouter(
+    prefix="/events",
+    tags=["attendance"],
+    route_class=GzipRoute
+)
+
+
+@router.post("/{event_id}/attendance/batch", response_model=AttendanceBatchResult)
+async def record_attendance_batch_endpoint(
+    event_id: str,
+    batch: AttendanceBatch,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Record up to 1000 door scans in one request.
+
+    Each scan is upserted on (event_id, user_id), so re-sent scans are
+    reported as "duplicate" instead of failing the batch.
+    """
+    return await record_attendance_batch(event_id, batch.scans, current_user)
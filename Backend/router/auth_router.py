@@ -1,25 +1,38 @@
-from fastapi import APIRouter, Depends
-from schema.auth_schema import userLogin, userRegister, token
-from database.connection import blacklisted_tokens
-from controller.auth_controller import login_user, register_user, get_user_by_id, delete_user
-from jwt_auth.jwt_handler import get_current_user, oauth2_scheme
+from fastapi import APIRouter, Depends, Request
+from schema.auth_schema import userLogin, userRegister, token, RefreshRequest
+from controller.auth_controller import login_user, register_user, refresh_user_tokens, get_user_by_id, delete_user
+from jwt_auth.jwt_handler import get_current_user, get_current_claims, oauth2_scheme
+from jwt_auth.revocation import revoke_token
+from jwt_auth.refresh_tokens import revoke_session
+from utils.rate_limit import login_limiter, register_limiter
 from fastapi import HTTPException
 
 router = APIRouter(tags=["auth"], prefix="/auth")
 
 @router.post("/register")
-async def register(user: userRegister):
+async def register(user: userRegister, request: Request):
+    # Throttle before the email lookup and the bcrypt hash
+    await register_limiter.check(request, user.email)
     return await register_user(user)
 
 
 @router.post("/login", response_model=token)
-async def login(user: userLogin):
+async def login(user: userLogin, request: Request):
+    await login_limiter.check(request, user.email)
     return await login_user(user)
 
 
+@router.post("/refresh", response_model=token)
+async def refresh(body: RefreshRequest):
+    return await refresh_user_tokens(body.refresh_token)
+
+
 @router.post("/logout")
-async def logout(token_str: str = Depends(oauth2_scheme), current_user: dict = Depends(get_current_user)):
-    await blacklisted_tokens.insert_one({"token": token_str})
+async def logout(token_str: str = Depends(oauth2_scheme), claims: dict = Depends(get_current_claims)):
+    await revoke_token(token_str)
+    # Ends the session: its refresh token can no longer be exchanged
+    if claims.get("sid"):
+        await revoke_session(claims["sid"])
     return {"message": "Logged out successfully"}
 
 @router.get("/me")
@@ -1,13 +1,30 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from schema.event_schema import EventCreate, EventResponse, EventUpdate
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from schema.event_schema import EventCreate, EventResponse, EventUpdate, EventPage, EventBatchRequest, EventBatchResult
 from controller.event_controller import(
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    EVENTS_LIST_TAG,
+    DEFAULT_EXPORT_BATCH_SIZE,
+    MAX_EXPORT_BATCH_SIZE,
+    event_serializer,
+    event_tag,
     create_event,
     get_all_events,
-    get_event_by_id,
+    get_events_version,
+    export_events,
+    search_events,
+    find_event,
+    get_events_by_ids,
     update_event,
     delete_event
 )
 from jwt_auth.jwt_handler import get_current_user
+from utils.responses import ORJSONResponse, dumps
+from utils.http_cache import make_etag, document_version, cache_headers
+from utils.response_cache import CachedResponse, response_cache, cache_key, send_cached
 
 
 router = APIRouter(
@@ -23,17 +40,129 @@ async def create_event_endpoint(event: EventCreate, current_user: dict = Depends
     return await create_event(event, user_id) 
 
 
-@router.get("/", response_model=list[EventResponse])
-async def get_events_endpoint():
-    return await get_all_events()
+@router.get("/", response_model=EventPage)
+async def get_events_endpoint(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Value of `next` from the previous page"),
+    audience: Optional[str] = None,
+    tags: Optional[str] = Query(None, description="Comma separated, events must carry all of them"),
+    organizer: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma separated subset of event fields to return"),
+):
+    key = cache_key(request)
+
+    async def build():
+        # Any write to events changes the version, so the ETag is stable
+        # across rebuilds of unchanged data. No Last-Modified here: a delete
+        # does not move the newest timestamp, only the ETag notices it.
+        etag = make_etag("events", *(await get_events_version()), key)
+        page = await get_all_events(
+            limit=limit,
+            cursor=cursor,
+            audience=audience,
+            tags=tags,
+            organizer=organizer,
+            date_from=date_from,
+            date_to=date_to,
+            fields=fields,
+        )
+        # event_serializer already produces the EventResponse shape (or the
+        # requested subset of it), so the page is encoded without
+        # re-validating every item against response_model
+        return CachedResponse(dumps(page), etag, cache_headers(etag))
+
+    cached = await response_cache.get_or_build("/events/", key, (EVENTS_LIST_TAG,), build)
+    return send_cached(request, cached)
+
+
+@router.get("/search", response_model=EventPage)
+async def search_events_endpoint(
+    q: str = Query(..., min_length=1, description="Words to search for in title, description and tags"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Value of `next` from the previous page"),
+    audience: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma separated subset of event fields to return"),
+):
+    page = await search_events(
+        q,
+        limit=limit,
+        cursor=cursor,
+        audience=audience,
+        date_from=date_from,
+        date_to=date_to,
+        fields=fields,
+    )
+    return ORJSONResponse(page)
+
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+@router.get("/export")
+async def export_events_endpoint(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    batch_size: int = Query(DEFAULT_EXPORT_BATCH_SIZE, ge=1, le=MAX_EXPORT_BATCH_SIZE),
+    audience: Optional[str] = None,
+    tags: Optional[str] = Query(None, description="Comma separated, events must carry all of them"),
+    organizer: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    updated_since: Optional[datetime] = Query(None, description="Only events created or updated since this time"),
+):
+    chunks = export_events(
+        data_format=format,
+        batch_size=batch_size,
+        audience=audience,
+        tags=tags,
+        organizer=organizer,
+        date_from=date_from,
+        date_to=date_to,
+        updated_since=updated_since,
+    )
+    return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES[format])
+
+
+@router.get("/batch", response_model=EventBatchResult)
+async def get_events_batch_endpoint(
+    ids: List[str] = Query(..., description="Event ids, comma separated or repeated"),
+    fields: Optional[str] = Query(None, description="Comma separated subset of event fields to return"),
+):
+    event_ids = [event_id.strip() for value in ids for event_id in value.split(",") if event_id.strip()]
+    if not event_ids:
+        raise HTTPException(status_code=400, detail="No event ids given")
+    return ORJSONResponse(await get_events_by_ids(event_ids, fields))
+
+
+@router.post("/batch", response_model=EventBatchResult)
+async def post_events_batch_endpoint(body: EventBatchRequest):
+    # Same lookup for id lists too long for a query string
+    return ORJSONResponse(await get_events_by_ids(body.ids, body.fields))
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event_endpoint(event_id: str):
-    event = await get_event_by_id(event_id)
-    if event is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
-    return event
+async def get_event_endpoint(
+    request: Request,
+    event_id: str,
+    fields: Optional[str] = Query(None, description="Comma separated subset of event fields to return"),
+):
+    async def build():
+        event, selected = await find_event(event_id, fields)
+        last_modified = document_version(event)
+        etag = make_etag(event["_id"], last_modified, fields)
+        body = dumps(event_serializer(event, selected))
+        return CachedResponse(body, etag, cache_headers(etag, last_modified), last_modified)
+
+    tags = (event_tag(event_id),)
+    cached = await response_cache.get_or_build("/events/{event_id}", cache_key(request), tags, build)
+    return send_cached(request, cached)
 
 
 @router.put("/{event_id}", response_model=EventResponse)
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Response
+from database.connection import pool_wait_stats
+from jwt_auth.user_cache import user_cache
+from utils.search import search_cache
+from controller.notice_controller import notice_feed_cache
+from utils.email_queue import email_queue
+from utils.password_hasher import password_hasher
+from utils.metrics import registry
+
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+CACHES = {
+    "users": user_cache,
+    "search": search_cache,
+    "notice_feed": notice_feed_cache,
+}
+
+
+# These read counters the components already keep, once per scrape
+registry.callback(
+    "cache_hits_total", "In-process cache hits", ("cache",), "counter",
+    lambda: {(name,): cache.hits for name, cache in CACHES.items()},
+)
+registry.callback(
+    "cache_misses_total", "In-process cache misses", ("cache",), "counter",
+    lambda: {(name,): cache.misses for name, cache in CACHES.items()},
+)
+registry.callback(
+    "cache_entries", "Entries currently held by each in-process cache", ("cache",), "gauge",
+    lambda: {(name,): len(cache) for name, cache in CACHES.items()},
+)
+registry.callback(
+    "email_delivered_total", "Emails handed to the SMTP relay", (), "counter",
+    lambda: {(): email_queue.sent},
+)
+registry.callback(
+    "email_failed_total", "Emails dropped after the last retry", (), "counter",
+    lambda: {(): email_queue.failed},
+)
+registry.callback(
+    "email_outbox_pending", "Emails queued or waiting to retry", (), "gauge",
+    lambda: {(): email_queue.pending()},
+)
+registry.callback(
+    "password_hash_pending", "bcrypt operations queued or running", (), "gauge",
+    lambda: {(): password_hasher.pending},
+)
+registry.callback(
+    "mongo_pool_checkouts_total", "Mongo connection pool checkouts by outcome", ("outcome",), "counter",
+    lambda: {
+        ("ok",): pool_wait_stats.checkouts,
+        ("failed",): pool_wait_stats.checkout_failures,
+    },
+)
+registry.callback(
+    "mongo_pool_checkout_wait_seconds_total", "Total time spent waiting for a pooled Mongo connection", (), "counter",
+    lambda: {(): pool_wait_stats.total_wait_seconds},
+)
+registry.callback(
+    "mongo_pool_connections_open", "Open connections in the Mongo pool", (), "gauge",
+    lambda: {(): pool_wait_stats.connections_created - pool_wait_stats.connections_closed},
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
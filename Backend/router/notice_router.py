@@ -1,7 +1,26 @@
-from controller.notice_controller import create_notice, get_notices_for_user, get_notice_by_id, update_notice, delete_notice
-from fastapi import APIRouter, HTTPException, status, Depends
-from schema.notice_schema import NoticeCreate, NoticeResponse, NoticeUpdate
-from jwt_auth.jwt_handler import get_current_user
+from controller.notice_controller import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NOTICE_FIELDS,
+    notice_serializer,
+    select_notice_fields,
+    notice_tag,
+    create_notice,
+    get_notices_for_user,
+    find_notice,
+    search_notices,
+    update_notice,
+    delete_notice
+)
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from schema.notice_schema import NoticeCreate, NoticeResponse, NoticeUpdate, NoticePage
+from jwt_auth.jwt_handler import get_current_user, get_current_claims
+from utils.responses import ORJSONResponse, dumps
+from utils.fields import parse_fields
+from utils.http_cache import make_etag, document_version, is_not_modified, cache_headers, not_modified
+from utils.response_cache import CachedResponse, response_cache, cache_key, send_cached
 
 
 router = APIRouter(
@@ -18,18 +37,64 @@ async def create_notice_endpoint(notice: NoticeCreate, current_user: dict = Depe
 
 
 @router.get("/", response_model=list[NoticeResponse])
-async def get_notices_endpoint(current_user: dict = Depends(get_current_user)):
-    user_id = current_user["id"]
-    return await get_notices_for_user(user_id)
+async def get_notices_endpoint(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma separated subset of notice fields to return"),
+    current_user: dict = Depends(get_current_claims),
+):
+    selected = parse_fields(fields, NOTICE_FIELDS)
+    # role and department come from the token, so the feed needs no user lookup
+    feed = await get_notices_for_user(current_user)
+    # The feed is per user, so only the browser may keep it
+    etag = make_etag("notice-feed", fields, *((notice["id"], document_version(notice)) for notice in feed))
+    headers = cache_headers(etag, public=False)
+    if is_not_modified(request, etag):
+        return not_modified(headers)
+    return ORJSONResponse([select_notice_fields(notice, selected) for notice in feed], headers=headers)
+
+
+
+@router.get("/search", response_model=NoticePage)
+async def search_notices_endpoint(
+    q: str = Query(..., min_length=1, description="Words to search for in title, content and tags"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Value of `next` from the previous page"),
+    audience: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma separated subset of notice fields to return"),
+):
+    page = await search_notices(
+        q,
+        limit=limit,
+        cursor=cursor,
+        audience=audience,
+        date_from=date_from,
+        date_to=date_to,
+        fields=fields,
+    )
+    return ORJSONResponse(page)
 
 
 
 @router.get("/{notice_id}", response_model=NoticeResponse)
-async def get_notice_endpoint(notice_id: str):
-    notice = await get_notice_by_id(notice_id)
-    if notice is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notice not found")
-    return notice   
+async def get_notice_endpoint(
+    request: Request,
+    notice_id: str,
+    fields: Optional[str] = Query(None, description="Comma separated subset of notice fields to return"),
+):
+    async def build():
+        notice, selected = await find_notice(notice_id, fields)
+        last_modified = document_version(notice)
+        etag = make_etag(notice["_id"], last_modified, fields)
+        # notice_serializer produces the NoticeResponse shape (or the
+        # requested subset of it), so response_model validation is skipped
+        body = dumps(notice_serializer(notice, selected))
+        return CachedResponse(body, etag, cache_headers(etag, last_modified), last_modified)
+
+    tags = (notice_tag(notice_id),)
+    cached = await response_cache.get_or_build("/notices/{notice_id}", cache_key(request), tags, build)
+    return send_cached(request, cached)
 
 
 
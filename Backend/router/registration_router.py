@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from schema.registration_schema import createRegistration, RegistrationResponse
+from controller.registration_controller import (
+    register_for_event,
+    cancel_registration,
+    get_registration
+)
+from jwt_auth.jwt_handler import get_current_user, get_current_claims
+
+
+router = APIRouter(
+    prefix="/registrations",
+    tags=["registrations"]
+)
+
+
+def _check_own_registration(email: str, current_user: dict):
+    if email != current_user.get("email") and current_user.get("role") != "admin":
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "You can only manage your own registrations")
+
+
+@router.post("/", response_model=RegistrationResponse)
+async def register_endpoint(registration: createRegistration, current_user: dict = Depends(get_current_user)):
+    _check_own_registration(registration.email, current_user)
+    return await register_for_event(registration)
+
+
+@router.get("/{event_id}/me", response_model=RegistrationResponse)
+async def get_my_registration_endpoint(event_id: str, current_user: dict = Depends(get_current_claims)):
+    return await get_registration(event_id, current_user["email"])
+
+
+@router.delete("/{event_id}")
+async def cancel_registration_endpoint(event_id: str, email: str, current_user: dict = Depends(get_current_user)):
+    _check_own_registration(email, current_user)
+    return await cancel_registration(event_id, email)
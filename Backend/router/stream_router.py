@@ -0,0 +1,79 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from controller.stream_controller import change_feed, LIVE_MAX_CLIENTS
+from controller.event_controller import split_tags
+
+
+# Mounted before the event router: GET /events/{event_id} would otherwise
+# capture /events/stream
+router = APIRouter(
+    prefix="/events",
+    tags=["live updates"]
+)
+
+
+def _check_capacity():
+    if not change_feed.available:
+        raise HTTPException(status_code=503, detail="Live updates are not available")
+    if len(change_feed) >= LIVE_MAX_CLIENTS:
+        raise HTTPException(status_code=503, detail="Too many live clients, please retry shortly",
+                            headers={"Retry-After": "5"})
+
+
+def _parse_audiences(audience: Optional[str]) -> Optional[set]:
+    audiences = set(split_tags(audience))
+    return audiences or None
+
+
+@router.get("/stream")
+async def stream_endpoint(
+    audience: Optional[str] = Query(None, description="Comma separated audiences to receive; omit for all"),
+    resume_token: Optional[str] = Query(None, description="Token of the last change received"),
+    last_event_id: Optional[str] = Header(None, description="Sent by EventSource when it reconnects"),
+):
+    """
+    Server-Sent Events stream of event and notice changes.
+
+    Each message's `id` is a resume token; EventSource sends it back as
+    Last-Event-ID on reconnect, and the changes missed in between are
+    delivered first.
+    """
+    _check_capacity()
+    entries = change_feed.listen(_parse_audiences(audience), last_event_id or resume_token)
+
+    async def frames():
+        try:
+            async for entry in entries:
+                yield entry.sse
+        finally:
+            # Unsubscribe as soon as the client goes away
+            await entries.aclose()
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        # Proxies must neither cache nor buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    audience: Optional[str] = None,
+    resume_token: Optional[str] = None,
+):
+    """Same messages as /events/stream, one JSON text frame each."""
+    if not change_feed.available or len(change_feed) >= LIVE_MAX_CLIENTS:
+        await websocket.close(code=1013)  # Try again later
+        return
+    await websocket.accept()
+    entries = change_feed.listen(_parse_audiences(audience), resume_token)
+    try:
+        async for entry in entries:
+            await websocket.send_text(entry.json.decode("utf-8"))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await entries.aclose()
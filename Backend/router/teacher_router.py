@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends
-from schema.teacher_schema import TeacherCreate, TeacherResponse
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from schema.teacher_schema import TeacherCreate, TeacherResponse, TeacherBulkReport
 from controller.admin.teacher_controller import (
     create_teacher,
+    bulk_create_teachers,
     get_all_teachers,
     get_teacher_by_id,
     delete_teacher
 )
 from jwt_auth.dependency import get_current_admin
+from utils.streaming import iter_lines
+from utils.responses import ORJSONResponse
 
 
 router = APIRouter(
@@ -27,33 +31,78 @@ async def create_teacher_endpoint(
     - Sends login credentials to teacher's email
     - Requires admin authentication
     """
-    admin_id = str(current_admin["_id"])
+    admin_id = current_admin["id"]
     return await create_teacher(teacher, admin_id)
 
 
+BULK_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+}
+
+
+@router.post("/bulk", response_model=TeacherBulkReport)
+async def bulk_create_teachers_endpoint(
+    request: Request,
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Create many teacher accounts from one upload (Admin only).
+    
+    - Body is CSV with a header row (`text/csv`) or JSON lines (`application/x-ndjson`)
+    - Rows are processed in batches as the body streams in
+    - Returns a per-row report; invalid or duplicate rows do not fail the upload
+    - Credentials emails are queued for every created teacher
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    data_format = BULK_CONTENT_TYPES.get(content_type)
+    if data_format is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload must be text/csv or application/x-ndjson"
+        )
+    admin_id = current_admin["id"]
+    return await bulk_create_teachers(iter_lines(request.stream()), data_format, admin_id)
+
+
 @router.get("/", response_model=list[TeacherResponse])
-async def get_teachers_endpoint(current_admin: dict = Depends(get_current_admin)):
+async def get_teachers_endpoint(
+    fields: Optional[str] = Query(None, description="Comma separated subset of teacher fields to return"),
+    current_admin: dict = Depends(get_current_admin)
+):
     """
     Get all teachers (Admin only).
     
     - Returns list of all registered teachers
+    - `fields` limits each teacher to the listed fields
     - Requires admin authentication
     """
-    return await get_all_teachers()
+    teachers = await get_all_teachers(fields)
+    if fields:
+        # Sparse records are not full TeacherResponses; skip response_model
+        return ORJSONResponse(teachers)
+    return teachers
 
 
 @router.get("/{teacher_id}", response_model=TeacherResponse)
 async def get_teacher_endpoint(
     teacher_id: str,
+    fields: Optional[str] = Query(None, description="Comma separated subset of teacher fields to return"),
     current_admin: dict = Depends(get_current_admin)
 ):
     """
     Get a specific teacher by ID (Admin only).
     
     - Returns teacher details
+    - `fields` limits the response to the listed fields
     - Requires admin authentication
     """
-    return await get_teacher_by_id(teacher_id)
+    teacher = await get_teacher_by_id(teacher_id, fields)
+    if fields:
+        return ORJSONResponse(teacher)
+    return teacher
 
 
 @router.delete("/{teacher_id}")
@@ -67,5 +116,5 @@ async def delete_teacher_endpoint(
     - Permanently removes teacher account
     - Requires admin authentication
     """
-    admin_id = str(current_admin["_id"])
+    admin_id = current_admin["id"]
     return await delete_teacher(teacher_id, admin_id)
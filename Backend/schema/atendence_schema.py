@@ -1,12 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
 
 class attendenceBase(BaseModel):
-    event_id: int = Field(..., description="The ID of the event")
-    user_id: int = Field(..., description="The ID of the user")
+    event_id: str = Field(..., description="The ID of the event")
+    user_id: str = Field(..., description="The ID of the user")
     status: str = Field(..., example="present")  # e.g., present, absent, late
     attendance_date: datetime = Field(..., example="2024-05-15T10:00:00")
     remarks: Optional[str] = Field(None, example="Arrived late due to traffic")
@@ -19,6 +19,32 @@ class AttendanceUpdate(BaseModel):
     remarks: Optional[str] = None
 
 class AttendanceResponse(attendenceBase):
-    id: int
+    id: str
     created_at: datetime
-    updated_at: datetime   
+    updated_at: Optional[datetime] = None
+
+
+class AttendanceScan(BaseModel):
+    """One door-scanner check-in; the event comes from the URL"""
+    user_id: str = Field(..., min_length=1, description="The ID of the user")
+    status: str = Field("present", example="present")
+    attendance_date: datetime = Field(..., example="2024-05-15T10:00:00")
+    remarks: Optional[str] = None
+
+
+class AttendanceBatch(BaseModel):
+    scans: List[AttendanceScan] = Field(..., min_length=1, max_length=1000)
+
+
+class AttendanceBatchItem(BaseModel):
+    index: int
+    user_id: str
+    status: str  # "recorded", "duplicate" or "error"
+    detail: Optional[str] = None
+
+
+class AttendanceBatchResult(BaseModel):
+    recorded: int
+    duplicates: int
+    failed: int
+    items: List[AttendanceBatchItem]
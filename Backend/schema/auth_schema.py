@@ -34,7 +34,7 @@ class userRoleUpdate(BaseModel):
 class UserResponse(userBase):
     id: str
     name: str
-    email: EmailStr
+    email: Optional[EmailStr] = None
     role: str
     is_active: bool
     created_at: datetime
@@ -42,16 +42,24 @@ class UserResponse(userBase):
 
 class token(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    expires_in: int  # access token lifetime in seconds
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
 
 class TokenData(BaseModel):
     id: Optional[str] = None
     email: Optional[EmailStr] = None
     role: Optional[str] = None
+    department: Optional[str] = None
+    sid: Optional[str] = None
+    jti: Optional[str] = None
     
     
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
+def hash_password(password: str, rounds: int = 12) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
     
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime,date
 
 
@@ -16,6 +16,7 @@ class EventBase ( BaseModel ):
     end_time : Optional [ datetime ] = Field ( None , example = "2024-05-15T12:00:00" )
     start_date : Optional [ datetime ] = Field ( None , example = "2024-05-01T00:00:00" )
     end_date : Optional [ datetime ] = Field ( None , example = "2024-05-31T23:59:59" )
+    capacity : Optional [ int ] = Field ( None , ge = 1 , example = 500 )  # None means unlimited
   
   
 class EventCreate(EventBase):
@@ -34,5 +35,27 @@ class EventUpdate ( BaseModel ):
     
 class EventResponse ( EventBase ):
     id : str
+    seats_left : Optional [ int ] = None
     created_at : datetime
     updated_at : Optional[datetime] = None
+
+
+class EventPage ( BaseModel ):
+    items : List [ EventResponse ]
+    next : Optional [ str ] = None
+
+
+class EventBatchRequest ( BaseModel ):
+    ids : List [ str ] = Field ( ... , min_length = 1 , example = [ "665f1c2e8b3e4a1d2c3b4a59" ] )
+    fields : Optional [ str ] = Field ( None , example = "title,event_date" )
+
+
+class EventBatchItem ( BaseModel ):
+    id : str
+    found : bool
+    event : Optional [ dict ] = None  # EventResponse, or the requested fields of it
+
+
+class EventBatchResult ( BaseModel ):
+    items : List [ EventBatchItem ]
+    missing : List [ str ]
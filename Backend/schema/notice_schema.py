@@ -11,7 +11,7 @@ class NoticeBase(BaseModel):
     audience: Optional[str] = Field(None, example="all")  # e.g., all, students, faculty
     tags: Optional[List[str]] = None
     priority: Optional[int] = Field(1, example=1)  # e.g., 1 (high), 2 (medium), 3 (low)
-    created_by: Optional[int] = Field(None, description="ID of the user who created the notice")
+    created_by: Optional[str] = Field(None, description="ID of the user who created the notice")
 
 
 class NoticeCreate(NoticeBase):
@@ -30,7 +30,12 @@ class NoticeUpdate(BaseModel):
     
     
 class NoticeResponse(NoticeBase):
-    id: int
-    created_by: int
+    id: str
+    created_by: str
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class NoticePage(BaseModel):
+    items: List[NoticeResponse]
+    next: Optional[str] = None
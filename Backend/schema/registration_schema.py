@@ -4,7 +4,7 @@ from datetime import datetime
 
 
 class RegistrationBase(BaseModel):
-    event_id: int = Field(..., description="The ID of the event being registered for")
+    event_id: str = Field(..., description="The ID of the event being registered for")
     name: str = Field(..., max_length=100)
     email: EmailStr = Field(...)
     phone: Optional[str] = Field(None, max_length=15)
@@ -23,5 +23,7 @@ class RegistrationUpdate(BaseModel):
     year: Optional[str] = None
     
 class RegistrationResponse(RegistrationBase):
-    id: int
-    created_at: datetime
\ No newline at end of file
+    id: str
+    status: str  # "confirmed" or "waitlisted"
+    created_at: datetime
+    confirmed_at: Optional[datetime] = None
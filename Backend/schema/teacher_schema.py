@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -33,3 +33,19 @@ class TeacherCredentials(BaseModel):
     email: EmailStr
     role: str
     login_url: str = "http://localhost:8000/auth/login"
+
+
+class TeacherBulkRowResult(BaseModel):
+    """Outcome of one row of a bulk onboarding upload"""
+    row: int
+    email: Optional[str] = None
+    status: str  # "created" or "error"
+    id: Optional[str] = None
+    teacher_id: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class TeacherBulkReport(BaseModel):
+    created: int
+    failed: int
+    results: List[TeacherBulkRowResult]
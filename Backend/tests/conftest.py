@@ -0,0 +1,124 @@
+"""
+Shared test setup. Run from the Backend directory:
+
+    python -m pytest tests
+
+Tests that need MongoDB take the `mongo` fixture. It runs them against the
+in-process mongomock-motor stand-in, or against a real server when
+TEST_MONGO_URL is set; then each test gets a scratch database that is
+dropped afterwards. Without either, those tests are skipped.
+"""
+import asyncio
+import os
+import sys
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+TEST_MONGO_URL = os.getenv("TEST_MONGO_URL")
+
+# The stand-in cannot route reads by read preference
+if not TEST_MONGO_URL:
+    os.environ.setdefault("MONGO_SECONDARY_READS", "false")
+# Cheapest cost bcrypt accepts; tests hash many passwords
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+
+@pytest.fixture
+def mongo():
+    """
+    Returns run(async_fn): runs async_fn() on a fresh event loop with the
+    application's collections pointing at a scratch database.
+    """
+    from database import connection
+
+    if TEST_MONGO_URL:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        make_client = lambda: AsyncIOMotorClient(TEST_MONGO_URL)
+    else:
+        make_client = pytest.importorskip("mongomock_motor").AsyncMongoMockClient
+        _patch_mock_bulk_write()
+
+    previous_name = connection.MONGO_DB_NAME
+    connection.MONGO_DB_NAME = f"eventsync_test_{uuid.uuid4().hex[:8]}"
+
+    def run(async_fn):
+        async def main():
+            # Motor clients bind to the loop they are first used on
+            connection.use_client(make_client())
+            try:
+                return await async_fn()
+            finally:
+                if TEST_MONGO_URL:
+                    await connection.get_client().drop_database(connection.MONGO_DB_NAME)
+                connection.close()
+
+        return asyncio.run(main())
+
+    yield run
+    connection.MONGO_DB_NAME = previous_name
+
+
+def _patch_mock_bulk_write():
+    # mongomock's bulk builder predates the sort= argument newer pymongo
+    # passes for every update and replace; it is always None for ours
+    import inspect
+    from mongomock.collection import BulkOperationBuilder
+
+    for name in ("add_update", "add_replace"):
+        original = getattr(BulkOperationBuilder, name)
+        if "sort" in inspect.signature(original).parameters:
+            continue
+
+        def without_sort(self, *args, _original=original, sort=None, **kwargs):
+            return _original(self, *args, **kwargs)
+
+        setattr(BulkOperationBuilder, name, without_sort)
+
+
+@pytest.fixture
+def api(mongo):
+    """
+    Returns run(async_fn): like `mongo`, but calls async_fn(client) with an
+    httpx client for the app. The lifespan does not run, so indexes are
+    created here; every in-process cache starts empty.
+    """
+    import httpx
+    import main
+    from database.indexes import ensure_indexes
+    from jwt_auth.user_cache import user_cache
+    from controller.notice_controller import notice_feed_cache
+    from utils.response_cache import MemoryBackend, response_cache
+    from utils.search import search_cache
+
+    def run(async_fn):
+        async def main_():
+            response_cache.backend = MemoryBackend()
+            for cache in (user_cache, notice_feed_cache, search_cache):
+                cache.clear()
+            await ensure_indexes()
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                return await async_fn(client)
+
+        return mongo(main_)
+
+    return run
+
+
+async def login_as(role: str = "student", department: str = None) -> tuple[str, dict]:
+    """Insert a user and return (user id, Authorization headers) for it."""
+    from database.connection import users_collection
+    from jwt_auth.jwt_handler import create_access_token
+
+    email = f"{role}-{uuid.uuid4().hex[:8]}@eventsync.example.com"
+    result = await users_collection.insert_one({
+        "name": role.title(), "email": email, "role": role, "department": department,
+    })
+    user_id = str(result.inserted_id)
+    token = create_access_token({"id": user_id, "email": email, "role": role, "department": department})
+    return user_id, {"Authorization": f"Bearer {token}"}
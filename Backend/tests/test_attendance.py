@@ -0,0 +1,81 @@
+import gzip
+import json
+
+from conftest import login_as
+from database.connection import attendance_collection, events_collection
+from utils.compression import MAX_DECOMPRESSED_BYTES
+
+
+def scans(*user_ids: str) -> dict:
+    return {"scans": [{"user_id": user_id, "attendance_date": "2026-03-02T09:00:00"} for user_id in user_ids]}
+
+
+def gzipped(body: dict) -> dict:
+    return {
+        "content": gzip.compress(json.dumps(body).encode("utf-8")),
+        "headers": {"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    }
+
+
+async def organized_event() -> tuple[str, dict]:
+    organizer_id, headers = await login_as("teacher")
+    result = await events_collection.insert_one({"title": "Orientation", "organizer": organizer_id})
+    return str(result.inserted_id), headers
+
+
+def test_gzipped_batch_is_recorded(api):
+    async def main(client):
+        event_id, headers = await organized_event()
+        request = gzipped(scans("u1", "u2", "u3"))
+        response = await client.post(
+            f"/events/{event_id}/attendance/batch",
+            content=request["content"], headers={**headers, **request["headers"]},
+        )
+        stored = await attendance_collection.count_documents({"event_id": event_id})
+        return response, stored
+
+    response, stored = api(main)
+    assert response.status_code == 200
+    assert response.json()["recorded"] == 3
+    assert stored == 3
+
+
+def test_repeated_scans_are_duplicates_not_errors(api):
+    async def main(client):
+        event_id, headers = await organized_event()
+        url = f"/events/{event_id}/attendance/batch"
+        first = await client.post(url, json=scans("u1", "u2", "u1"), headers=headers)
+        # A scanner re-sending after a dropped response
+        resent = await client.post(url, json=scans("u3", "u2"), headers=headers)
+        stored = await attendance_collection.count_documents({"event_id": event_id})
+        return first.json(), resent.json(), stored
+
+    first, resent, stored = api(main)
+    assert [item["status"] for item in first["items"]] == ["recorded", "recorded", "duplicate"]
+    assert (first["recorded"], first["duplicates"], first["failed"]) == (2, 1, 0)
+    assert [item["status"] for item in resent["items"]] == ["recorded", "duplicate"]
+    assert stored == 3
+
+
+def test_body_inflating_past_the_limit_is_rejected(api):
+    async def main(client):
+        event_id, headers = await organized_event()
+        bomb = gzip.compress(b" " * (MAX_DECOMPRESSED_BYTES + 1))
+        response = await client.post(
+            f"/events/{event_id}/attendance/batch", content=bomb,
+            headers={**headers, "Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        return response, len(bomb)
+
+    response, compressed_size = api(main)
+    assert compressed_size < 64 * 1024
+    assert response.status_code == 413
+
+
+def test_malformed_event_id_is_rejected(api):
+    async def main(client):
+        _, headers = await login_as("teacher")
+        return await client.post("/events/not-an-id/attendance/batch", json=scans("u1"), headers=headers)
+
+    response = api(main)
+    assert response.status_code == 400
@@ -0,0 +1,126 @@
+import asyncio
+import smtplib
+import socket
+import threading
+from email.message import EmailMessage
+
+import pytest
+
+from utils.email_queue import EmailQueue, SMTPConnectionPool
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class Sink:
+    """aiosmtpd handler that keeps every delivered message."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = Sink()
+    # The controller probes its own port on start, so it needs a real one
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    controller = aiosmtpd_controller.Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield sink, controller.hostname, controller.port
+    finally:
+        controller.stop()
+
+
+def make_message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@eventsync.test"
+    message["To"] = f"teacher{n}@eventsync.test"
+    message["Subject"] = "Your EventSync account"
+    message.set_content(f"Teacher ID: T{n:04d}")
+    return message
+
+
+def test_delivers_through_pooled_connections(smtp_sink):
+    sink, host, port = smtp_sink
+    pool = SMTPConnectionPool(size=2, connect=lambda: smtplib.SMTP(host, port, timeout=5))
+    failures = []
+
+    async def main():
+        queue = EmailQueue(pool=pool, workers=2)
+        queue.start()
+        for n in range(20):
+            queue.enqueue(make_message(n), failures.append)
+        await queue.stop(drain_timeout=10)
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.sent == 20
+    assert failures == []
+    assert sorted(envelope.rcpt_tos[0] for envelope in sink.messages) == sorted(
+        f"teacher{n}@eventsync.test" for n in range(20)
+    )
+    # Connections are reused, not opened per message
+    assert sink.sessions <= 2
+
+
+def test_stop_reports_jobs_waiting_for_a_retry():
+    def refuse():
+        raise ConnectionRefusedError("relay down")
+
+    failures = []
+
+    async def main():
+        queue = EmailQueue(pool=SMTPConnectionPool(connect=refuse), workers=1, retry_base_seconds=60)
+        queue.start()
+        queue.enqueue(make_message(1), failures.append)
+        while not queue._retries:
+            await asyncio.sleep(0.01)
+        await queue.stop(drain_timeout=1)
+        return queue
+
+    queue = asyncio.run(main())
+    assert len(failures) == 1
+    assert queue.failed == 1
+    assert queue.pending() == 0
+
+
+def test_stop_reports_job_cut_off_mid_send():
+    release = threading.Event()
+    sending = threading.Event()
+
+    class StuckConnection:
+        def send_message(self, message):
+            sending.set()
+            release.wait(5)
+
+        def quit(self):
+            pass
+
+        def close(self):
+            pass
+
+    failures = []
+
+    async def main():
+        queue = EmailQueue(pool=SMTPConnectionPool(connect=StuckConnection), workers=1)
+        queue.start()
+        queue.enqueue(make_message(1), failures.append)
+        await asyncio.to_thread(sending.wait, 5)
+        await queue.stop(drain_timeout=0.1)
+        release.set()
+
+    asyncio.run(main())
+    assert len(failures) == 1
+    assert "during delivery" in str(failures[0])
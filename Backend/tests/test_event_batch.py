@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from controller.event_controller import MAX_BATCH_IDS
+from database.connection import events_collection
+
+
+async def insert_events(count: int) -> list:
+    result = await events_collection.insert_many([
+        {
+            "title": f"Event {n}", "description": "", "location": "Hall A",
+            "event_date": datetime(2026, 5, n + 1), "created_at": datetime(2026, 1, 1),
+        }
+        for n in range(count)
+    ])
+    return [str(event_id) for event_id in result.inserted_ids]
+
+
+async def get_batch(client, style: str, ids: list, fields: str = None):
+    if style == "comma":
+        params = [("ids", ",".join(ids))]
+    elif style == "repeated":
+        params = [("ids", event_id) for event_id in ids]
+    else:
+        body = {"ids": ids, "fields": fields}
+        return await client.post("/events/batch", json=body)
+    if fields:
+        params.append(("fields", fields))
+    return await client.get("/events/batch", params=params)
+
+
+STYLES = ["comma", "repeated", "post"]
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_items_follow_the_requested_order_with_repeats_and_missing(api, style):
+    missing_id = str(ObjectId())
+
+    async def main(client):
+        first, second, third = await insert_events(3)
+        requested = [third, missing_id, first, third]
+        response = await get_batch(client, style, requested, fields="title")
+        return requested, response, (first, third)
+
+    requested, response, (first, third) = api(main)
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == requested
+    assert [item["found"] for item in body["items"]] == [True, False, True, True]
+    assert body["items"][1]["event"] is None
+    assert body["items"][0]["event"] == body["items"][3]["event"] == {"id": third, "title": "Event 2"}
+    assert body["items"][2]["event"]["title"] == "Event 0"
+    assert body["missing"] == [missing_id]
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_invalid_ids_are_all_reported(api, style):
+    async def main(client):
+        (valid,) = await insert_events(1)
+        return await get_batch(client, style, [valid, "nope", "123"])
+
+    response = api(main)
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
+    assert "123" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_too_many_ids_are_rejected(api, style):
+    async def main(client):
+        return await get_batch(client, style, [str(ObjectId()) for _ in range(MAX_BATCH_IDS + 1)])
+
+    assert api(main).status_code == 400
+
+
+def test_empty_id_list_is_rejected(api):
+    async def main(client):
+        get = await client.get("/events/batch", params={"ids": " , "})
+        post = await client.post("/events/batch", json={"ids": []})
+        return get, post
+
+    get, post = api(main)
+    assert get.status_code == 400
+    assert post.status_code == 422
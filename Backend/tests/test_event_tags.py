@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from controller.event_controller import backfill_tag_lists
+from database.connection import events_collection
+
+
+def legacy_event(title: str, tags) -> dict:
+    # Stored before create_event started writing tag_list
+    return {
+        "title": title, "description": title, "location": "Hall A", "tags": tags,
+        "event_date": datetime(2026, 5, 1), "created_at": datetime(2025, 1, 1),
+    }
+
+
+def test_backfill_makes_old_events_match_the_tags_filter(api):
+    async def main(client):
+        await events_collection.insert_many([
+            legacy_event("Robotics meetup", "Robotics, Workshop"),
+            legacy_event("Career fair", None),
+        ])
+        before = await client.get("/events/", params={"tags": "robotics"})
+        updated = await backfill_tag_lists(batch_size=1)
+        after = await client.get("/events/", params={"tags": "robotics"})
+        again = await backfill_tag_lists()
+        stored = {event["title"]: event["tag_list"] async for event in events_collection.find()}
+        return before.json(), updated, after.json(), again, stored
+
+    before, updated, after, again, stored = api(main)
+    assert before["items"] == []
+    assert updated == 2
+    assert [event["title"] for event in after["items"]] == ["Robotics meetup"]
+    assert again == 0
+    assert stored == {"Robotics meetup": ["robotics", "workshop"], "Career fair": []}
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from database.connection import events_collection
+
+OLD = datetime(2025, 1, 1)
+RECENT = datetime(2026, 3, 1)
+
+
+def event(n: int, created_at: datetime = OLD, updated_at: datetime = None) -> dict:
+    return {
+        "title": f"Event {n}", "description": "", "location": "Hall A", "tags": "talk",
+        "event_date": datetime(2026, 5, n + 1), "created_at": created_at, "updated_at": updated_at,
+    }
+
+
+def export(api, events: list, **params):
+    async def main(client):
+        if events:
+            await events_collection.insert_many(events)
+        response = await client.get("/events/export", params=params)
+        ids = [str(doc["_id"]) async for doc in events_collection.find({}, {"_id": 1}).sort("_id", 1)]
+        return response, ids
+
+    return api(main)
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 7, 100])
+def test_ndjson_has_one_event_per_line(api, batch_size):
+    response, ids = export(api, [event(n) for n in range(7)], format="ndjson", batch_size=batch_size)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.endswith("\n")
+    lines = response.text.split("\n")[:-1]
+    assert [json.loads(line)["id"] for line in lines] == ids
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 7, 100])
+def test_json_is_one_well_formed_array(api, batch_size):
+    response, ids = export(api, [event(n) for n in range(7)], format="json", batch_size=batch_size)
+    assert response.status_code == 200
+    assert [item["id"] for item in json.loads(response.text)] == ids
+
+
+@pytest.mark.parametrize("data_format, body", [("json", "[]"), ("ndjson", "")])
+def test_empty_export(api, data_format, body):
+    response, _ = export(api, [], format=data_format)
+    assert response.status_code == 200
+    assert response.text == body
+
+
+def test_updated_since_selects_created_or_updated_events(api):
+    events = [
+        event(0),
+        event(1, updated_at=RECENT),
+        event(2, created_at=RECENT),
+        event(3, updated_at=datetime(2025, 6, 1)),
+    ]
+    response, _ = export(api, events, format="json", updated_since="2026-01-01T00:00:00")
+    assert sorted(item["title"] for item in json.loads(response.text)) == ["Event 1", "Event 2"]
@@ -0,0 +1,85 @@
+import asyncio
+
+from conftest import login_as
+
+EVENT = {
+    "title": "Hackathon", "description": "Overnight build", "event_date": "2026-05-01T18:00:00",
+    "location": "Hall A", "capacity": 50,
+}
+
+
+async def settle():
+    # The server keeps milliseconds; keep consecutive writes apart
+    await asyncio.sleep(0.002)
+
+
+async def create_event(client) -> tuple[str, dict]:
+    _, headers = await login_as("teacher")
+    response = await client.post("/events/", json=EVENT, headers=headers)
+    assert response.status_code == 200, response.text
+    await settle()
+    return response.json()["id"], headers
+
+
+def test_matching_etag_gets_an_empty_304(api):
+    async def main(client):
+        event_id, _ = await create_event(client)
+        results = {}
+        for path in (f"/events/{event_id}", "/events/"):
+            first = await client.get(path)
+            again = await client.get(path, headers={"If-None-Match": first.headers["etag"]})
+            results[path] = (first, again)
+        return event_id, results
+
+    event_id, results = api(main)
+    for first, again in results.values():
+        assert first.status_code == 200
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == first.headers["etag"]
+    assert "last-modified" in results[f"/events/{event_id}"][0].headers
+
+
+def test_detail_answers_if_modified_since(api):
+    async def main(client):
+        event_id, _ = await create_event(client)
+        first = await client.get(f"/events/{event_id}")
+        again = await client.get(f"/events/{event_id}", headers={"If-Modified-Since": first.headers["last-modified"]})
+        return again
+
+    assert api(main).status_code == 304
+
+
+def test_etags_change_after_update_seat_change_and_delete(api):
+    async def main(client):
+        event_id, headers = await create_event(client)
+
+        async def etags():
+            detail = await client.get(f"/events/{event_id}")
+            listing = await client.get("/events/")
+            return detail.headers.get("etag"), listing.headers["etag"]
+
+        seen = [await etags()]
+        await client.put(f"/events/{event_id}", json={"title": "Hackathon 2026"}, headers=headers)
+        await settle()
+        seen.append(await etags())
+
+        _, student = await login_as("student")
+        me = await client.get("/auth/me", headers=student)
+        await client.post("/registrations/", headers=student, json={
+            "event_id": event_id, "name": "Student", "email": me.json()["email"],
+        })
+        await settle()
+        seen.append(await etags())
+        seats = (await client.get(f"/events/{event_id}")).json()["seats_left"]
+
+        await client.delete(f"/events/{event_id}", headers=headers)
+        seen.append(await etags())
+        return seen, seats
+
+    seen, seats = api(main)
+    detail_etags = [detail for detail, _ in seen[:3]]
+    list_etags = [listing for _, listing in seen]
+    assert seats == EVENT["capacity"] - 1
+    assert len(set(detail_etags)) == 3
+    assert len(set(list_etags)) == 4
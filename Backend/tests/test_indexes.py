@@ -0,0 +1,38 @@
+from pymongo import ASCENDING, IndexModel
+
+from database.connection import DB
+from database.indexes import INDEXES, _rebuild_changed
+
+
+def test_index_whose_key_changed_is_rebuilt(mongo):
+    async def main():
+        teachers = DB["teachers"]
+        # An older deploy declared teacher_id_unique on a different key, same options
+        await teachers.create_indexes([
+            IndexModel([("teacher_id", ASCENDING), ("email", ASCENDING)], name="teacher_id_unique", unique=True)
+        ])
+        await _rebuild_changed(teachers, INDEXES["teachers"])
+        return await teachers.index_information()
+
+    indexes = mongo(main)
+    assert list(indexes["teacher_id_unique"]["key"]) == [("teacher_id", 1)]
+    assert indexes["teacher_id_unique"].get("unique") is True
+
+
+def test_matching_indexes_are_left_alone(mongo):
+    dropped = []
+
+    async def main():
+        events = DB["events"]
+        await events.create_indexes(INDEXES["events"])
+        drop_index = events.drop_index
+
+        async def record_drop(name):
+            dropped.append(name)
+            await drop_index(name)
+
+        events.drop_index = record_drop
+        await _rebuild_changed(events, INDEXES["events"])
+
+    mongo(main)
+    assert dropped == []
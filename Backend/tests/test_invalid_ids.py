@@ -0,0 +1,36 @@
+import pytest
+from bson import ObjectId
+
+from conftest import login_as
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("PUT", "/events/not-an-id", {"title": "Renamed"}),
+    ("DELETE", "/events/not-an-id", None),
+    ("PUT", "/notices/not-an-id", {"title": "Renamed"}),
+    ("DELETE", "/notices/not-an-id", None),
+])
+def test_malformed_id_is_rejected_before_the_write(api, method, path, body):
+    async def main(client):
+        _, headers = await login_as("teacher")
+        return await client.request(method, path, json=body, headers=headers)
+
+    response = api(main)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/events/", "/notices/"])
+def test_unknown_id_is_still_not_found(api, path):
+    async def main(client):
+        _, headers = await login_as("teacher")
+        return await client.delete(f"{path}{ObjectId()}", headers=headers)
+
+    assert api(main).status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/events/not-an-id", "/notices/not-an-id"])
+def test_malformed_id_is_rejected_on_cached_reads(api, path):
+    async def main(client):
+        return await client.get(path)
+
+    assert api(main).status_code == 400
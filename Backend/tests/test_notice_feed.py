@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from controller import notice_controller
+from database.connection import notices_collection
+
+STUDENT = {"role": "student", "department": "Computer Science"}
+
+
+@pytest.fixture(autouse=True)
+def small_feed(monkeypatch):
+    monkeypatch.setattr(notice_controller, "NOTICE_FEED_MAX_ITEMS", 3)
+    notice_controller.notice_feed_cache.clear()
+    yield
+    notice_controller.notice_feed_cache.clear()
+
+
+def notice(title: str, priority: int, start_date: datetime, **extra) -> dict:
+    return {
+        "title": title, "content": title, "audience": "all", "priority": priority,
+        "start_date": start_date, "end_date": None, "created_at": datetime.utcnow(), **extra,
+    }
+
+
+def test_scheduled_notices_do_not_crowd_out_active_ones(mongo):
+    async def main():
+        now = datetime.utcnow()
+        await notices_collection.insert_many(
+            [notice(f"Scheduled {n}", 1, now + timedelta(days=1)) for n in range(5)]
+            + [notice("Exam timetable", 3, now - timedelta(days=1))]
+        )
+        return await notice_controller.get_notices_for_user(STUDENT)
+
+    feed = mongo(main)
+    assert [item["title"] for item in feed] == ["Exam timetable"]
+
+
+def test_feed_keeps_priority_order_and_limit(mongo):
+    async def main():
+        now = datetime.utcnow()
+        await notices_collection.insert_many([
+            notice("Low", 3, None),
+            notice("High", 1, now - timedelta(hours=1)),
+            notice("Starting soon", 1, now + timedelta(seconds=1)),
+            notice("Medium", 2, None),
+            notice("Lowest", 5, None),
+        ])
+        return await notice_controller.get_notices_for_user(STUDENT)
+
+    feed = mongo(main)
+    assert [item["title"] for item in feed] == ["High", "Medium", "Low"]
+
+
+def test_find_notice_rejects_a_malformed_id(mongo):
+    async def main():
+        with pytest.raises(HTTPException) as error:
+            await notice_controller.find_notice("not-an-id")
+        return error.value
+
+    assert mongo(main).status_code == 400
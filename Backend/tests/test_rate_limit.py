@@ -0,0 +1,35 @@
+import pytest
+from starlette.requests import Request
+
+from utils import rate_limit
+
+
+def request(forwarded: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode("ascii"))] if forwarded is not None else []
+    return Request({"type": "http", "headers": headers, "client": ("10.1.0.5", 51234)})
+
+
+@pytest.fixture(autouse=True)
+def trust_forwarded(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_FORWARDED", True)
+
+
+def test_spoofed_left_entries_are_ignored():
+    # The client sent "1.2.3.4"; the proxy appended the address it saw
+    assert rate_limit.client_ip(request("1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+
+
+def test_trusted_hops_count_from_the_right():
+    forwarded = request("1.2.3.4, 203.0.113.7, 10.0.0.2")
+    assert rate_limit.client_ip(forwarded, trusted_hops=2) == "203.0.113.7"
+
+
+def test_fewer_entries_than_hops_uses_the_left_most():
+    assert rate_limit.client_ip(request("203.0.113.7"), trusted_hops=3) == "203.0.113.7"
+
+
+def test_falls_back_to_the_peer_address(monkeypatch):
+    assert rate_limit.client_ip(request()) == "10.1.0.5"
+    assert rate_limit.client_ip(request(" , ")) == "10.1.0.5"
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_FORWARDED", False)
+    assert rate_limit.client_ip(request("203.0.113.7")) == "10.1.0.5"
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from conftest import TEST_MONGO_URL
+from controller.registration_controller import cancel_registration, register_for_event
+from database.connection import events_collection, registrations_collection
+from database.indexes import ensure_indexes
+from schema.registration_schema import createRegistration
+
+CAPACITY = 10
+
+
+def signup(event_id: str, n: int) -> createRegistration:
+    return createRegistration(event_id=event_id, name=f"Student {n}", email=f"student{n}@eventsync.example.com")
+
+
+async def create_event(capacity: int = CAPACITY, indexes: bool = True) -> str:
+    if indexes:
+        await ensure_indexes()
+    result = await events_collection.insert_one({
+        "title": "Hackathon", "capacity": capacity, "seats_left": capacity,
+    })
+    return str(result.inserted_id)
+
+
+async def registrations(event_id: str, status: str) -> list:
+    cursor = registrations_collection.find({"event_id": event_id, "status": status})
+    return [doc async for doc in cursor]
+
+
+async def seats_left(event_id: str) -> int:
+    event = await events_collection.find_one({"_id": ObjectId(event_id)})
+    return event["seats_left"]
+
+
+def test_parallel_signups_never_overbook(mongo):
+    async def main():
+        event_id = await create_event()
+        responses = await asyncio.gather(*[register_for_event(signup(event_id, n)) for n in range(50)])
+        confirmed = await registrations(event_id, "confirmed")
+        waitlisted = await registrations(event_id, "waitlisted")
+        return responses, confirmed, waitlisted, await seats_left(event_id)
+
+    responses, confirmed, waitlisted, left = mongo(main)
+    assert sum(response["status"] == "confirmed" for response in responses) == CAPACITY
+    assert len(confirmed) == CAPACITY
+    assert len(waitlisted) == 40
+    assert left == 0
+
+
+def test_signup_burst_fills_exactly_the_capacity(mongo):
+    capacity, signups = 500, 5000
+    lowest = []
+
+    async def main():
+        # Every email is distinct, so the burst does not rely on the unique
+        # index; the stand-in checks it by scanning the collection per insert
+        event_id = await create_event(capacity, indexes=bool(TEST_MONGO_URL))
+        done = asyncio.Event()
+
+        async def watch_seats():
+            # Sample the counter while the burst runs; it must never go negative
+            while not done.is_set():
+                lowest.append(await seats_left(event_id))
+                await asyncio.sleep(0)
+
+        watcher = asyncio.create_task(watch_seats())
+        responses = await asyncio.gather(*[register_for_event(signup(event_id, n)) for n in range(signups)])
+        done.set()
+        await watcher
+        confirmed = await registrations_collection.count_documents({"event_id": event_id, "status": "confirmed"})
+        waitlisted = await registrations_collection.count_documents({"event_id": event_id, "status": "waitlisted"})
+        return responses, confirmed, waitlisted, await seats_left(event_id)
+
+    responses, confirmed, waitlisted, left = mongo(main)
+    assert sum(response["status"] == "confirmed" for response in responses) == capacity
+    assert confirmed == capacity
+    assert waitlisted == signups - capacity
+    assert left == 0
+    assert min(lowest) >= 0
+
+
+def test_freed_seats_go_to_the_oldest_waiters(mongo):
+    async def main():
+        event_id = await create_event()
+        for n in range(CAPACITY + 5):
+            await register_for_event(signup(event_id, n))
+        queue = [doc["email"] for doc in sorted(
+            await registrations(event_id, "waitlisted"), key=lambda doc: doc["waitlisted_at"]
+        )]
+
+        # Cancellations race a burst of newcomers for the freed seats
+        await asyncio.gather(
+            *[cancel_registration(event_id, f"student{n}@eventsync.example.com") for n in range(3)],
+            *[register_for_event(signup(event_id, n)) for n in range(100, 110)],
+        )
+        confirmed = {doc["email"] for doc in await registrations(event_id, "confirmed")}
+        return queue, confirmed, await seats_left(event_id)
+
+    queue, confirmed, left = mongo(main)
+    assert len(confirmed) == CAPACITY
+    assert left == 0
+    assert set(queue[:3]) <= confirmed
+    assert not confirmed & {f"student{n}@eventsync.example.com" for n in range(100, 110)}
+
+
+def test_malformed_event_id_is_rejected(mongo):
+    async def main():
+        with pytest.raises(HTTPException) as error:
+            await register_for_event(signup("not-an-id", 0))
+        return error.value
+
+    assert mongo(main).status_code == 400
+
+
+def test_seat_changes_bump_updated_at(mongo):
+    async def main():
+        event_id = await create_event()
+        await register_for_event(signup(event_id, 0))
+        taken = await events_collection.find_one({"_id": ObjectId(event_id)})
+        await cancel_registration(event_id, "student0@eventsync.example.com")
+        returned = await events_collection.find_one({"_id": ObjectId(event_id)})
+        return taken, returned
+
+    taken, returned = mongo(main)
+    # The event ETags are built from updated_at, so seat changes must move it
+    assert taken["updated_at"] is not None
+    assert returned["updated_at"] >= taken["updated_at"]
+    assert returned["seats_left"] == CAPACITY
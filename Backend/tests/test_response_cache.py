@@ -0,0 +1,65 @@
+import asyncio
+
+from database import connection
+from utils.response_cache import CachedResponse, MemoryBackend, ResponseCache
+
+
+def response(body: bytes) -> CachedResponse:
+    return CachedResponse(body, f'W/"{body.decode()}"', {})
+
+
+def test_build_racing_an_invalidation_is_not_stored():
+    async def main():
+        cache = ResponseCache(MemoryBackend(), ttl_seconds=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def stale_build():
+            # Reads the old document, then a write lands before it finishes
+            started.set()
+            await release.wait()
+            return response(b"old")
+
+        pending = asyncio.create_task(cache.get_or_build("/events/{event_id}", "k", ("events:1",), stale_build))
+        await started.wait()
+        await cache.invalidate("events:1")
+        release.set()
+        served = await pending
+
+        stored = await cache.backend.get("k")
+
+        async def fresh_build():
+            return response(b"new")
+
+        rebuilt = await cache.get_or_build("/events/{event_id}", "k", ("events:1",), fresh_build)
+        return served, stored, rebuilt
+
+    served, stored, rebuilt = asyncio.run(main())
+    # The request that started the build still gets its answer, but it is
+    # not kept, so the next request reads again
+    assert served.body == b"old"
+    assert stored is None
+    assert rebuilt.body == b"new"
+
+
+def test_build_without_invalidation_is_stored():
+    async def main():
+        cache = ResponseCache(MemoryBackend(), ttl_seconds=60)
+        calls = []
+
+        async def build():
+            calls.append(1)
+            return response(b"v1")
+
+        await cache.get_or_build("/events/", "k", ("events:list",), build)
+        await cache.get_or_build("/events/", "k", ("events:list",), build)
+        return len(calls)
+
+    assert asyncio.run(main()) == 1
+
+
+def test_secondary_handle_is_built_once(monkeypatch):
+    monkeypatch.setattr(connection, "MONGO_SECONDARY_READS", True)
+    handle = connection.CollectionHandle("events")
+    assert handle.secondary_preferred is handle.secondary_preferred
+    assert handle.secondary_preferred is not handle
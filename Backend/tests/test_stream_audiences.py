@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from controller.stream_controller import Subscriber, change_to_entry
+
+
+def notice_change(operation: str, audience, description: dict = None) -> dict:
+    notice_id = ObjectId()
+    change = {
+        "_id": {"_data": "8264A1"},
+        "ns": {"db": "eventsync_db", "coll": "notices"},
+        "operationType": operation,
+        "documentKey": {"_id": notice_id},
+        "fullDocument": {
+            "_id": notice_id, "title": "Lab closed", "content": "Lab closed", "audience": audience,
+            "priority": 1, "created_by": "admin", "created_at": datetime(2026, 1, 1),
+        },
+    }
+    if description is not None:
+        change["updateDescription"] = description
+    return change
+
+
+STAFF = Subscriber({"all", "faculty"})
+STUDENTS = Subscriber({"all", "students"})
+
+
+def test_update_that_moves_audience_reaches_the_old_one():
+    entry = change_to_entry(notice_change(
+        "update", "faculty", {"updatedFields": {"audience": "faculty"}, "removedFields": []}
+    ))
+    assert STAFF.wants(entry)
+    assert STUDENTS.wants(entry)
+
+
+def test_replace_reaches_everyone():
+    entry = change_to_entry(notice_change("replace", "faculty"))
+    assert STUDENTS.wants(entry)
+
+
+def test_update_within_audience_stays_targeted():
+    entry = change_to_entry(notice_change(
+        "update", "faculty", {"updatedFields": {"title": "Lab reopened"}, "removedFields": []}
+    ))
+    assert STAFF.wants(entry)
+    assert not STUDENTS.wants(entry)
+
+
+def test_insert_stays_targeted():
+    entry = change_to_entry(notice_change("insert", "faculty"))
+    assert not STUDENTS.wants(entry)
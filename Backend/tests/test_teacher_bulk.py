@@ -0,0 +1,71 @@
+import pytest
+
+from controller.admin import teacher_controller
+from database.connection import teachers_collection
+from database.indexes import ensure_indexes
+from utils.sequence import BlockSequence
+
+
+@pytest.fixture(autouse=True)
+def local_sequence(monkeypatch):
+    monkeypatch.setattr(teacher_controller, "teacher_id_sequence", BlockSequence("teacher_id", block_size=5))
+    monkeypatch.setattr(teacher_controller, "queue_teacher_credentials_email", lambda **kwargs: None)
+
+
+async def lines_of(text: str):
+    # What utils.streaming.iter_lines yields: no line breaks, no blank lines
+    for line in text.split("\n"):
+        if line.strip():
+            yield line
+
+
+def upload(mongo, text: str, data_format: str = "csv") -> dict:
+    async def main():
+        await ensure_indexes()
+        return await teacher_controller.bulk_create_teachers(lines_of(text), data_format, "admin")
+
+    return mongo(main)
+
+
+def test_csv_with_bom_and_multiline_quoted_field(mongo):
+    report = upload(mongo, (
+        "\ufeffname,email,department,role\n"
+        'Ada,ada@eventsync.example.com,"Computer\nScience",teacher\n'
+        "Alan,alan@eventsync.example.com,Mathematics,teacher\n"
+    ))
+    assert report["created"] == 2, report
+    assert [result["row"] for result in report["results"]] == [1, 2]
+
+
+def test_unterminated_quote_is_reported(mongo):
+    report = upload(mongo, (
+        "name,email,department,role\n"
+        "Ada,ada@eventsync.example.com,Physics,teacher\n"
+        'Alan,alan@eventsync.example.com,"Mathematics,teacher\n'
+    ))
+    assert report["created"] == 1
+    assert report["results"][-1]["detail"].endswith("unterminated quoted field")
+
+
+def test_rows_with_a_taken_teacher_id_get_a_fresh_one(mongo):
+    async def main():
+        await ensure_indexes()
+        # IDs issued by hand before the sequence was seeded
+        await teachers_collection.insert_many([
+            {"name": "Old", "email": f"old{n}@eventsync.example.com", "teacher_id": f"TCH00{n}"}
+            for n in (1, 2)
+        ])
+        report = await teacher_controller.bulk_create_teachers(lines_of(
+            "name,email,department,role\n"
+            "Ada,ada@eventsync.example.com,Physics,teacher\n"
+            "Alan,alan@eventsync.example.com,Mathematics,teacher\n"
+            "Grace,grace@eventsync.example.com,Computer Science,teacher\n"
+        ), "csv", "admin")
+        stored = [doc["teacher_id"] async for doc in teachers_collection.find({}, {"teacher_id": 1})]
+        return report, stored
+
+    report, stored = mongo(main)
+    assert report["created"] == 3, report
+    issued = [result["teacher_id"] for result in report["results"]]
+    assert not {"TCH001", "TCH002"} & set(issued)
+    assert len(set(stored)) == len(stored) == 5
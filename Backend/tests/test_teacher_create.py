@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from controller.admin import teacher_controller
+from database.connection import counters_collection, teachers_collection
+from database.indexes import ensure_indexes
+from schema.teacher_schema import TeacherCreate
+from utils.password_hasher import password_hasher
+from utils.sequence import BlockSequence
+
+PARALLEL_CREATES = 400
+
+
+@pytest.fixture
+def sent_emails(monkeypatch):
+    # Each test gets its own sequence state and keeps credential emails local
+    monkeypatch.setattr(teacher_controller, "teacher_id_sequence", BlockSequence("teacher_id", block_size=5))
+    # Every parallel create hashes at once; the backpressure limit is not under test
+    monkeypatch.setattr(password_hasher, "max_pending", PARALLEL_CREATES)
+    sent = []
+    monkeypatch.setattr(
+        teacher_controller, "queue_teacher_credentials_email", lambda **kwargs: sent.append(kwargs)
+    )
+    return sent
+
+
+def teacher(n: int, email: str = None) -> TeacherCreate:
+    return TeacherCreate(
+        name=f"Teacher {n}",
+        email=email or f"teacher{n}@eventsync.example.com",
+        department="Computer Science",
+        role="teacher",
+    )
+
+
+def test_parallel_creates_get_unique_ids(mongo, sent_emails):
+    async def main():
+        await ensure_indexes()
+        await teacher_controller.seed_teacher_id_sequence()
+        created = await asyncio.gather(*[
+            teacher_controller.create_teacher(teacher(n), "admin") for n in range(PARALLEL_CREATES)
+        ])
+        stored = [doc["teacher_id"] async for doc in teachers_collection.find({}, {"teacher_id": 1})]
+        return created, stored
+
+    created, stored = mongo(main)
+    ids = [response.teacher_id for response in created]
+    assert len(set(ids)) == PARALLEL_CREATES
+    assert sorted(stored) == sorted(ids)
+    assert len(sent_emails) == PARALLEL_CREATES
+
+
+def test_sequence_is_seeded_from_the_highest_legacy_id_once(mongo, sent_emails):
+    async def main():
+        await ensure_indexes()
+        await teachers_collection.insert_many([
+            {"email": f"legacy{n}@eventsync.example.com", "teacher_id": teacher_id}
+            for n, teacher_id in enumerate(["TCH007", "TCH012", "TCHADMIN"])
+        ])
+        await teacher_controller.seed_teacher_id_sequence()
+        first = await teacher_controller.create_teacher(teacher(1), "admin")
+        # Later startups leave the counter alone
+        await teachers_collection.insert_one({"email": "late@eventsync.example.com", "teacher_id": "TCH500"})
+        await teacher_controller.seed_teacher_id_sequence()
+        counter = await counters_collection.find_one({"_id": "teacher_id"})
+        return first, counter
+
+    first, counter = mongo(main)
+    assert first.teacher_id == "TCH013"
+    assert counter["value"] < 500
+
+
+def test_workers_reserve_disjoint_blocks(mongo):
+    async def main():
+        # Two workers' sequences drawing from one counter
+        first = BlockSequence("teacher_id", block_size=3, collection=counters_collection)
+        second = BlockSequence("teacher_id", block_size=3, collection=counters_collection)
+        return await asyncio.gather(*[
+            sequence.next() for _ in range(10) for sequence in (first, second)
+        ])
+
+    numbers = mongo(main)
+    assert len(set(numbers)) == len(numbers) == 20
+
+
+def test_taken_teacher_id_is_replaced_not_reported_as_email(mongo, sent_emails):
+    async def main():
+        await ensure_indexes()
+        await teacher_controller.seed_teacher_id_sequence()
+        # Inserted behind the sequence's back with the next ID it will issue
+        await teachers_collection.insert_one({"email": "legacy@eventsync.example.com", "teacher_id": "TCH001"})
+        return await teacher_controller.create_teacher(teacher(1), "admin")
+
+    created = mongo(main)
+    assert created.teacher_id == "TCH002"
+
+
+def test_parallel_duplicate_email_is_rejected(mongo, sent_emails):
+    async def main():
+        await ensure_indexes()
+        return await asyncio.gather(*[
+            teacher_controller.create_teacher(teacher(n, "same@eventsync.example.com"), "admin") for n in range(5)
+        ], return_exceptions=True)
+
+    results = mongo(main)
+    errors = [result for result in results if isinstance(result, HTTPException)]
+    assert len(results) - len(errors) == 1
+    assert all(error.detail == teacher_controller.EMAIL_TAKEN for error in errors)
@@ -0,0 +1,57 @@
+"""
+Transparent decompression of gzip request bodies.
+
+Routers that serve clients on slow or flaky links (the door scanners) use
+GzipRoute as their route_class; a request sent with `Content-Encoding: gzip`
+is inflated before FastAPI parses and validates the body, so endpoints see
+plain JSON either way. Inflation is bounded by MAX_DECOMPRESSED_BYTES so a
+small compressed body cannot expand into an unbounded buffer.
+"""
+import os
+import zlib
+from typing import Callable
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+MAX_DECOMPRESSED_BYTES = int(os.getenv("MAX_DECOMPRESSED_BYTES", str(8 * 1024 * 1024)))
+
+
+def gunzip(body: bytes, max_bytes: int = MAX_DECOMPRESSED_BYTES) -> bytes:
+    """
+    Inflate a gzip body, raising 400 if it is corrupt and 413 if it expands
+    past max_bytes.
+    """
+    # 16 + MAX_WBITS makes zlib expect the gzip header and trailer
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = inflater.decompress(body, max_bytes + 1)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip request body")
+    if len(data) > max_bytes:
+        raise HTTPException(status_code=413, detail="Decompressed request body too large")
+    if not inflater.eof:
+        raise HTTPException(status_code=400, detail="Truncated gzip request body")
+    return data
+
+
+class GzipRequest(Request):
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            encoding = self.headers.get("content-encoding", "identity").strip().lower()
+            if encoding == "gzip":
+                body = gunzip(body)
+            elif encoding != "identity":
+                raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+            self._body = body
+        return self._body
+
+
+class GzipRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def gzip_route_handler(request: Request) -> Response:
+            return await original_route_handler(GzipRequest(request.scope, request.receive))
+
+        return gzip_route_handler
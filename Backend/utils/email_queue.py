@@ -0,0 +1,260 @@
+"""
+Background email delivery with a pool of persistent SMTP connections.
+
+Request handlers only enqueue messages. EMAIL_WORKERS background tasks take
+messages off an in-memory outbox and send them from worker threads, reusing
+open SMTP connections instead of doing a connect / STARTTLS / login round
+for every message. Failed sends are retried with exponential backoff; after
+EMAIL_MAX_ATTEMPTS the job's on_failure callback is called.
+
+The outbox lives in memory on purpose: credential emails carry plaintext
+passwords, which must not be persisted to Mongo. Messages still queued when
+the process stops are lost, and their on_failure callbacks are called.
+"""
+import asyncio
+import os
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Callable, Optional
+from utils.email_util import build_teacher_credentials_message, open_smtp_connection
+from utils.metrics import registry
+
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+EMAIL_OUTBOX_SIZE = int(os.getenv("EMAIL_OUTBOX_SIZE", "10000"))
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", str(EMAIL_WORKERS)))
+# Relays drop idle sessions after a few minutes; reconnect before that
+SMTP_MAX_IDLE_SECONDS = float(os.getenv("SMTP_MAX_IDLE_SECONDS", "60"))
+
+smtp_send_duration = registry.histogram(
+    "smtp_send_duration_seconds", "SMTP delivery attempts by outcome", ("outcome",)
+)
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of logged-in SMTP connections. send() is blocking and is
+    meant to be called from worker threads.
+    """
+
+    def __init__(
+        self,
+        size: int = SMTP_POOL_SIZE,
+        max_idle_seconds: float = SMTP_MAX_IDLE_SECONDS,
+        connect: Callable[[], smtplib.SMTP] = open_smtp_connection,
+    ):
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self._connect = connect
+        self._idle: list[tuple[float, smtplib.SMTP]] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> tuple[smtplib.SMTP, bool]:
+        now = time.monotonic()
+        stale = []
+        connection = None
+        with self._lock:
+            while self._idle:
+                last_used, candidate = self._idle.pop()
+                if now - last_used < self.max_idle_seconds:
+                    connection = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            self._close(candidate)
+        if connection is not None:
+            return connection, True
+        return self._connect(), False
+
+    def _release(self, connection: smtplib.SMTP):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((time.monotonic(), connection))
+                return
+        self._close(connection)
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def send(self, message: Message):
+        connection, reused = self._acquire()
+        try:
+            connection.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            connection.close()
+            if not reused:
+                raise
+            # The relay closed a pooled session; retry once on a fresh one
+            connection = self._connect()
+            try:
+                connection.send_message(message)
+            except Exception:
+                connection.close()
+                raise
+        except Exception:
+            self._close(connection)
+            raise
+        self._release(connection)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, connection in idle:
+            self._close(connection)
+
+
+class EmailJob:
+    def __init__(self, message: Message, on_failure: Optional[Callable[[Exception], None]] = None):
+        self.message = message
+        self.on_failure = on_failure
+        self.attempts = 0
+
+
+class EmailQueue:
+    def __init__(
+        self,
+        pool: Optional[SMTPConnectionPool] = None,
+        workers: int = EMAIL_WORKERS,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        retry_base_seconds: float = EMAIL_RETRY_BASE_SECONDS,
+        max_size: int = EMAIL_OUTBOX_SIZE,
+    ):
+        self.pool = pool or SMTPConnectionPool()
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._tasks: list[asyncio.Task] = []
+        # Scheduled retries and the job each one will requeue
+        self._retries: dict[asyncio.Task, EmailJob] = {}
+        # Jobs a worker is sending right now
+        self._sending: set[EmailJob] = set()
+        self.sent = 0
+        self.failed = 0
+
+    def enqueue(self, message: Message, on_failure: Optional[Callable[[Exception], None]] = None):
+        """
+        Queue a message for delivery. Never blocks; raises asyncio.QueueFull
+        if the outbox is at capacity.
+        """
+        self._outbox.put_nowait(EmailJob(message, on_failure))
+
+    def pending(self) -> int:
+        return self._outbox.qsize() + len(self._retries)
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 10):
+        """
+        Give queued messages up to drain_timeout seconds to go out, then stop
+        the workers and close the pooled connections. Every job that was not
+        delivered by then (queued, waiting for a retry or cut off mid-send)
+        gets its on_failure callback.
+        """
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._outbox.join(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                pass
+        # A finished retry task has already put its job back in the outbox
+        waiting = [job for task, job in self._retries.items() if not task.done()]
+        retries = list(self._retries)
+        for task in [*self._tasks, *retries]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *retries, return_exceptions=True)
+        self._tasks = []
+        self._retries = {}
+
+        for job in waiting:
+            self._give_up(job, RuntimeError("Email queue stopped before a retry"))
+        interrupted, self._sending = self._sending, set()
+        for job in interrupted:
+            self._give_up(job, RuntimeError("Email queue stopped during delivery; it may not have been sent"))
+        while not self._outbox.empty():
+            job = self._outbox.get_nowait()
+            self._outbox.task_done()
+            self._give_up(job, RuntimeError("Email queue stopped before delivery"))
+        await asyncio.to_thread(self.pool.close)
+
+    async def _work(self):
+        while True:
+            job = await self._outbox.get()
+            try:
+                await self._deliver(job)
+            finally:
+                self._outbox.task_done()
+
+    async def _deliver(self, job: EmailJob):
+        job.attempts += 1
+        started = time.perf_counter()
+        self._sending.add(job)
+        try:
+            await asyncio.to_thread(self.pool.send, job.message)
+        except asyncio.CancelledError:
+            # Stays in _sending so stop() reports it
+            raise
+        except Exception as e:
+            self._sending.discard(job)
+            smtp_send_duration.observe(time.perf_counter() - started, "error")
+            if job.attempts >= self.max_attempts:
+                self._give_up(job, e)
+                return
+            delay = self.retry_base_seconds * (2 ** (job.attempts - 1))
+            print(f"⚠️ Email to {job.message['To']} failed ({str(e)}), retrying in {delay:.0f}s")
+            task = asyncio.create_task(self._retry_later(job, delay))
+            self._retries[task] = job
+            task.add_done_callback(lambda done: self._retries.pop(done, None))
+            return
+
+        self._sending.discard(job)
+        smtp_send_duration.observe(time.perf_counter() - started, "sent")
+        self.sent += 1
+        print(f"✅ Email sent successfully to {job.message['To']}")
+
+    async def _retry_later(self, job: EmailJob, delay: float):
+        await asyncio.sleep(delay)
+        await self._outbox.put(job)
+
+    def _give_up(self, job: EmailJob, error: Exception):
+        self.failed += 1
+        print(f"❌ Failed to send email to {job.message['To']}: {str(error)}")
+        if job.on_failure is not None:
+            job.on_failure(error)
+
+
+email_queue = EmailQueue()
+
+
+def queue_teacher_credentials_email(
+    to_email: str,
+    teacher_name: str,
+    teacher_id: str,
+    password: str,
+    login_url: str = "http://localhost:8000/auth/login"
+):
+    """
+    Queue the credentials email for a new teacher. If it cannot be delivered,
+    the credentials are logged so an admin can pass them on manually.
+    """
+    message = build_teacher_credentials_message(
+        to_email, teacher_name, teacher_id, password, login_url
+    )
+
+    def on_failure(error: Exception):
+        print(f"⚠️ Warning: Teacher created but email failed to send to {to_email}")
+        print(f"📧 Manual credentials - Teacher ID: {teacher_id}, Password: {password}")
+
+    try:
+        email_queue.enqueue(message, on_failure)
+    except asyncio.QueueFull as e:
+        on_failure(e)
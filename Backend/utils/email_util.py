@@ -9,18 +9,38 @@ SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USER = os.getenv("SMTP_USER", "your-email@gmail.com")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "your-app-password")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
 FROM_EMAIL = os.getenv("FROM_EMAIL", "noreply@eventsync.com")
 
 
-def send_teacher_credentials_email(
+def open_smtp_connection() -> smtplib.SMTP:
+    """
+    Connect to the configured relay, upgrading to TLS and logging in when
+    configured. Set SMTP_STARTTLS=false and an empty SMTP_USER for a local
+    relay such as aiosmtpd.
+    """
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+    try:
+        if SMTP_STARTTLS:
+            server.starttls()
+        if SMTP_USER and SMTP_PASSWORD:
+            server.login(SMTP_USER, SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def build_teacher_credentials_message(
     to_email: str,
     teacher_name: str,
     teacher_id: str,
     password: str,
     login_url: str = "http://localhost:8000/auth/login"
-) -> bool:
+) -> MIMEMultipart:
     """
-    Send login credentials to newly created teacher via email.
+    Build the welcome email carrying a new teacher's login credentials.
     
     Args:
         to_email: Teacher's email address
@@ -30,7 +50,7 @@ def send_teacher_credentials_email(
         login_url: URL for login page
     
     Returns:
-        bool: True if email sent successfully, False otherwise
+        MIMEMultipart: Message with plain text and HTML parts
     """
     
     # Create email content
@@ -115,23 +135,44 @@ def send_teacher_credentials_email(
     © 2025 EventSync. All rights reserved.
     """
     
+    # Create message
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = FROM_EMAIL
+    message["To"] = to_email
+    
+    # Attach both plain text and HTML versions
+    part1 = MIMEText(text_body, "plain")
+    part2 = MIMEText(html_body, "html")
+    message.attach(part1)
+    message.attach(part2)
+    
+    return message
+
+
+def send_teacher_credentials_email(
+    to_email: str,
+    teacher_name: str,
+    teacher_id: str,
+    password: str,
+    login_url: str = "http://localhost:8000/auth/login"
+) -> bool:
+    """
+    Send login credentials to newly created teacher via email.
+    
+    Blocks for the whole SMTP exchange; request handlers should use
+    queue_teacher_credentials_email from utils.email_queue instead.
+    
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
     try:
-        # Create message
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = FROM_EMAIL
-        message["To"] = to_email
-        
-        # Attach both plain text and HTML versions
-        part1 = MIMEText(text_body, "plain")
-        part2 = MIMEText(html_body, "html")
-        message.attach(part1)
-        message.attach(part2)
+        message = build_teacher_credentials_message(
+            to_email, teacher_name, teacher_id, password, login_url
+        )
         
         # Send email
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
+        with open_smtp_connection() as server:
             server.send_message(message)
         
         print(f"✅ Credentials email sent successfully to {to_email}")
@@ -150,9 +191,7 @@ def send_test_email(to_email: str) -> bool:
         message["From"] = FROM_EMAIL
         message["To"] = to_email
         
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
+        with open_smtp_connection() as server:
             server.send_message(message)
         
         print(f"✅ Test email sent successfully to {to_email}")
@@ -0,0 +1,39 @@
+from typing import Iterable, Optional
+from fastapi import HTTPException
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[list[str]]:
+    """
+    Parse a `fields=a,b,c` query value against a whitelist.
+
+    Returns:
+        list: requested field names in order, or None when `fields` is empty
+
+    Raises:
+        HTTPException: 400 if a field is not in the whitelist
+    """
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return requested or None
+
+
+def build_projection(
+    fields: Optional[list[str]], always: Iterable[str] = (), exclude: Iterable[str] = ()
+) -> Optional[dict]:
+    """
+    Turn parsed fields into a Mongo projection. `always` names fields the
+    controller itself needs (e.g. the pagination key); `exclude` names fields
+    that must never leave the database when no fields were requested.
+    """
+    if fields is None:
+        projection = {name: 0 for name in exclude}
+        return projection or None
+    projection = {name: 1 for name in (*fields, *always) if name != "id"}
+    return projection or {"_id": 1}
@@ -0,0 +1,86 @@
+"""
+HTTP validators (ETag / Last-Modified) and Cache-Control for read endpoints.
+
+Handlers compute a validator from cheap metadata (timestamps, counts) before
+building the body, and answer a matching If-None-Match / If-Modified-Since
+with an empty 304, so unchanged polls cost neither serialization nor
+bandwidth. Cache-Control lets browsers and the CDN reuse public responses
+for HTTP_CACHE_MAX_AGE seconds before revalidating.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "30"))
+
+
+def make_etag(*parts) -> str:
+    # Weak: equal validators mean equal data, not byte-identical encodings
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def document_version(document: dict) -> Optional[datetime]:
+    """When a document last changed: updated_at, or created_at if never updated."""
+    return document.get("updated_at") or document.get("created_at")
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison (RFC 9110, 13.1.2)
+    if if_none_match.strip() == "*":
+        return True
+    wanted = _strip_weak(etag)
+    return any(_strip_weak(candidate) == wanted for candidate in if_none_match.split(","))
+
+
+def _http_date(value: datetime) -> str:
+    # Mongo datetimes are naive UTC
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    True when the client's cached copy is still current. If-None-Match wins
+    over If-Modified-Since when both are sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def cache_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    public: bool = True,
+    max_age: int = HTTP_CACHE_MAX_AGE,
+) -> dict:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"{'public' if public else 'private'}, max-age={max_age}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
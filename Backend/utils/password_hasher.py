@@ -0,0 +1,104 @@
+"""
+Executor-backed bcrypt hashing so password work never blocks the event loop.
+
+bcrypt releases the GIL, so the default thread pool gives real parallelism;
+PASSWORD_HASH_EXECUTOR=process switches to a process pool instead. At most
+PASSWORD_HASH_MAX_PENDING operations may be queued or running per worker;
+beyond that the request is rejected with 503 rather than piling up behind
+the pool.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException
+from schema.auth_schema import hash_password, verify_password
+from utils.metrics import registry
+
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread | process
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "Time a bcrypt operation took, including its wait for an executor worker",
+    ("operation",),
+)
+password_hash_rejected = registry.counter(
+    "password_hash_rejected_total", "bcrypt operations refused with 503 because the executor was full"
+)
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        executor_kind: str = PASSWORD_HASH_EXECUTOR,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        rounds: int = BCRYPT_ROUNDS,
+    ):
+        if executor_kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor_kind}")
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            password_hash_rejected.inc()
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            started = time.perf_counter()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+            password_hash_duration.observe(time.perf_counter() - started, func.__name__)
+            return result
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash a batch in parallel, keeping at most `workers` of its hashes in
+        flight so a large batch does not take the whole pending budget.
+        """
+        limit = asyncio.Semaphore(self.workers)
+
+        async def hash_one(password: str) -> str:
+            async with limit:
+                return await self.hash(password)
+
+        return await asyncio.gather(*[hash_one(password) for password in passwords])
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,214 @@
+"""
+Attempt limits for the endpoints that run bcrypt (login and registration).
+
+Each attempt is counted against two keys, the client IP and the email in
+the request body, and rejected with 429 and Retry-After once either key is
+over its limit. Routes call check() before any user lookup or hash, so a
+credential-stuffing burst costs a dictionary lookup per attempt instead of
+a bcrypt verification.
+
+Counting uses a sliding window: the current fixed window's count plus the
+previous window's count weighted by how much of it still overlaps the
+sliding window. That behaves like a token bucket refilling at
+limit / RATE_LIMIT_WINDOW_SECONDS, but needs only two counters per key.
+Rejected attempts are not counted, so a client that backs off for
+Retry-After seconds always gets back in.
+
+Stores:
+    memory  per-process (default); with N workers a client may get up to N
+            times the limit
+    redis   shared across workers; needs the `redis` package and
+            RATE_LIMIT_REDIS_URL. RedisWindowStore takes any client with the
+            redis.asyncio API.
+
+A shared store that is unreachable fails open: the attempt is allowed and a
+warning is logged, so an outage does not lock everyone out.
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi import HTTPException, Request
+from utils.metrics import registry
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | redis
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Only behind a proxy that sets X-Forwarded-For; otherwise clients could pick their own key
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+# Proxies in front of the app that append to X-Forwarded-For
+RATE_LIMIT_TRUSTED_HOPS = max(1, int(os.getenv("RATE_LIMIT_TRUSTED_HOPS", "1")))
+
+LOGIN_LIMIT_PER_IP = int(os.getenv("LOGIN_LIMIT_PER_IP", "30"))
+LOGIN_LIMIT_PER_EMAIL = int(os.getenv("LOGIN_LIMIT_PER_EMAIL", "10"))
+REGISTER_LIMIT_PER_IP = int(os.getenv("REGISTER_LIMIT_PER_IP", "10"))
+REGISTER_LIMIT_PER_EMAIL = int(os.getenv("REGISTER_LIMIT_PER_EMAIL", "3"))
+
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections_total", "Attempts rejected by the rate limiter", ("limiter", "key")
+)
+
+
+def sliding_count(previous: int, current: int, elapsed: float, window: float) -> float:
+    """Estimated attempts in the last `window` seconds, `elapsed` into the current window."""
+    return previous * (1 - elapsed / window) + current
+
+
+def retry_after(previous: int, current: int, elapsed: float, window: float, limit: int) -> float:
+    """Seconds until one more attempt fits under `limit`."""
+    if current + 1 <= limit:
+        # Wait for the previous window's weight to drop far enough
+        if previous == 0:
+            return 0.0
+        needed = window * (1 - (limit - current - 1) / previous)
+        return max(0.0, needed - elapsed)
+    # The current window alone is over: it becomes the previous one next
+    return (window - elapsed) + max(0.0, window * (1 - (limit - 1) / current))
+
+
+class MemoryWindowStore:
+    """Per-process counters: key -> [window index, current count, previous count]."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._counters: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """Count an attempt if it fits; return 0, or the seconds to wait if it does not."""
+        now = time.time()
+        index = int(now // window)
+        elapsed = now - index * window
+
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = [index, 0, 0]
+            self._counters[key] = counter
+        elif counter[0] != index:
+            # Roll over; a gap of more than one window leaves nothing behind
+            counter[2] = counter[1] if counter[0] == index - 1 else 0
+            counter[1] = 0
+            counter[0] = index
+        self._counters.move_to_end(key)
+        while len(self._counters) > self.max_keys:
+            self._counters.popitem(last=False)
+
+        _, current, previous = counter
+        if sliding_count(previous, current + 1, elapsed, window) > limit:
+            return max(retry_after(previous, current, elapsed, window, limit), 1.0)
+        counter[1] += 1
+        return 0.0
+
+
+class RedisWindowStore:
+    """
+    Shared counters: one Redis key per (key, window index), expiring after
+    two windows. The attempt is counted first and taken back if it is over
+    the limit, so concurrent workers never let more through than the limit.
+    """
+
+    def __init__(self, client, prefix: str = "eventsync:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = RATE_LIMIT_REDIS_URL) -> "RedisWindowStore":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis needs the `redis` package")
+        return cls(redis.from_url(url))
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.time()
+        index = int(now // window)
+        elapsed = now - index * window
+        current_key = f"{self.prefix}{key}:{index}"
+
+        pipe = self.client.pipeline()
+        pipe.incr(current_key)
+        pipe.pexpire(current_key, int(window * 2000))
+        pipe.get(f"{self.prefix}{key}:{index - 1}")
+        current, _, previous = await pipe.execute()
+        previous = int(previous or 0)
+
+        if sliding_count(previous, current, elapsed, window) > limit:
+            await self.client.decr(current_key)
+            return max(retry_after(previous, current - 1, elapsed, window, limit), 1.0)
+        return 0.0
+
+
+def build_store(kind: str = RATE_LIMIT_BACKEND):
+    if kind == "memory":
+        return MemoryWindowStore()
+    if kind == "redis":
+        return RedisWindowStore.from_url()
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+def client_ip(request: Request, trusted_hops: int = RATE_LIMIT_TRUSTED_HOPS) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",")]
+        forwarded = [address for address in forwarded if address]
+        if forwarded:
+            # Each trusted proxy appends the address it was reached from, so
+            # the client is `trusted_hops` entries from the right. Anything
+            # further left was sent by the client and could be made up.
+            return forwarded[-min(trusted_hops, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        per_ip: int,
+        per_email: int,
+        store,
+        window: float = RATE_LIMIT_WINDOW_SECONDS,
+        enabled: bool = RATE_LIMIT_ENABLED,
+    ):
+        self.name = name
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.store = store
+        self.window = window
+        self.enabled = enabled
+
+    async def _hit(self, kind: str, value: str, limit: int):
+        try:
+            wait = await self.store.hit(f"{self.name}:{kind}:{value}", limit, self.window)
+        except Exception as e:
+            print(f"⚠️ Rate limit store failed, allowing attempt: {str(e)}")
+            return
+        if wait:
+            rate_limit_rejections.inc(self.name, kind)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    async def check(self, request: Request, email: Optional[str] = None):
+        """
+        Count one attempt for the client IP and the email.
+
+        Raises:
+            HTTPException: 429 with Retry-After if either is over its limit
+        """
+        if not self.enabled:
+            return
+        # IP first: a flood from one address must not use up its victims' email budget
+        await self._hit("ip", client_ip(request), self.per_ip)
+        if email:
+            await self._hit("email", email.strip().lower(), self.per_email)
+
+
+_store = build_store() if RATE_LIMIT_ENABLED else None
+login_limiter = RateLimiter("login", LOGIN_LIMIT_PER_IP, LOGIN_LIMIT_PER_EMAIL, _store)
+register_limiter = RateLimiter("register", REGISTER_LIMIT_PER_IP, REGISTER_LIMIT_PER_EMAIL, _store)
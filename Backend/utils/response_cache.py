@@ -0,0 +1,262 @@
+"""
+Write-invalidated cache of encoded responses for public read endpoints.
+
+Entries hold the response body exactly as sent (already encoded bytes) plus
+its validator headers, keyed by route and query string. Every entry carries
+tags ("events:list", "events:<id>", ...) and the write paths invalidate the
+tags they affect, so a cached response never outlives the data it was built
+from. RESPONSE_CACHE_TTL_SECONDS is only a backstop for writes made by other
+workers when the per-process backend is used.
+
+Backends:
+    memory  per-process LRU (default)
+    redis   shared across workers; needs the `redis` package and
+            RESPONSE_CACHE_REDIS_URL. RedisBackend takes any client with the
+            redis.asyncio API, so tests can pass a local stand-in.
+
+Concurrent misses for one key are coalesced in-process: one request builds
+the response and the others wait for it, so an invalidation during a read
+spike costs one query per worker instead of one per request.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlencode
+import orjson
+from fastapi import Request, Response
+from utils.http_cache import is_not_modified, not_modified
+from utils.metrics import registry
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # memory | redis
+RESPONSE_CACHE_MAX_SIZE = int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "5000"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+response_cache_lookups = registry.counter(
+    "response_cache_lookups_total",
+    "Response cache lookups by route and result (hit, miss or coalesced)",
+    ("route", "result"),
+)
+
+
+class CachedResponse:
+    def __init__(self, body: bytes, etag: str, headers: dict, last_modified: Optional[datetime] = None):
+        self.body = body
+        self.etag = etag
+        self.headers = headers
+        self.last_modified = last_modified
+
+    def encode(self) -> bytes:
+        meta = {
+            "etag": self.etag,
+            "headers": self.headers,
+            "last_modified": self.last_modified.isoformat() if self.last_modified else None,
+        }
+        return orjson.dumps(meta) + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        meta, body = raw.split(b"\n", 1)
+        meta = orjson.loads(meta)
+        last_modified = datetime.fromisoformat(meta["last_modified"]) if meta["last_modified"] else None
+        return cls(body, meta["etag"], meta["headers"], last_modified)
+
+
+class MemoryBackend:
+    """Per-process LRU with per-entry expiry and a tag -> keys index."""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._tags: dict[str, set] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, _, response = item
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    async def set(self, key: str, response: CachedResponse, tags: Iterable[str], ttl: float):
+        tags = tuple(tags)
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, tags, response)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                self._remove(key)
+
+    def _remove(self, key: str):
+        item = self._entries.pop(key, None)
+        if item is None:
+            return
+        for tag in item[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """
+    Shared backend. Each tag is a Redis set of the keys built from it;
+    invalidating a tag deletes those keys and the set.
+    """
+
+    def __init__(self, client, prefix: str = "eventsync:response:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = RESPONSE_CACHE_REDIS_URL) -> "RedisBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the `redis` package")
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self.prefix + key)
+        return CachedResponse.decode(raw) if raw is not None else None
+
+    async def set(self, key: str, response: CachedResponse, tags: Iterable[str], ttl: float):
+        ttl_ms = max(1, int(ttl * 1000))
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, response.encode(), px=ttl_ms)
+        for tag in tags:
+            pipe.sadd(self.prefix + "tag:" + tag, key)
+            pipe.pexpire(self.prefix + "tag:" + tag, ttl_ms)
+        await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            keys = await self.client.smembers(tag_key)
+            pipe = self.client.pipeline()
+            for key in keys:
+                key = key.decode("utf-8") if isinstance(key, bytes) else key
+                pipe.delete(self.prefix + key)
+            pipe.delete(tag_key)
+            await pipe.execute()
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Bumped by every invalidation; a build that started before one must
+        # not store its (possibly stale) result
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_build(
+        self,
+        route: str,
+        key: str,
+        tags: Iterable[str],
+        build: Callable[[], Awaitable[CachedResponse]],
+    ) -> CachedResponse:
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            # A shared backend being down must not take the reads with it
+            print(f"⚠️ Response cache read failed: {str(e)}")
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            response_cache_lookups.inc(route, "hit")
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            response_cache_lookups.inc(route, "coalesced")
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        response_cache_lookups.inc(route, "miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        epoch = self._epoch
+        try:
+            response = await build()
+            if epoch == self._epoch:
+                try:
+                    await self.backend.set(key, response, tags, self.ttl_seconds)
+                except Exception as e:
+                    print(f"⚠️ Response cache write failed: {str(e)}")
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Waiters re-raise it; don't warn about it going unretrieved
+                future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(response)
+        return response
+
+    async def invalidate(self, *tags: str):
+        self._epoch += 1
+        try:
+            await self.backend.invalidate(tags)
+        except Exception as e:
+            # The write already happened; entries expire after the TTL
+            print(f"⚠️ Response cache invalidation failed for {tags}: {str(e)}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_backend(kind: str = RESPONSE_CACHE_BACKEND):
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "redis":
+        return RedisBackend.from_url()
+    raise ValueError(f"Unknown response cache backend: {kind}")
+
+
+def cache_key(request: Request) -> str:
+    # Order-insensitive, so ?a=1&b=2 and ?b=2&a=1 share an entry
+    return request.url.path + "?" + urlencode(sorted(request.query_params.multi_items()))
+
+
+def send_cached(request: Request, cached: CachedResponse) -> Response:
+    """Answer from a cache entry: 304 if the client is current, else the stored bytes."""
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified(cached.headers)
+    return Response(cached.body, media_type="application/json", headers=cached.headers)
+
+
+response_cache = ResponseCache(build_backend())
+
+registry.callback(
+    "response_cache_hit_ratio", "Share of response cache lookups served without a build", (), "gauge",
+    lambda: {(): response_cache.stats()["hit_ratio"]},
+)
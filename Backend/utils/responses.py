@@ -0,0 +1,30 @@
+"""
+orjson-backed responses.
+
+ORJSONResponse is the application's default response class. Handlers that
+return data read straight from Mongo can wrap it in ORJSONResponse
+themselves: FastAPI then skips response_model validation entirely and the
+content is encoded in one orjson pass. Only use that for data whose shape
+the controller already guarantees (the *_serializer functions).
+"""
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+
+def _orjson_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,83 @@
+"""
+Ranked full-text search over a collection's text index.
+
+Results are ordered by textScore (best first), then _id, and paged with an
+opaque cursor holding the last (score, _id) pair, the same keyset scheme the
+list endpoints use. Frequent queries are served from a short-lived
+in-process cache that controllers clear whenever they write.
+"""
+import base64
+import json
+import os
+from typing import Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+from utils.cache import TTLCache
+
+SEARCH_CACHE_MAX_SIZE = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "1000"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "30"))
+MAX_QUERY_LENGTH = 200
+
+search_cache = TTLCache(max_size=SEARCH_CACHE_MAX_SIZE, ttl_seconds=SEARCH_CACHE_TTL_SECONDS)
+
+
+def encode_search_cursor(document: dict) -> str:
+    payload = {"s": document["_score"], "i": str(document["_id"])}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return float(payload["s"]), ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def text_search_page(
+    collection,
+    q: str,
+    extra_filter: dict,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[dict] = None,
+) -> tuple[list, Optional[str]]:
+    """
+    Run one page of a ranked $text search.
+
+    Returns:
+        tuple: (documents in rank order, next cursor or None)
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query must not be empty")
+    if len(q) > MAX_QUERY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Search query is limited to {MAX_QUERY_LENGTH} characters")
+
+    pipeline = [
+        {"$match": {"$text": {"$search": q}, **extra_filter}},
+        {"$addFields": {"_score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        last_score, last_id = decode_search_cursor(cursor)
+        pipeline.append({"$match": {"$or": [
+            {"_score": {"$lt": last_score}},
+            {"_score": last_score, "_id": {"$gt": last_id}},
+        ]}})
+    pipeline += [
+        {"$sort": {"_score": -1, "_id": 1}},
+        {"$limit": limit + 1},
+    ]
+    if projection:
+        pipeline.append({"$project": {**projection, "_score": 1}})
+
+    documents = await collection.aggregate(pipeline).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_search_cursor(documents[-1])
+    return documents, next_cursor
@@ -0,0 +1,49 @@
+"""
+Atomic, block-allocated sequences backed by the counters collection.
+
+Each worker reserves `block_size` numbers at a time with a single
+find_one_and_update + $inc, then hands them out locally, so most callers
+need no database round trip. Numbers reserved by a worker that exits are
+skipped, which leaves gaps but never duplicates.
+"""
+import asyncio
+from pymongo import ReturnDocument
+from database.connection import counters_collection
+
+
+class BlockSequence:
+    def __init__(self, name: str, block_size: int = 20, collection=counters_collection):
+        self.name = name
+        self.block_size = block_size
+        self.collection = collection
+        self._next = 0
+        self._end = 0  # exclusive
+        self._lock = asyncio.Lock()
+
+    async def exists(self) -> bool:
+        """Whether the counter document has been created (seeded or used)."""
+        return await self.collection.find_one({"_id": self.name}, {"_id": 1}) is not None
+
+    async def seed(self, minimum: int):
+        """Make sure the sequence never hands out a number <= minimum."""
+        await self.collection.update_one(
+            {"_id": self.name}, {"$max": {"value": minimum}}, upsert=True
+        )
+
+    async def _reserve_block(self):
+        counter = await self.collection.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"value": self.block_size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._end = counter["value"] + 1
+        self._next = self._end - self.block_size
+
+    async def next(self) -> int:
+        async with self._lock:
+            if self._next >= self._end:
+                await self._reserve_block()
+            value = self._next
+            self._next += 1
+            return value
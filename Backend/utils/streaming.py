@@ -0,0 +1,21 @@
+from typing import AsyncIterator
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = 64 * 1024) -> AsyncIterator[str]:
+    """
+    Split a streamed request body into decoded lines without buffering the
+    whole body. Blank lines are skipped; a line longer than max_line_bytes
+    raises ValueError.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise ValueError("Line too long")
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line.strip():
+                yield line.decode("utf-8")
+    if buffer.strip():
+        yield buffer.rstrip(b"\r").decode("utf-8")